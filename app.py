@@ -1,8 +1,19 @@
 import subprocess
 import os
-import json
+import shlex
+import sys
 import logging
-from flask import Flask, request, jsonify
+import time
+import zlib
+from datetime import datetime
+from flask import Flask, Response, request, jsonify, stream_with_context
+from worker_pool import WorkerPool, PRIORITIES, host_capacity
+from metrics import Registry, CONTENT_TYPE, SIZE_BUCKETS
+from log_stream import LogFollower, iter_range, parse_range, tail_offset, sse_events
+from result_store import ResultStore
+from element_analysis.result_cache import ResultCache, RESULT_CACHE_ENABLED, RESULT_CACHE_SHORTCUT, cache_key
+from element_analysis.delivery import CallbackDelivery, Outbox
+from element_analysis.device_profiles import parse_profiles, profiles_key
 
 # =====================================================
 # 환경 설정
@@ -13,10 +24,153 @@ app = Flask(__name__)
 ECR_IMAGE = "934029856517.dkr.ecr.ap-northeast-2.amazonaws.com/web-ai:latest"
 DOCKER_BIN = "/usr/bin/docker"
 LOG_DIR = os.path.join(os.getcwd(), "worker_logs")
-RESULT_DIR = os.path.join(os.getcwd(), "callback_results")
+RESULT_DIR = os.path.join(os.getcwd(), "callback_results")  # 이전 형식(<task_id>.json) 파일 조회용으로 유지
+RESULT_STORE_PATH = os.environ.get("RESULT_STORE_PATH", os.path.join(RESULT_DIR, "results.sqlite3"))
+RESULT_CACHE_DIR = os.environ.get("RESULT_CACHE_DIR", os.path.join(os.getcwd(), "result_cache"))
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(os.getcwd(), "snapshots"))
+OUTBOX_DIR = os.environ.get("OUTBOX_DIR", os.path.join(os.getcwd(), "outbox"))
+INCREMENTAL_ANALYSIS = os.environ.get("INCREMENTAL_ANALYSIS", "off") == "on"
+
+WORKER_ROOT = os.path.join(os.getcwd(), "worker_slots")
+
+# 워커 풀 설정 (docker: 상주 컨테이너, local: 로컬 서브프로세스)
+WORKER_MODE = os.environ.get("WORKER_MODE", "docker")
+WORKER_MEMORY_MB = int(os.environ.get("WORKER_MEMORY_MB", 2048))   # 워커(컨테이너)당 메모리 한도
+WORKER_CPUS = float(os.environ.get("WORKER_CPUS", 1.0))             # 워커(컨테이너)당 CPU 한도
+WORKER_RESERVE_MB = int(os.environ.get("WORKER_RESERVE_MB", 1024))  # API 서버/OS 몫으로 남길 메모리
+# auto: CPU 수와 (메모리 - 예약분) 이 허용하는 만큼만 동시에 실행
+_pool_size = os.environ.get("WORKER_POOL_SIZE", "auto")
+WORKER_POOL_SIZE = host_capacity(WORKER_MEMORY_MB, WORKER_CPUS, WORKER_RESERVE_MB) if _pool_size == "auto" else int(_pool_size)
+WORKER_QUEUE_SIZE = int(os.environ.get("WORKER_QUEUE_SIZE", 50))    # 대기열 최대 길이 (넘으면 429)
+WORKER_COMMAND = os.environ.get("WORKER_COMMAND")                   # 워커 명령 직접 지정 (테스트용 가짜 워커 등)
+WORKER_MAX_JOBS = int(os.environ.get("WORKER_MAX_JOBS", 50))
+WORKER_HEALTH_INTERVAL = float(os.environ.get("WORKER_HEALTH_INTERVAL", 30))
+WORKER_JOB_TIMEOUT = float(os.environ.get("WORKER_JOB_TIMEOUT", 900))
+
+# /logs follow 모드
+LOG_FOLLOW_POLL = float(os.environ.get("LOG_FOLLOW_POLL", 0.25))        # 로그 파일 폴링 주기(초)
+LOG_FOLLOW_QUEUE = int(os.environ.get("LOG_FOLLOW_QUEUE", 256))         # 구독자당 최대 대기 블록 수
+LOG_FOLLOW_TIMEOUT = float(os.environ.get("LOG_FOLLOW_TIMEOUT", WORKER_JOB_TIMEOUT))  # 연결 최대 유지(초)
 
 os.makedirs(LOG_DIR, exist_ok=True)
 os.makedirs(RESULT_DIR, exist_ok=True)
+os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+os.makedirs(OUTBOX_DIR, exist_ok=True)
+
+# 워커와 같은 디렉토리를 공유한다 (docker 는 볼륨으로 마운트)
+result_cache = ResultCache(RESULT_CACHE_DIR) if RESULT_CACHE_ENABLED and RESULT_CACHE_SHORTCUT else None
+result_store = ResultStore(RESULT_STORE_PATH)
+# 캐시 재전송도 워커와 같은 outbox/재시도 경로로 보낸다 (슬롯 디렉토리와 겹치지 않게 app/)
+replay_delivery = CallbackDelivery(Outbox(os.path.join(OUTBOX_DIR, "app"))).start() if result_cache is not None else None
+
+# =====================================================
+# 메트릭 (/metrics)
+# =====================================================
+metrics = Registry()
+TASKS_ACCEPTED = metrics.counter("analysis_tasks_accepted_total", "접수된 분석 요청 수", ["source"])  # worker | cache
+TASKS_REJECTED = metrics.counter("analysis_tasks_rejected_total", "대기열이 가득 차 거절한 요청 수")
+TASKS_COMPLETED = metrics.counter("analysis_tasks_completed_total", "워커가 끝낸 작업 수", ["status"])
+TASK_DURATION = metrics.histogram("analysis_task_duration_seconds", "워커 작업 1건 처리 시간")
+CALLBACKS_RECEIVED = metrics.counter("analysis_callbacks_received_total", "수신한 /result 콜백 수")
+CALLBACK_BYTES = metrics.histogram("analysis_callback_payload_bytes", "/result 콜백 본문 크기", buckets=SIZE_BUCKETS)
+# 콜백 본문은 인증되지 않으므로 라벨 값은 알려진 단계 이름만 쓴다 (나머지는 other)
+PIPELINE_STAGES = ("page_load", "screenshot", "page_content", "dom_collection", "inference", "rendering", "upload",
+                   "callback")
+STAGE_SECONDS = metrics.histogram("analysis_stage_seconds", "파이프라인 단계별 소요 시간", ["stage"])
+metrics.gauge("analysis_queue_depth", "대기 중인 작업 수", lambda: pool.queue_depth())
+metrics.gauge("analysis_tasks_running", "작업 중인 워커 수", lambda: pool.busy_workers())
+metrics.gauge("analysis_worker_pool_size", "워커 풀 크기", lambda: pool.size)
+metrics.gauge("analysis_log_followers", "/logs follow 연결 수", lambda: log_follower.subscribers())
+
+# 작업 로그 follow: 작업마다 폴링 스레드 하나를 구독자들이 공유한다
+log_follower = LogFollower(poll_interval=LOG_FOLLOW_POLL, max_chunks=LOG_FOLLOW_QUEUE)
+
+def record_task_finished(job, status, error, elapsed):
+    TASKS_COMPLETED.inc(status=status)
+    if elapsed is not None:
+        TASK_DURATION.observe(elapsed)
+    log_follower.finish(job["task_id"])
+
+# =====================================================
+# 워커 풀
+# =====================================================
+def worker_command(slot, generation):
+    name = f"worker-{slot}-{generation}-{os.urandom(2).hex()}"
+    # outbox 는 슬롯별로 나눈다: 같은 슬롯의 다음 세대 워커가 못 보낸 결과를 이어서 보낸다
+    outbox_dir = os.path.join(OUTBOX_DIR, f"slot-{slot}")
+    os.makedirs(outbox_dir, exist_ok=True)
+    if WORKER_COMMAND:
+        cwd = os.path.join(WORKER_ROOT, f"slot-{slot}")
+        os.makedirs(cwd, exist_ok=True)
+        return {"argv": shlex.split(WORKER_COMMAND) + ["--log-dir", LOG_DIR], "cwd": cwd, "name": None}
+    if WORKER_MODE == "local":
+        # 슬롯마다 작업 디렉토리를 분리해 tmp/file 산출물이 섞이지 않게 한다
+        cwd = os.path.join(WORKER_ROOT, f"slot-{slot}")
+        os.makedirs(cwd, exist_ok=True)
+        main_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), "element_analysis", "main.py")
+        argv = [sys.executable, main_py, "--worker", "--log-dir", LOG_DIR,
+                "--cache-dir", RESULT_CACHE_DIR, "--snapshot-dir", SNAPSHOT_DIR, "--outbox-dir", outbox_dir]
+        return {"argv": argv, "cwd": cwd, "name": None}
+
+    return {
+        "argv": [
+            DOCKER_BIN, "run", "-i", "--rm",
+            "-v", f"{RESULT_DIR}:/app/callback_results",
+            "-v", f"{LOG_DIR}:/app/worker_logs",
+            "-v", f"{RESULT_CACHE_DIR}:/app/result_cache",
+            "-v", f"{SNAPSHOT_DIR}:/app/snapshots",
+            "-v", f"{outbox_dir}:/app/outbox",
+            "--pull=never", "--shm-size", "2gb",
+            "--security-opt", "seccomp=unconfined",
+            "--memory", f"{WORKER_MEMORY_MB}m", "--cpus", str(WORKER_CPUS),
+            "--pids-limit", "200",
+            "--tmpfs", "/tmp:rw,size=256m",
+            "--name", name,
+            ECR_IMAGE,
+            "--worker", "--log-dir", "/app/worker_logs",
+            "--cache-dir", "/app/result_cache", "--snapshot-dir", "/app/snapshots",
+            "--outbox-dir", "/app/outbox"
+        ],
+        "cwd": None,
+        "name": name
+    }
+
+def remove_container(name):
+    subprocess.run([DOCKER_BIN, "rm", "-f", name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+pool = WorkerPool(
+    worker_command,
+    size=WORKER_POOL_SIZE,
+    max_jobs=WORKER_MAX_JOBS,
+    health_interval=WORKER_HEALTH_INTERVAL,
+    job_timeout=WORKER_JOB_TIMEOUT,
+    log_dir=LOG_DIR,
+    on_kill=remove_container if WORKER_MODE == "docker" and not WORKER_COMMAND else None,
+    on_finish=record_task_finished,
+    max_queue=WORKER_QUEUE_SIZE
+)
+pool.start()
+
+# =====================================================
+# 결과 캐시 재전송
+# =====================================================
+def replay_cached_result(entry, task_id, callback_url, website_id):
+    """캐시된 결과를 새 task_id 로 바꿔 outbox 에 넘긴다 (워커를 거치지 않음, 실패하면 예외)"""
+    results = dict(entry["results"])
+    results.pop("timings", None)  # 재전송은 새로 실행한 단계가 없으므로 단계 메트릭에 섞지 않는다
+    results["analysis_info"] = dict(results.get("analysis_info", {}),
+                                    task_id=task_id,
+                                    website_id=website_id,
+                                    cached_at=datetime.fromtimestamp(entry["stored_at"]).isoformat())
+
+    # outbox 에 기록된 뒤에 반환한다 (전송/재시도/dead-letter 는 replay_delivery 스레드)
+    replay_delivery.submit(task_id, callback_url, {"task_id": task_id, "results": results})
+    message = f"[{task_id}] cache hit, callback queued in outbox"
+    logging.info(message)
+    with open(os.path.join(LOG_DIR, f"{task_id}.log"), "a") as logf:
+        logf.write(message + "\n")
+    log_follower.finish(task_id)
+    return results
 
 # =====================================================
 # 분석 요청 API
@@ -28,68 +182,178 @@ def analyze_request():
         url_to_analyze = data.get("url")
         callback_url = data.get("callback_url")
         website_id = data.get("website_id")  # optional
-        
+        force = bool(data.get("force"))      # true 면 캐시를 무시하고 다시 분석
+        # website_id 가 있으면 직전 스냅샷과 비교해 바뀐 부분만 다시 계산
+        incremental = bool(data.get("incremental", INCREMENTAL_ANALYSIS)) and website_id is not None
+        priority = data.get("priority", "normal")  # high | normal | low
+
         if not url_to_analyze or not callback_url:
             return jsonify({"error": "Missing 'url' or 'callback_url'"}), 400
+        if priority not in PRIORITIES:
+            return jsonify({"error": f"Invalid priority (one of {', '.join(PRIORITIES)})"}), 400
+        # 뷰포트 프로필 (mobile | tablet | desktop), 없으면 ANALYSIS_PROFILES
+        try:
+            profiles = parse_profiles(data.get("profiles"))
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
 
         task_id = os.urandom(8).hex()
         log_path = os.path.join(LOG_DIR, f"{task_id}.log")
 
         logging.info(f"[{task_id}] Received analyze request for {url_to_analyze}")
 
-        command = [
-            DOCKER_BIN, "run", "--rm",
-            "-v", f"{RESULT_DIR}:/app/callback_results",
-            "--pull=never", "--shm-size", "2gb",
-            "--security-opt", "seccomp=unconfined",
-            "--memory", "2g", "--cpus", "1.0",
-            "--pids-limit", "200",
-            "--tmpfs", "/tmp:rw,size=256m",
-            "--name", f"worker-{task_id}",
-            ECR_IMAGE,
-            url_to_analyze, callback_url, task_id
-        ]
-
-        # website_id가 존재하면 추가
-        if website_id:
-            command.append(website_id)
-
-        logging.info(f"[{task_id}] Running docker command: {' '.join(command)}")
+        # RESULT_CACHE_SHORTCUT=on: TTL 안의 같은 URL/프로필/모델 결과가 있으면 워커 없이 바로 응답
+        if result_cache is not None and not force:
+            entry = result_cache.get(cache_key(url_to_analyze, profiles_key(profiles)))
+            if entry:
+                with open(log_path, "w") as logf:
+                    logf.write(f"[{task_id}] cache hit: {url_to_analyze}\n")
+                # outbox 기록이 끝난 뒤에만 done (기록에 실패하면 아래 except 에서 500)
+                results = replay_cached_result(entry, task_id, callback_url, website_id)
+                pool.tasks.update(task_id, status="done", url=url_to_analyze, cached=True)
+                TASKS_ACCEPTED.inc(source="cache")
+                logging.info(f"[{task_id}] Served from result cache ({result_cache.stats()})")
+                return jsonify({
+                    "message": "Cached result",
+                    "task_id": task_id,
+                    "status": "done",
+                    "cached": True,
+                    "results": results
+                }), 200
 
+        # 워커가 잡기 전에도 /logs 로 상태를 볼 수 있도록 로그 파일을 먼저 만든다
         with open(log_path, "w") as logf:
-            subprocess.Popen(
-                command,
-                stdout=logf,
-                stderr=subprocess.STDOUT,
-                start_new_session=True
-            )
+            logf.write(f"[{task_id}] queued: {url_to_analyze}\n")
+
+        accepted = pool.submit({
+            "task_id": task_id,
+            "url": url_to_analyze,
+            "callback_url": callback_url,
+            "website_id": website_id,
+            "force": force,
+            "incremental": incremental,
+            "profiles": profiles
+        }, priority=priority)
+        if not accepted:
+            # 대기열이 가득 참: 워커를 늘리지 않고 거절해 이미 받은 작업이 느려지지 않게 한다
+            TASKS_REJECTED.inc()
+            os.remove(log_path)
+            retry_after = pool.retry_after()
+            logging.warning(f"[{task_id}] Queue full ({pool.queue_depth()}), rejected")
+            return jsonify({
+                "error": "Too many pending tasks",
+                "queue_depth": pool.queue_depth(),
+                "retry_after": retry_after
+            }), 429, {"Retry-After": str(retry_after)}
 
-        logging.info(f"[{task_id}] Worker started (logging to {log_path})")
+        TASKS_ACCEPTED.inc(source="worker")
+        logging.info(f"[{task_id}] Task queued (queue depth: {pool.queue_depth()})")
 
         return jsonify({
-            "message": "Worker started",
+            "message": "Task queued",
             "task_id": task_id,
-            "status": "processing"
+            "status": "queued"
         }), 202
 
     except Exception as e:
         logging.error(f"Error during analyze_request: {e}", exc_info=True)
         return jsonify({"error": str(e)}), 500
 
+# =====================================================
+# 작업 상태 API
+# =====================================================
+# queued → running → done | failed (실패 시 error, 워커가 죽었으면 exit_code)
+@app.route("/tasks/<task_id>", methods=["GET"])
+def get_task(task_id):
+    task = pool.tasks.get(task_id)
+    if task is None:
+        return jsonify({"error": "Task not found"}), 404
+    if task["status"] == "queued":
+        task["queue_depth"] = pool.queue_depth()
+    return jsonify(task)
+
 # =====================================================
 # Docker 로그 조회 API
 # =====================================================
+# 파일 전체를 읽지 않는다:
+#   Range: bytes=a-b | ?offset=N&length=M  → 해당 구간만 (206)
+#   ?tail=N                                 → 마지막 N줄
+#   ?follow=1                               → 새로 쓰이는 내용을 계속 전송 (Accept: text/event-stream 이면 SSE)
+# 응답 헤더 X-Log-Size / X-Log-Next-Offset 으로 다음 폴링을 ?offset= 으로 이어 받을 수 있다.
+def follow_log(task_id, log_path):
+    offset = request.args.get("offset") or request.headers.get("Last-Event-ID") or 0
+    try:
+        offset = int(offset)
+        if request.args.get("tail"):
+            offset = tail_offset(log_path, int(request.args["tail"]))
+    except ValueError:
+        return jsonify({"error": "Invalid offset/tail"}), 400
+    chunks = log_follower.follow(task_id, log_path, offset=offset, timeout=LOG_FOLLOW_TIMEOUT)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if "text/event-stream" in request.headers.get("Accept", ""):
+        return Response(stream_with_context(sse_events(chunks)), mimetype="text/event-stream", headers=headers)
+    body = (data for _, data in chunks if data)
+    return Response(stream_with_context(body), mimetype="text/plain", headers=headers)
+
 @app.route("/logs/<task_id>", methods=["GET"])
 def get_log(task_id):
     log_path = os.path.join(LOG_DIR, f"{task_id}.log")
     if not os.path.exists(log_path):
         return jsonify({"error": "No log found"}), 404
-    with open(log_path, "r") as f:
-        return f.read(), 200, {"Content-Type": "text/plain"}
+    if request.args.get("follow") in ("1", "true"):
+        return follow_log(task_id, log_path)
+
+    size = os.path.getsize(log_path)
+    status, start, end = 200, 0, size
+    try:
+        byte_range = parse_range(request.headers.get("Range"), size)
+        if byte_range:
+            (start, end), status = byte_range, 206
+        elif request.args.get("offset") or request.args.get("length"):
+            start = min(max(0, int(request.args.get("offset", 0))), size)
+            length = request.args.get("length")
+            end = min(start + max(0, int(length)), size) if length else size
+            status = 206 if (start, end) != (0, size) and end > start else 200
+        elif request.args.get("tail"):
+            start = tail_offset(log_path, int(request.args["tail"]))
+    except ValueError:
+        if request.headers.get("Range"):
+            return "", 416, {"Content-Range": f"bytes */{size}"}
+        return jsonify({"error": "Invalid offset/length/tail"}), 400
+
+    headers = {
+        "Content-Type": "text/plain; charset=utf-8",
+        "Content-Length": str(end - start),
+        "Accept-Ranges": "bytes",
+        "X-Log-Size": str(size),
+        "X-Log-Next-Offset": str(end)
+    }
+    if status == 206:
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    return Response(iter_range(log_path, start, end), status=status, headers=headers)
 
 # =====================================================
 # Worker 콜백 결과 저장 API
 # =====================================================
+def record_callback(data):
+    """콜백 수/크기와 워커가 보고한 단계별 시간을 메트릭에 반영"""
+    CALLBACKS_RECEIVED.inc()
+    CALLBACK_BYTES.observe(request.content_length or len(request.get_data()))
+    results = data.get("results") or {}
+    stages = (results.get("timings") or {}).get("stages") or {}
+    if not isinstance(stages, dict):
+        stages = {}
+    for stage, seconds in stages.items():
+        if isinstance(seconds, (int, float)) and not isinstance(seconds, bool) and 0 <= seconds < float("inf"):
+            STAGE_SECONDS.observe(seconds, stage=stage if stage in PIPELINE_STAGES else "other")
+    # callback 단계: 워커가 outbox 에 넣은 시각부터 여기 도착할 때까지 (재시도 포함)
+    enqueued_at = request.headers.get("X-Enqueued-At")
+    if enqueued_at:
+        try:
+            STAGE_SECONDS.observe(max(0.0, time.time() - float(enqueued_at)), stage="callback")
+        except ValueError:
+            pass
+
 @app.route("/result", methods=["POST"])
 def save_callback():
     if not request.is_json:
@@ -99,10 +363,10 @@ def save_callback():
         task_id = data.get("task_id")
         if not task_id:
             return jsonify({"error": "Missing task_id in payload"}), 400
-        result_path = os.path.join(RESULT_DIR, f"{task_id}.json")
-        with open(result_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        logging.info(f"[{task_id}] Callback result saved to {result_path}")
+        record_callback(data)
+        # 받은 바이트를 그대로 압축 저장 (다시 직렬화하지 않는다)
+        result_store.put(task_id, request.get_data(), data)
+        logging.info(f"[{task_id}] Callback result saved to {RESULT_STORE_PATH}")
         return jsonify({"ok": True}), 200
     except Exception as e:
         logging.error(f"Error saving callback: {e}", exc_info=True)
@@ -113,12 +377,41 @@ def save_callback():
 # =====================================================
 @app.route("/results/<task_id>", methods=["GET"])
 def get_result(task_id):
+    headers = {"Content-Type": "application/json; charset=utf-8", "Vary": "Accept-Encoding"}
+    payload = result_store.get_compressed(task_id)
+    if payload is not None:
+        # 저장된 바이트를 그대로: deflate 를 받는 클라이언트에는 압축을 풀지도 않는다
+        if "deflate" in request.headers.get("Accept-Encoding", ""):
+            return payload, 200, dict(headers, **{"Content-Encoding": "deflate"})
+        return zlib.decompress(payload), 200, headers
+    # 저장소 도입 전에 파일로 저장된 결과
     result_path = os.path.join(RESULT_DIR, f"{task_id}.json")
     if not os.path.exists(result_path):
         return jsonify({"error": "Result not found"}), 404
-    with open(result_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return jsonify(data)
+    with open(result_path, "rb") as f:
+        return f.read(), 200, headers
+
+# 목록: ?website_id=&since=&until=&limit=&cursor= (analysis_date 내림차순, next_cursor 로 다음 페이지)
+@app.route("/results", methods=["GET"])
+def list_results():
+    try:
+        items, next_cursor = result_store.query(
+            website_id=request.args.get("website_id"),
+            since=request.args.get("since"),
+            until=request.args.get("until"),
+            limit=request.args.get("limit", 50),
+            cursor=request.args.get("cursor")
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid limit/cursor"}), 400
+    return jsonify({"items": items, "next_cursor": next_cursor})
+
+# =====================================================
+# 메트릭 API (Prometheus 텍스트 형식)
+# =====================================================
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    return metrics.render(), 200, {"Content-Type": CONTENT_TYPE}
 
 # =====================================================
 # Flask 실행
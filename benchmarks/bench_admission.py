@@ -0,0 +1,124 @@
+"""
+스케줄러/입장 제어: 가짜 워커(fake_worker.py)로 WorkerPool 에 요청을 몰아 넣어 측정한다.
+
+--burst 건을 한꺼번에 제출해 큐 크기를 넘는 요청이 거절(429 에 해당)되는지, 동시에 실행된 작업 수가
+풀 크기를 넘지 않는지, 받아들인 작업의 대기 시간 p50/p95 와 처리량, 우선순위별 대기 시간을 본다.
+일부 작업은 실패/비정상 종료하게 해 상태(failed, exit_code)가 남는지도 확인한다.
+
+    python benchmarks/bench_admission.py --size 4 --queue 20 --burst 60 --sleep 0.2
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+from worker_pool import WorkerPool, PRIORITIES
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def peak_concurrency(tasks):
+    """started_at/finished_at 구간이 가장 많이 겹친 수"""
+    events = []
+    for task in tasks:
+        if task.get("started_at") and task.get("finished_at"):
+            events.append((task["started_at"], 1))
+            events.append((task["finished_at"], -1))
+    peak = current = 0
+    for _, delta in sorted(events, key=lambda e: (e[0], e[1])):  # 같은 시각이면 끝난 것부터
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=4, help="워커 풀 크기 (동시 실행 상한)")
+    parser.add_argument("--queue", type=int, default=20, help="대기열 최대 길이")
+    parser.add_argument("--burst", type=int, default=60, help="한꺼번에 제출할 요청 수")
+    parser.add_argument("--sleep", type=float, default=0.2, help="작업 1건 시간(초)")
+    parser.add_argument("--fail-every", type=int, default=10, help="n 건마다 1건 실패 (0 이면 없음)")
+    parser.add_argument("--crash-every", type=int, default=15, help="n 건마다 1건 워커 비정상 종료 (0 이면 없음)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        argv = [sys.executable, os.path.join(HERE, "fake_worker.py"), "--sleep", str(args.sleep), "--log-dir", log_dir]
+        pool = WorkerPool(lambda slot, generation: {"argv": argv, "cwd": None, "name": None},
+                          size=args.size, max_queue=args.queue, job_timeout=60, health_interval=5)
+        pool.start()
+        # 워커가 모두 뜬 뒤에 잰다 (기동 비용 제외)
+        for i in range(args.size):
+            pool.submit({"task_id": f"warm-{i}", "url": "fake://warm?sleep=0"})
+        while any(pool.tasks.get(f"warm-{i}")["status"] in ("queued", "running") for i in range(args.size)):
+            time.sleep(0.01)
+
+        names = list(PRIORITIES)
+        accepted, rejected = {}, 0
+        started = time.monotonic()
+        for i in range(args.burst):
+            query = f"sleep={args.sleep}"
+            if args.crash_every and i % args.crash_every == args.crash_every - 1:
+                query += "&exit=3"
+            elif args.fail_every and i % args.fail_every == args.fail_every - 1:
+                query += "&fail=1"
+            task_id = f"task-{i:05d}"
+            priority = names[i % len(names)]
+            if pool.submit({"task_id": task_id, "url": f"fake://page/{i}?{query}"}, priority=priority):
+                accepted[task_id] = (time.time(), priority)
+            else:
+                rejected += 1
+        retry_after = pool.retry_after()
+
+        while any(pool.tasks.get(t)["status"] in ("queued", "running") for t in accepted):
+            time.sleep(0.02)
+        seconds = time.monotonic() - started
+        pool.shutdown()
+
+    tasks = [pool.tasks.get(t) for t in accepted]
+    waits = {name: [] for name in names}
+    for task in tasks:
+        submitted, priority = accepted[task["task_id"]]
+        waits[priority].append(task["started_at"] - submitted)
+    all_waits = [w for values in waits.values() for w in values]
+    statuses = {}
+    for task in tasks:
+        statuses[task["status"]] = statuses.get(task["status"], 0) + 1
+    result = {
+        "size": args.size,
+        "queue": args.queue,
+        "burst": args.burst,
+        "accepted": len(accepted),
+        "rejected": rejected,
+        "retry_after": retry_after,
+        "statuses": statuses,
+        "crash_exit_codes": sorted({t["exit_code"] for t in tasks if t.get("exit_code") is not None}),
+        "peak_concurrency": peak_concurrency(tasks),
+        "wait_p50": round(percentile(all_waits, 50), 3),
+        "wait_p95": round(percentile(all_waits, 95), 3),
+        "wait_p95_by_priority": {name: round(percentile(values, 95), 3) for name, values in waits.items() if values},
+        "tasks_per_second": round(len(accepted) / seconds, 2)
+    }
+    result["ok"] = result["peak_concurrency"] <= args.size and result["accepted"] <= args.size + args.queue
+
+    print(json.dumps(result, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
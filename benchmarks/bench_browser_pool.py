@@ -0,0 +1,95 @@
+"""
+URL 여러 개를 분석할 때 브라우저 매번 실행 vs BrowserPool 컨텍스트 재사용 처리량 비교
+
+    python benchmarks/bench_browser_pool.py --pages 10
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "element_analysis"))
+sys.path.insert(0, HERE)
+
+from browser_pool import BrowserPool
+from crawl import WebAnalyzer
+from local_server import serve_directory
+
+
+def write_pages(directory, count):
+    for i in range(count):
+        items = "\n".join(f'<li><a href="#{j}">항목 {j}</a> <button>버튼 {j}</button></li>' for j in range(30))
+        with open(os.path.join(directory, f"page_{i}.html"), "w", encoding="utf-8") as f:
+            f.write(f"<!doctype html><html lang='ko'><body><h1>페이지 {i}</h1><ul>{items}</ul></body></html>")
+    return [f"page_{i}.html" for i in range(count)]
+
+
+def run_fresh(urls):
+    timings = []
+    for url in urls:
+        started = time.perf_counter()
+        crawler = WebAnalyzer()
+        try:
+            crawler.analyze(url)
+        finally:
+            crawler.close()
+        timings.append(time.perf_counter() - started)
+    return timings, []
+
+
+def run_pooled(urls):
+    pool = BrowserPool(size=1)
+    pool.warm_up()
+    timings, contexts = [], []
+    try:
+        for url in urls:
+            started = time.perf_counter()
+            with pool.acquire() as driver:
+                contexts.append(pool.last_context_seconds)
+                WebAnalyzer(driver=driver).analyze(url)
+            timings.append(time.perf_counter() - started)
+    finally:
+        pool.close()
+    return timings, contexts
+
+
+def summarize(name, timings, contexts):
+    total = sum(timings)
+    summary = {
+        "mode": name,
+        "pages": len(timings),
+        "mean_seconds": round(statistics.mean(timings), 3),
+        "pages_per_minute": round(len(timings) / total * 60, 2)
+    }
+    if contexts:
+        summary["mean_context_ms"] = round(statistics.mean(contexts) * 1000, 1)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as site:
+        names = write_pages(site, args.pages)
+        with serve_directory(site) as base:
+            urls = [f"{base}/{name}" for name in names]
+            for name, runner in (("fresh", run_fresh), ("pooled", run_pooled)):
+                results.append(summarize(name, *runner(urls)))
+
+    for row in results:
+        print(json.dumps(row, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+명암비 계산 비용: contrast 모듈(파싱 캐시 + NumPy 일괄 계산) vs 이전 스칼라 방식(쌍마다 re.findall)
+
+무작위 색 쌍을 만들어 두 방식의 시간을 재고, 불투명 쌍에서 값이 같은지 확인한다.
+
+    python benchmarks/bench_contrast.py --pairs 100000 --palette 2000 --alpha-ratio 0.2
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "element_analysis"))
+
+import numpy as np
+
+import contrast
+
+
+def legacy_luminance(rgb):
+    r, g, b = [x / 255.0 for x in rgb]
+    def ch(c): return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+    return 0.2126 * ch(r) + 0.7152 * ch(g) + 0.0722 * ch(b)
+
+
+def legacy_ratios(foregrounds, backgrounds):
+    """이전 WebAnalyzer 방식: 쌍마다 정규식으로 숫자를 뽑고 알파는 무시"""
+    out = []
+    for fg, bg in zip(foregrounds, backgrounds):
+        rgb_fg = tuple(map(int, re.findall(r'\d+', fg)[:3]))
+        rgb_bg = tuple(map(int, re.findall(r'\d+', bg)[:3]))
+        l1, l2 = legacy_luminance(rgb_fg), legacy_luminance(rgb_bg)
+        out.append((max(l1, l2) + 0.05) / (min(l1, l2) + 0.05))
+    return out
+
+
+def make_palette(size, alpha_ratio, rng):
+    palette = []
+    for _ in range(size):
+        r, g, b = rng.randrange(256), rng.randrange(256), rng.randrange(256)
+        if rng.random() < alpha_ratio:
+            palette.append(f"rgba({r}, {g}, {b}, {rng.choice([0.1, 0.25, 0.5, 0.75, 0.9])})")
+        else:
+            palette.append(f"rgb({r}, {g}, {b})")
+    return palette
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=100000)
+    parser.add_argument("--palette", type=int, default=2000, help="고유 색 문자열 수 (실제 페이지는 수십~수백)")
+    parser.add_argument("--alpha-ratio", type=float, default=0.2, help="반투명 색 비율")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    palette = make_palette(args.palette, args.alpha_ratio, rng)
+    foregrounds = [rng.choice(palette) for _ in range(args.pairs)]
+    backgrounds = [rng.choice(palette) for _ in range(args.pairs)]
+
+    started = time.perf_counter()
+    legacy = np.array(legacy_ratios(foregrounds, backgrounds))
+    legacy_seconds = time.perf_counter() - started
+
+    contrast.parse_color.cache_clear()
+    started = time.perf_counter()
+    vectorized = contrast.contrast_ratios(foregrounds, backgrounds)
+    cold_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    contrast.contrast_ratios(foregrounds, backgrounds)
+    warm_seconds = time.perf_counter() - started
+
+    opaque = np.array([not fg.startswith("rgba") and not bg.startswith("rgba")
+                       for fg, bg in zip(foregrounds, backgrounds)])
+    result = {
+        "pairs": args.pairs,
+        "distinct_colors": len(set(palette)),
+        "legacy_seconds": round(legacy_seconds, 4),
+        "vectorized_seconds": round(cold_seconds, 4),
+        "vectorized_warm_seconds": round(warm_seconds, 4),
+        "speedup": round(legacy_seconds / cold_seconds, 1) if cold_seconds else None,
+        "opaque_max_abs_diff": float(np.max(np.abs(legacy[opaque] - vectorized[opaque]))) if opaque.any() else 0.0,
+        "translucent_pairs_changed": int(np.count_nonzero(~np.isclose(legacy[~opaque], vectorized[~opaque])))
+    }
+    print(json.dumps(result, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+조상 중복 제거 비용: 구간 인덱스(현재) vs parentElement 왕복 탐색(이전 is_processed_child)
+
+깊게 중첩된 페이지/큰 페이지를 로컬로 서빙해 요소 수집 + 배치 처리 시간과 WebDriver 왕복 수를 잰다.
+
+    python benchmarks/bench_dedup.py --depth 200 --breadth 400
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "element_analysis"))
+sys.path.insert(0, HERE)
+
+from crawl import WebAnalyzer
+from local_server import serve_directory
+
+
+def nested_page(depth, breadth):
+    # 깊이 depth 의 div 사슬 + 각 단계에 짧은 텍스트 span, 마지막에 넓은 목록
+    opening = "".join(f'<div class="lvl"><span>단계 {i}</span>' for i in range(depth))
+    closing = "</div>" * depth
+    items = "".join(f"<p>문단 {i} <span>text {i}</span></p><button>버튼 {i}</button>" for i in range(breadth))
+    return f"<!doctype html><html lang='ko'><body>{opening}{items}{closing}</body></html>"
+
+
+def legacy_dedup(crawler, elements, records):
+    """이전 방식: 요소마다 parentElement 를 한 단계씩 WebDriver 로 올라가며 집합 검사"""
+    processed = set()
+    for data in records:
+        el = elements[data["index"]]
+        if el is None or not data["isVisible"]:
+            continue
+        parent, covered = el, False
+        while parent:
+            if parent in processed:
+                covered = True
+                break
+            parent = crawler.driver.execute_script("return arguments[0].parentElement;", parent)
+        if not covered and (data["text"] or data["tagName"] == "button") and not data["hasTextChild"]:
+            processed.add(el)
+    return len(processed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=200)
+    parser.add_argument("--breadth", type=int, default=400)
+    parser.add_argument("--skip-legacy", action="store_true", help="이전 방식 측정 생략 (매우 느림)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as site:
+        with open(os.path.join(site, "nested.html"), "w", encoding="utf-8") as f:
+            f.write(nested_page(args.depth, args.breadth))
+        with serve_directory(site) as base:
+            crawler = WebAnalyzer()
+            try:
+                crawler.driver.get(f"{base}/nested.html")
+                # 전체 페이지를 뷰포트에 넣어 모든 요소가 대상이 되게 한다
+                height = crawler.driver.execute_script("return document.documentElement.scrollHeight")
+                crawler.driver.set_window_size(375, min(height, 12000))
+                crawler.reset_state()
+
+                started = time.perf_counter()
+                elements, records = crawler.collect_viewport_elements()
+                crawler.process_elements_batch(elements, records)
+                interval_seconds = time.perf_counter() - started
+                result = {
+                    "records": len(records),
+                    "accepted": len(crawler.accepted_subtrees),
+                    "interval_seconds": round(interval_seconds, 4),
+                    "interval_round_trips": crawler.round_trips
+                }
+
+                if not args.skip_legacy:
+                    before = crawler.driver.round_trips
+                    started = time.perf_counter()
+                    legacy_accepted = legacy_dedup(crawler, elements, records)
+                    result.update({
+                        "legacy_accepted": legacy_accepted,
+                        "legacy_dedup_seconds": round(time.perf_counter() - started, 4),
+                        "legacy_round_trips": crawler.driver.round_trips - before
+                    })
+            finally:
+                crawler.close()
+
+    print(json.dumps(result, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
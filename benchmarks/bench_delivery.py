@@ -0,0 +1,131 @@
+"""
+콜백 전달: outbox + 백그라운드 재시도(현재) vs 동기 requests.post 1회(이전)
+
+일정 비율로 503 을 돌려주거나 응답을 늦추는 로컬 콜백 서버를 띄워
+분석 스레드가 막히는 시간, 전달 지연(p50/p95), 재시도 수, 중복 수신, 유실 건수를 잰다.
+
+    python benchmarks/bench_delivery.py --tasks 200 --fail-rate 0.3 --slow-rate 0.1
+"""
+import argparse
+import http.server
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "element_analysis"))
+sys.path.insert(0, HERE)
+
+import requests
+
+from delivery import CallbackDelivery, Outbox
+from local_server import serve_handler
+
+
+def flaky_handler(fail_rate, slow_rate, slow_seconds, seed):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    received = {}  # Idempotency-Key → 성공 응답 횟수
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with lock:
+                roll = rng.random()
+            if roll < slow_rate:
+                time.sleep(slow_seconds)
+            status = 503 if roll > 1 - fail_rate else 200
+            if status == 200:
+                key = self.headers.get("Idempotency-Key") or f"anon-{time.monotonic()}"
+                with lock:
+                    received[key] = received.get(key, 0) + 1
+            body = b'{"ok": true}' if status == 200 else b'{"error": "unavailable"}'
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler, received
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--fail-rate", type=float, default=0.3, help="503 응답 비율")
+    parser.add_argument("--slow-rate", type=float, default=0.1, help="응답 지연 비율")
+    parser.add_argument("--slow-seconds", type=float, default=0.5)
+    parser.add_argument("--base-delay", type=float, default=0.05, help="첫 재시도 대기(초)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    payload = {"results": {"summary": {"final_score": 42.0}, "padding": "x" * 20000}}
+
+    result = {"tasks": args.tasks, "fail_rate": args.fail_rate, "slow_rate": args.slow_rate}
+
+    # 이전 방식: 분석 스레드에서 바로 post, 실패하면 유실
+    handler, received = flaky_handler(args.fail_rate, args.slow_rate, args.slow_seconds, args.seed)
+    with serve_handler(handler) as base:
+        blocked = []
+        lost = 0
+        for i in range(args.tasks):
+            started = time.perf_counter()
+            try:
+                if requests.post(f"{base}/result", json={"task_id": f"legacy-{i}", **payload}, timeout=30).status_code != 200:
+                    lost += 1
+            except Exception:
+                lost += 1
+            blocked.append(time.perf_counter() - started)
+        result["legacy"] = {"blocked_total": round(sum(blocked), 3), "blocked_p95": percentile(blocked, 0.95),
+                            "lost": lost}
+
+    # 현재 방식: outbox 기록 후 반환, 백그라운드에서 재시도
+    handler, received = flaky_handler(args.fail_rate, args.slow_rate, args.slow_seconds, args.seed)
+    with serve_handler(handler) as base, tempfile.TemporaryDirectory() as outbox_dir:
+        delivery = CallbackDelivery(Outbox(outbox_dir), base_delay=args.base_delay, max_attempts=12).start()
+        blocked = []
+        for i in range(args.tasks):
+            started = time.perf_counter()
+            delivery.submit(f"task-{i}", f"{base}/result", {"task_id": f"task-{i}", **payload})
+            blocked.append(time.perf_counter() - started)
+        left = delivery.flush(timeout=120)
+        stats = delivery.stats()
+        delivery.stop(flush_timeout=0)
+        result["outbox"] = {
+            "blocked_total": round(sum(blocked), 3),
+            "blocked_p95": percentile(blocked, 0.95),
+            "delivered": stats["delivered"],
+            "dead": stats["dead"],
+            "left_pending": left,
+            "attempts": stats["attempts"],
+            "retries": stats["retries"],
+            "latency_p50": stats["latency_p50"],
+            "latency_p95": stats["latency_p95"],
+            "latency_max": stats["latency_max"],
+            "duplicates_received": sum(n - 1 for n in received.values() if n > 1)
+        }
+
+    print(json.dumps(result, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
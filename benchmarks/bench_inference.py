@@ -0,0 +1,73 @@
+"""
+배치 크기별 추론 처리량(images/sec) 측정
+
+    python benchmarks/bench_inference.py --images tmp/file --batch-sizes 1,2,4,8
+    python benchmarks/bench_inference.py --synthetic 16 --height 1624 --width 750
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "element_analysis"))
+
+import numpy as np
+from PIL import Image
+
+from element import ModelRegistry, UIAnalyzer
+
+
+def load_images(args):
+    if args.images:
+        paths = sorted(glob.glob(os.path.join(args.images, "*.png")))
+        if not paths:
+            sys.exit(f"PNG 파일이 없습니다: {args.images}")
+        return paths
+    rng = np.random.default_rng(0)
+    return [
+        Image.fromarray(rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8))
+        for _ in range(args.synthetic)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", help="스크린샷 PNG 디렉토리")
+    parser.add_argument("--synthetic", type=int, default=8, help="합성 이미지 개수 (--images 미지정 시)")
+    parser.add_argument("--height", type=int, default=1624)
+    parser.add_argument("--width", type=int, default=750)
+    parser.add_argument("--batch-sizes", default="1,2,4,8")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    images = load_images(args)
+    analyzer = UIAnalyzer()
+    loaded = ModelRegistry.get()
+    print(f"모델 로드 {loaded.load_time:.3f}s, 워밍업 {loaded.warmup_time:.3f}s, 이미지 {len(images)}장")
+
+    results = []
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        elapsed = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            analyzer.detect_batch(images, batch_size=batch_size)
+            elapsed.append(time.perf_counter() - started)
+        best = min(elapsed)
+        results.append({
+            "batch_size": batch_size,
+            "images": len(images),
+            "best_seconds": round(best, 4),
+            "images_per_sec": round(len(images) / best, 3)
+        })
+        print(f"batch={batch_size:<3} {len(images) / best:8.3f} images/sec (best {best:.3f}s)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
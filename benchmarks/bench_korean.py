@@ -0,0 +1,98 @@
+"""
+한국어 비율 계산: 분류표 + NumPy 일괄 판정(현재) vs 문자마다 범위 5개를 도는 루프(이전)
+
+한글 음절/자모, 영문, 숫자, 공백, 기호, BMP 밖 문자(이모지)를 섞은 텍스트를 --megabytes 만큼 만들어
+요소 텍스트 목록으로 나눈 뒤 두 방식의 시간과 결과(한글 수/전체 수)가 같은지 확인한다.
+
+    python benchmarks/bench_korean.py --megabytes 8 --hangul-share 0.5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "element_analysis"))
+
+import scoring
+
+LATIN = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+OTHER = "  \t.,!?()[]-_/:;·…「」%₩$"
+EXTRA = "ㄱㄴㄷㅏㅑㅓ" + "ꥠꥡ" + "ힰힱ" + "ᄀᄁ" + "Ａｂ１" + "😀🎉𝐀"  # 호환 자모, 확장 자모, 전각, BMP 밖
+
+
+def synthetic_texts(megabytes, hangul_share, seed):
+    rng = random.Random(seed)
+    target = int(megabytes * 2 ** 20)
+    texts, size = [], 0
+    while size < target:
+        length = rng.randint(1, 80)
+        chars = []
+        for _ in range(length):
+            roll = rng.random()
+            if roll < hangul_share:
+                chars.append(chr(rng.randint(0xAC00, 0xD7A3)))
+            elif roll < hangul_share + (1 - hangul_share) * 0.7:
+                chars.append(rng.choice(LATIN))
+            elif roll < 0.98:
+                chars.append(rng.choice(OTHER))
+            else:
+                chars.append(rng.choice(EXTRA))
+        text = "".join(chars)
+        texts.append(text)
+        size += len(text.encode("utf-8"))
+    return texts, size
+
+
+def legacy_totals(texts):
+    """이전 WebAnalyzer.is_korean_text + calculate_korean_ratio"""
+    korean_ranges = [(0xAC00, 0xD7A3), (0x1100, 0x11FF), (0x3130, 0x318F), (0xA960, 0xA97F), (0xD7B0, 0xD7FF)]
+    korean_chars = 0; total_chars = 0
+    for text in texts:
+        if not text:
+            continue
+        for ch in text:
+            if ch.strip() and ch.isalnum():
+                total_chars += 1
+                code = ord(ch)
+                for start, end in korean_ranges:
+                    if start <= code <= end:
+                        korean_chars += 1; break
+    return korean_chars, total_chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=float, default=8)
+    parser.add_argument("--hangul-share", type=float, default=0.5, help="한글 음절 비율")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    texts, size = synthetic_texts(args.megabytes, args.hangul_share, args.seed)
+    result = {"texts": len(texts), "utf8_bytes": size}
+
+    started = time.perf_counter()
+    scoring.korean_lut()
+    result["lut_build_seconds"] = round(time.perf_counter() - started, 4)
+
+    for name, fn in (("legacy", legacy_totals), ("vectorized", scoring.korean_totals)):
+        started = time.perf_counter()
+        korean_chars, total_chars = fn(texts)
+        seconds = time.perf_counter() - started
+        result[name] = {"seconds": round(seconds, 4), "mb_per_second": round(size / 2 ** 20 / seconds, 2),
+                        "korean_chars": korean_chars, "total_chars": total_chars}
+    result["match"] = (result["legacy"]["korean_chars"], result["legacy"]["total_chars"]) == \
+        (result["vectorized"]["korean_chars"], result["vectorized"]["total_chars"])
+    result["speedup"] = round(result["legacy"]["seconds"] / result["vectorized"]["seconds"], 1)
+
+    print(json.dumps(result, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
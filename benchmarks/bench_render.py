@@ -0,0 +1,73 @@
+"""
+탐지 결과 렌더러 비교: PIL ImageDraw vs 기존 matplotlib
+
+    python benchmarks/bench_render.py --height 12000 --boxes 50
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "element_analysis"))
+
+import numpy as np
+from PIL import Image
+
+from element import UIAnalyzer, render_detections, render_detections_matplotlib
+
+
+def synthetic_detection(width, height, count, rng):
+    x1 = rng.uniform(0, width * 0.8, count)
+    y1 = rng.uniform(0, height * 0.95, count)
+    boxes = np.stack([x1, y1, x1 + rng.uniform(40, width * 0.2, count), y1 + rng.uniform(40, 200, count)], axis=1)
+    return {
+        "boxes": boxes.astype(np.float32),
+        "scores": rng.uniform(0.5, 1.0, count).astype(np.float32),
+        "labels": rng.integers(1, 13, count),
+        "button_count": 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--height", type=int, default=12000)
+    parser.add_argument("--width", type=int, default=750)
+    parser.add_argument("--boxes", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+    detection = synthetic_detection(args.width, args.height, args.boxes, rng)
+    class_mapping = UIAnalyzer()._load_class_mapping()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, renderer in (("pil", render_detections), ("matplotlib", render_detections_matplotlib)):
+            out = os.path.join(tmp, f"{name}.png")
+            elapsed = []
+            for _ in range(args.repeat):
+                image = Image.fromarray(pixels)
+                started = time.perf_counter()
+                renderer(image, detection, class_mapping, out)
+                elapsed.append(time.perf_counter() - started)
+            with Image.open(out) as rendered:
+                size = rendered.size
+            results.append({
+                "renderer": name,
+                "best_seconds": round(min(elapsed), 4),
+                "output_size": list(size),
+                "output_bytes": os.path.getsize(out)
+            })
+            print(json.dumps(results[-1]))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+콜백 결과 저장: ResultStore(SQLite WAL + zlib) vs task 마다 indent=2 JSON 파일(이전)
+
+콜백 1건 = 트랜잭션 1건으로 --total 건을 넣으면서 구간마다 저장/단건 조회/목록 페이지 처리량을 재어
+저장 건수가 늘어도 처리량이 유지되는지 본다. 이전 방식은 --legacy 건까지만 같은 방식으로 잰다.
+
+    python benchmarks/bench_result_store.py --total 1000000 --checkpoints 10 --legacy 20000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+from result_store import ResultStore
+
+
+def synthetic_payload(i, rng, padding):
+    return {
+        "task_id": f"task-{i:08d}",
+        "results": {
+            "analysis_info": {
+                "url": f"https://site-{i % 5000}.example/page/{i}",
+                "analysis_date": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:00:00",
+                "website_id": i % 5000,
+                "task_id": f"task-{i:08d}"
+            },
+            "summary": {"final_score": round(rng.uniform(10, 90), 2)},
+            "detailed_scores": {f"score_{k}": {"score": rng.random() * 100, "level": "양호"} for k in range(7)},
+            "recommendations": [{"category": "버튼 탐지도", "recommendation": "설명 " * padding}]
+        }
+    }
+
+
+def rate(count, seconds):
+    return round(count / seconds, 1) if seconds else None
+
+
+def measure_reads(lookup, listing, ids, rng, samples):
+    started = time.perf_counter()
+    for _ in range(samples):
+        lookup(rng.choice(ids))
+    lookups = rate(samples, time.perf_counter() - started)
+    pages = None
+    if listing:
+        started = time.perf_counter()
+        for _ in range(samples // 10 or 1):
+            listing(rng.randrange(5000))
+        pages = rate(samples // 10 or 1, time.perf_counter() - started)
+    return lookups, pages
+
+
+def bench_store(directory, total, checkpoints, padding, samples, seed):
+    rng = random.Random(seed)
+    store = ResultStore(os.path.join(directory, "results.sqlite3"))
+    step = max(1, total // checkpoints)
+    rows, ids = [], []
+    for start in range(0, total, step):
+        bodies = []
+        for i in range(start, min(total, start + step)):
+            data = synthetic_payload(i, rng, padding)
+            bodies.append((data["task_id"], json.dumps(data, ensure_ascii=False).encode("utf-8"), data))
+        started = time.perf_counter()
+        for task_id, body, data in bodies:
+            store.put(task_id, body, data)  # /result 와 같이 콜백마다 커밋
+        ingest = rate(len(bodies), time.perf_counter() - started)
+        ids.extend(task_id for task_id, _, _ in bodies)
+        lookups, pages = measure_reads(store.get_compressed,
+                                       lambda website_id: store.query(website_id=website_id, limit=50),
+                                       ids, rng, samples)
+        rows.append({"stored": len(ids), "ingest_per_second": ingest, "lookups_per_second": lookups,
+                     "pages_per_second": pages})
+        print(json.dumps(rows[-1]))
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    return rows, size
+
+
+def bench_legacy(directory, total, padding, samples, seed):
+    rng = random.Random(seed)
+    ids = []
+    started = time.perf_counter()
+    for i in range(total):
+        data = synthetic_payload(i, rng, padding)
+        with open(os.path.join(directory, f"{data['task_id']}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        ids.append(data["task_id"])
+    ingest = rate(total, time.perf_counter() - started)
+
+    def lookup(task_id):  # 이전 get_result: 파싱 후 다시 직렬화
+        with open(os.path.join(directory, f"{task_id}.json"), "r", encoding="utf-8") as f:
+            return json.dumps(json.load(f))
+
+    lookups, _ = measure_reads(lookup, None, ids, rng, samples)
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    return {"stored": total, "ingest_per_second": ingest, "lookups_per_second": lookups,
+            "list_by_website": "디렉토리 전체 스캔 필요", "bytes": size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--total", type=int, default=200000)
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument("--legacy", type=int, default=20000, help="이전 방식으로 저장할 건수 (0 이면 생략)")
+    parser.add_argument("--padding", type=int, default=200, help="본문 크기 조절 (권고 문구 반복 수)")
+    parser.add_argument("--samples", type=int, default=2000, help="구간마다 조회 횟수")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    result = {}
+    with tempfile.TemporaryDirectory() as directory:
+        result["store"], result["store_bytes"] = bench_store(directory, args.total, args.checkpoints,
+                                                             args.padding, args.samples, args.seed)
+    if args.legacy:
+        with tempfile.TemporaryDirectory() as directory:
+            result["legacy"] = bench_legacy(directory, args.legacy, args.padding, args.samples, args.seed)
+        print(json.dumps(result["legacy"], ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+점수 계산 마이크로벤치마크: scoring 모듈(열 단위 배열) vs 이전 WebAnalyzer 방식(요소 튜플 순회)
+
+합성 스타일 그룹/버튼/텍스트를 1k~1M 요소 규모로 만들어 Chromium 없이 항목별 시간을 재고,
+두 방식의 점수가 같은지 확인한다. --profile 을 주면 가장 큰 규모의 score_records 를 cProfile 로 본다.
+
+    python benchmarks/bench_scoring.py --sizes 1000,10000,100000,1000000
+    python benchmarks/bench_scoring.py --sizes 100000 --profile
+"""
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "element_analysis"))
+
+import scoring
+from contrast import contrast_ratios
+
+KO = "가나다라마바사아자차카타파하한국어접근성버튼메뉴검색"
+EN = "abcdefghijklmnopqrstuvwxyz0123456789"
+FONT_SIZES = ["11px", "12px", "13px", "14px", "16px", "18px", "24px", "1em", "medium"]
+
+
+def random_color(rng):
+    if rng.random() < 0.1:
+        return f"rgba({rng.randrange(256)}, {rng.randrange(256)}, {rng.randrange(256)}, {rng.random():.2f})"
+    return f"rgb({rng.randrange(256)}, {rng.randrange(256)}, {rng.randrange(256)})"
+
+
+def random_text(rng):
+    share = rng.random()
+    return "".join(rng.choice(KO) if rng.random() < share else rng.choice(EN + " ") for _ in range(rng.randint(0, 24)))
+
+
+def synthetic(size, seed=7):
+    """요소 size 개 → (style_groups, button_elements, crawl_records)"""
+    rng = random.Random(seed)
+    group_count = max(1, size // 40)  # 실제 페이지처럼 스타일 키가 요소보다 훨씬 적다
+    keys = [(rng.choice(FONT_SIZES), random_color(rng), random_color(rng)) for _ in range(group_count)]
+    style_groups = defaultdict(list)
+    for i in range(size):
+        key = keys[(int(rng.paretovariate(1.2)) - 1) % group_count]  # 몇몇 그룹에 요소가 몰린다
+        width, height = rng.randint(10, 200), rng.randint(10, 80)
+        style_groups[key].append((None, i, random_text(rng), rng.random() < 0.1, False, width, height,
+                                  scoring.font_px(key[0])))
+    buttons = [{
+        "width": rng.randint(10, 120), "height": rng.randint(10, 60),
+        "text_color": random_color(rng), "background_color": random_color(rng),
+        **{k: rng.random() < 0.4 for k in scoring.VISUAL_FEEDBACK_KEYS}
+    } for _ in range(max(1, size // 10))]
+    group_keys = list(style_groups)
+    records = {
+        "groups": {
+            "font_size": [k[0] for k in group_keys],
+            "color": [k[1] for k in group_keys],
+            "background_color": [k[2] for k in group_keys],
+            "count": [len(style_groups[k]) for k in group_keys],
+        },
+        "texts": [m[2] for k in group_keys for m in style_groups[k]],
+        "buttons": buttons,
+        "crawled_button_count": len(buttons)
+    }
+    return style_groups, buttons, records
+
+
+# ----------------------------- 이전 방식 (WebAnalyzer 메서드 그대로) -----------------------------
+def legacy_luminance(rgb):
+    r, g, b = [x / 255.0 for x in rgb]
+    def ch(c): return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+    return 0.2126 * ch(r) + 0.7152 * ch(g) + 0.0722 * ch(b)
+
+
+def legacy_font_size_score(style_groups, min_px=16):
+    total = 0; count = 0
+    for (font_size, _, _), group in style_groups.items():
+        px = float(font_size.replace("px", "").strip()) if isinstance(font_size, str) and font_size.endswith("px") else 16.0
+        n = len(group); total += n
+        if px >= min_px: count += n
+    return (count / total) * 100 if total else 0
+
+
+def legacy_overall_contrast_score(style_groups, min_contrast=4.5):
+    """알파를 무시하던 스칼라 계산 — 불투명 색에서만 scoring 과 같은 값"""
+    total = 0; count = 0
+    for (_, color, bg), group in style_groups.items():
+        l1 = legacy_luminance(tuple(map(int, re.findall(r'\d+', color)[:3])))
+        l2 = legacy_luminance(tuple(map(int, re.findall(r'\d+', bg)[:3])))
+        n = len(group); total += n
+        if (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05) >= min_contrast: count += n
+    return (count / total) * 100 if total else 0
+
+
+def legacy_button_size_score(buttons, min_size=44):
+    if not buttons: return 0
+    count = sum(1 for b in buttons if b['width'] >= min_size and b['height'] >= min_size)
+    return (count / len(buttons)) * 100
+
+
+def legacy_korean_ratio(style_groups):
+    korean_ranges = [(0xAC00, 0xD7A3), (0x1100, 0x11FF), (0x3130, 0x318F), (0xA960, 0xA97F), (0xD7B0, 0xD7FF)]
+    total_chars = 0; korean_chars = 0
+    for group in style_groups.values():
+        for el, idx, text, is_button, has_icon, width, height, font_size_px in group:
+            if not text:
+                continue
+            for ch in text:
+                if ch.strip() and ch.isalnum():
+                    total_chars += 1
+                    code = ord(ch)
+                    for start, end in korean_ranges:
+                        if start <= code <= end:
+                            korean_chars += 1; break
+    return (korean_chars / total_chars) * 100 if total_chars else 0.0
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    value = fn(*args)
+    return value, round(time.perf_counter() - started, 5)
+
+
+def bench(size, seed):
+    style_groups, buttons, records = synthetic(size, seed)
+    keys = list(style_groups)
+    counts = [len(style_groups[k]) for k in keys]
+    row = {"elements": size, "style_groups": len(keys), "buttons": len(buttons)}
+
+    # 명암비는 알파 처리 방식이 달라 값 비교 없이 시간만 잰다
+    cases = {
+        "font_size": (lambda: legacy_font_size_score(style_groups),
+                      lambda: scoring.font_size_score(scoring.font_px_array(records["groups"]["font_size"]), counts)),
+        "overall_contrast": (lambda: legacy_overall_contrast_score(style_groups),
+                             lambda: scoring.overall_contrast_score(
+                                 contrast_ratios(records["groups"]["color"], records["groups"]["background_color"]),
+                                 counts)),
+        "button_size": (lambda: legacy_button_size_score(buttons),
+                        lambda: scoring.button_size_score([b["width"] for b in buttons], [b["height"] for b in buttons])),
+        "korean_ratio": (lambda: legacy_korean_ratio(style_groups),
+                         lambda: scoring.korean_ratio(records["texts"])),
+    }
+    for name, (legacy, current) in cases.items():
+        legacy_value, legacy_seconds = timed(legacy)
+        current_value, current_seconds = timed(current)
+        row[name] = {"legacy_seconds": legacy_seconds, "scoring_seconds": current_seconds}
+        if name != "overall_contrast":
+            row[name]["match"] = abs(legacy_value - current_value) < 1e-9
+
+    scores, row["score_records_seconds"] = timed(scoring.score_records, records, len(buttons) // 2)
+    row["final_score"] = round(scores["final_score"], 4)
+    return row, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000", help="쉼표로 구분한 요소 수")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--profile", action="store_true", help="가장 큰 규모의 score_records 를 cProfile 로 출력")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    rows, records = [], None
+    for size in sorted(int(s) for s in args.sizes.split(",") if s.strip()):
+        row, records = bench(size, args.seed)
+        rows.append(row)
+        print(json.dumps(row, ensure_ascii=False))
+
+    if args.profile and records is not None:
+        profiler = cProfile.Profile()
+        profiler.runcall(scoring.score_records, records)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
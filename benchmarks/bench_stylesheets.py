@@ -0,0 +1,110 @@
+"""
+스타일시트 수집: 이전 순차 재다운로드 vs 브라우저/CDP 우선 + 병렬 폴백
+
+느린 CSS 를 돌려주는 로컬 서버 두 개(동일 출처/교차 출처)를 띄워 측정한다.
+
+    python benchmarks/bench_stylesheets.py --sheets 10 --delay 1.5
+    python benchmarks/bench_stylesheets.py --fallback-only --sheets 10 --delay 3 --budget 4
+"""
+import argparse
+import http.server
+import json
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "element_analysis"))
+sys.path.insert(0, HERE)
+
+from local_server import serve_directory
+
+
+def slow_handler(delay):
+    class SlowCSSHandler(http.server.SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def end_headers(self):
+            self.send_header("Access-Control-Allow-Origin", "*")
+            super().end_headers()
+
+        def do_GET(self):
+            if self.path.endswith(".css"):
+                time.sleep(delay)
+            super().do_GET()
+    return SlowCSSHandler
+
+
+def write_site(directory, sheets):
+    for i in range(sheets):
+        with open(os.path.join(directory, f"s{i}.css"), "w") as f:
+            f.write("".join(f".c{i}-{j} {{ color: #{j % 256:02x}3344; font-size: {12 + j % 8}px }}\n" for j in range(500)))
+
+
+def legacy_download(urls):
+    import requests
+    sess = requests.Session()
+    texts = {}
+    for url in urls:
+        try:
+            resp = sess.get(url, timeout=6)
+            resp.encoding = resp.apparent_encoding
+            texts[url] = resp.text
+        except Exception:
+            pass
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sheets", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=1.5, help="CSS 응답 지연(초)")
+    parser.add_argument("--budget", type=float, default=8.0, help="폴백 다운로드 전체 예산(초)")
+    parser.add_argument("--fallback-only", action="store_true", help="브라우저 없이 폴백 다운로드만 측정")
+    args = parser.parse_args()
+
+    from stylesheets import collect_stylesheets, fetch_stylesheets
+
+    with tempfile.TemporaryDirectory() as same, tempfile.TemporaryDirectory() as cross:
+        write_site(same, args.sheets)
+        write_site(cross, args.sheets)
+        handler = slow_handler(args.delay)
+        with serve_directory(same, handler) as base, serve_directory(cross, handler) as cross_base:
+            # 절반은 동일 출처, 절반은 교차 출처(cssRules 접근 불가 → 응답 본문이 없으면 HTTP 경로)
+            hrefs = [f"{base if i % 2 == 0 else cross_base}/s{i}.css" for i in range(args.sheets)]
+            with open(os.path.join(same, "index.html"), "w") as f:
+                f.write("<!doctype html><html><head>"
+                        + "".join(f'<link rel="stylesheet" href="{h}">' for h in hrefs)
+                        + "</head><body><p>stylesheets</p></body></html>")
+
+            results = {}
+            started = time.perf_counter()
+            legacy = legacy_download(hrefs)
+            results["legacy_sequential"] = {"seconds": round(time.perf_counter() - started, 3), "sheets": len(legacy)}
+
+            started = time.perf_counter()
+            fetched = fetch_stylesheets(hrefs, budget=args.budget)
+            results["parallel_fallback"] = {"seconds": round(time.perf_counter() - started, 3), "sheets": len(fetched)}
+
+            if not args.fallback_only:
+                from crawl import WebAnalyzer
+                crawler = WebAnalyzer()
+                try:
+                    crawler.driver.get(f"{base}/index.html")
+                    with tempfile.TemporaryDirectory() as out:
+                        started = time.perf_counter()
+                        sheets = collect_stylesheets(crawler.driver, out)
+                        sources = {}
+                        for _, _, source in sheets:
+                            sources[source or "missing"] = sources.get(source or "missing", 0) + 1
+                        results["browser_first"] = {"seconds": round(time.perf_counter() - started, 3), "sources": sources}
+                finally:
+                    crawler.close()
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
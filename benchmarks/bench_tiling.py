@@ -0,0 +1,86 @@
+"""
+단일 패스 vs 타일 추론의 지연 시간/최대 메모리 비교
+
+각 모드는 별도 프로세스에서 실행해 최대 RSS 가 서로 섞이지 않게 한다.
+
+    python benchmarks/bench_tiling.py --image tmp/file/screenshot.png
+    python benchmarks/bench_tiling.py --height 24000 --tile-height 1624 --overlap 256
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "element_analysis"))
+
+
+def run_mode(args):
+    import numpy as np
+    from PIL import Image
+    from element import ModelRegistry, UIAnalyzer
+
+    if args.image:
+        image = UIAnalyzer.to_pil(args.image)
+    else:
+        rng = np.random.default_rng(0)
+        image = Image.fromarray(rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8))
+
+    analyzer = UIAnalyzer()
+    ModelRegistry.get()
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    if args.mode == "tiled":
+        detection = analyzer.detect_tiled(image, tile_height=args.tile_height, overlap=args.overlap)
+    else:
+        detection = analyzer.detect_batch([image])[0]
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        "mode": args.mode,
+        "image_size": list(image.size),
+        "seconds": round(elapsed, 4),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "rss_before_inference_mb": round(baseline_rss / 1024, 1),
+        "boxes": int(len(detection["boxes"])),
+        "button_count": detection["button_count"]
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--image", help="실제 스크린샷 경로 (미지정 시 합성 이미지)")
+    parser.add_argument("--height", type=int, default=24000)
+    parser.add_argument("--width", type=int, default=750)
+    parser.add_argument("--tile-height", type=int, default=1624)
+    parser.add_argument("--overlap", type=int, default=256)
+    parser.add_argument("--mode", choices=["single", "tiled"], help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args)
+        return
+
+    results = []
+    for mode in ("single", "tiled"):
+        cmd = [sys.executable, os.path.abspath(__file__), "--mode", mode] + sys.argv[1:]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        line = proc.stdout.strip().splitlines()[-1] if proc.stdout.strip() else ""
+        if proc.returncode != 0 or not line.startswith("{"):
+            # 단일 패스는 메모리 부족으로 죽을 수 있다
+            results.append({"mode": mode, "error": f"exit={proc.returncode}", "stderr": proc.stderr[-500:]})
+        else:
+            results.append(json.loads(line))
+        print(json.dumps(results[-1], ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+결과 이미지 업로드: 백그라운드 업로더(현재) vs 작업마다 새 클라이언트 + 동기 PNG 업로드(이전)
+
+moto 의 로컬 S3 서버(ThreadedMotoServer)로 네트워크 없이 측정한다. 실제 스크린샷과 비슷하게
+단색 배경/텍스트 블록이 섞인 합성 이미지를 만들고, 업로드와 겹치는 점수 계산 시간을 --scoring-seconds 로 흉내 낸다.
+
+    pip install "moto[server]"
+    python benchmarks/bench_upload.py --tasks 10 --height 8000 --formats webp,png --quality 80
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "element_analysis"))
+
+import boto3
+from moto.server import ThreadedMotoServer
+from PIL import Image, ImageDraw
+
+from uploader import ArtifactUploader
+
+BUCKET = "bench-artifacts"
+
+
+def synthetic_screenshot(width, height):
+    image = Image.new("RGB", (width, height), (250, 250, 250))
+    draw = ImageDraw.Draw(image)
+    for y in range(0, height, 120):
+        draw.rectangle((16, y + 10, width - 16, y + 100), fill=(230, 236, 245), outline=(40, 90, 200), width=3)
+        for line in range(3):
+            draw.text((28, y + 20 + line * 24), f"항목 {y // 120} 설명 텍스트 line {line}", fill=(20, 20, 20))
+    return image
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10)
+    parser.add_argument("--width", type=int, default=750)
+    parser.add_argument("--height", type=int, default=8000)
+    parser.add_argument("--formats", default="webp", help="쉼표로 구분 (png, webp, jpeg)")
+    parser.add_argument("--quality", type=int, default=80)
+    parser.add_argument("--scoring-seconds", type=float, default=0.3, help="업로드와 겹치는 점수 계산 시간 흉내")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    endpoint = f"http://127.0.0.1:{server._server.server_port}"
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    boto3.client("s3", region_name="us-east-1", endpoint_url=endpoint).create_bucket(Bucket=BUCKET)
+
+    image = synthetic_screenshot(args.width, args.height)
+    result = {"tasks": args.tasks, "size": [args.width, args.height]}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            png_path = os.path.join(tmp, "detection_result.png")
+            image.save(png_path, format="PNG", compress_level=1)  # render_detections 와 같은 설정
+            result["png_bytes"] = os.path.getsize(png_path)
+
+            # 이전: 작업마다 새 클라이언트 + PNG 동기 업로드 후 점수 계산
+            started = time.perf_counter()
+            for i in range(args.tasks):
+                s3 = boto3.client("s3", region_name="us-east-1", endpoint_url=endpoint)
+                s3.upload_file(png_path, BUCKET, f"legacy/{i}.png")
+                time.sleep(args.scoring_seconds)
+            result["legacy_seconds_per_task"] = round((time.perf_counter() - started) / args.tasks, 4)
+
+            # 현재: 재사용 클라이언트 + 백그라운드 업로드, 점수 계산 뒤에 결과 대기
+            uploader = ArtifactUploader(bucket=BUCKET, region="us-east-1", endpoint_url=endpoint,
+                                        formats=args.formats.split(","), quality=args.quality)
+            uploaded = None
+            started = time.perf_counter()
+            for i in range(args.tasks):
+                future = uploader.submit(f"current/{i}", path=png_path, image=image)
+                time.sleep(args.scoring_seconds)
+                uploaded = ArtifactUploader.resolve(future)
+            result["current_seconds_per_task"] = round((time.perf_counter() - started) / args.tasks, 4)
+            uploader.shutdown()
+            result["artifact_bytes"] = uploaded["bytes"] if uploaded else None
+            result["url"] = uploaded["url"] if uploaded else None
+    finally:
+        server.stop()
+
+    print(json.dumps(result, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+가짜 워커: main.py --worker 와 같은 JSON 줄 프로토콜을 쓰지만 브라우저/모델 없이 작업 URL 의
+쿼리대로 잠들었다가 결과를 돌려준다. WorkerPool/스케줄러를 Chromium 없이 시험할 때 쓴다.
+
+    fake://page?sleep=0.5          0.5초 뒤 done
+    fake://page?sleep=0.1&fail=1   failed (error 포함)
+    fake://page?exit=3             결과 없이 종료 코드 3 으로 죽는다
+
+    WORKER_COMMAND="python benchmarks/fake_worker.py --sleep 0.2" python app.py
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from urllib.parse import parse_qs, urlsplit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sleep", type=float, default=0.1, help="URL 에 sleep 이 없을 때 작업 시간(초)")
+    parser.add_argument("--startup", type=float, default=0.0, help="ready 전 대기(초) — 워커 기동 비용 흉내")
+    parser.add_argument("--log-dir", default=None)
+    args = parser.parse_args()
+
+    def reply(message):
+        sys.stdout.write(json.dumps(message, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    time.sleep(args.startup)
+    reply({"type": "ready", "pid": os.getpid()})
+
+    jobs_done = 0
+    for line in sys.stdin:
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        kind = message.get("type")
+        if kind == "ping":
+            reply({"type": "pong", "jobs_done": jobs_done})
+            continue
+        if kind == "shutdown":
+            break
+        if kind != "job":
+            continue
+
+        task_id = message.get("task_id")
+        options = {k: v[-1] for k, v in parse_qs(urlsplit(message.get("url", "")).query).items()}
+        seconds = float(options.get("sleep", args.sleep))
+        started = time.monotonic()
+        if args.log_dir:
+            with open(os.path.join(args.log_dir, f"{task_id}.log"), "a", encoding="utf-8") as logf:
+                logf.write(f"[{task_id}] fake worker {os.getpid()}: sleep {seconds}s\n")
+        time.sleep(seconds)
+        if "exit" in options:
+            sys.exit(int(options["exit"]))
+
+        jobs_done += 1
+        failed = options.get("fail") == "1"
+        reply({
+            "type": "result",
+            "task_id": task_id,
+            "status": "failed" if failed else "done",
+            "error": "fake failure" if failed else None,
+            "elapsed": round(time.monotonic() - started, 3)
+        })
+
+    reply({"type": "exit", "jobs_done": jobs_done})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+run_e2e.py 가 쓰는 합성 페이지 코퍼스 생성기
+
+생성 결과(*.html, common.css)는 저장소에 함께 커밋한다. 시드가 고정이라 다시 돌려도 같은 파일이 나오며,
+페이지 구성을 바꾸면 이전 기준선(baseline)과는 비교하지 않는다.
+
+    python benchmarks/fixtures/generate.py
+"""
+import os
+import random
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SEED = 20251029
+
+KO_WORDS = ["접근성", "버튼", "메뉴", "검색", "로그인", "회원가입", "장바구니", "공지사항", "고객센터",
+            "상품", "주문", "배송", "안내", "이벤트", "문의", "설정", "도움말", "바로가기"]
+EN_WORDS = ["access", "button", "menu", "search", "login", "signup", "cart", "notice", "support",
+            "product", "order", "shipping", "guide", "event", "contact", "settings", "help", "shortcut"]
+PALETTE = ["#222222", "#555555", "#777777", "#999999", "#1a73e8", "#d93025", "#188038", "#ffffff",
+           "#f1f3f4", "#fbbc04", "rgb(120, 120, 120)", "rgba(0, 0, 0, 0.6)", "#333", "#0b57d0"]
+
+COMMON_CSS = """\
+* { box-sizing: border-box; }
+body { margin: 0; font-family: sans-serif; color: #222; background: #fff; line-height: 1.5; }
+header, footer { padding: 12px 16px; background: #f1f3f4; }
+nav a { margin-right: 12px; color: #1a73e8; }
+.btn { display: inline-block; padding: 8px 14px; border: 1px solid #0b57d0; border-radius: 6px;
+       background: #0b57d0; color: #fff; font-size: 14px; cursor: pointer; }
+.btn:hover { background: #1a73e8; }
+.btn.ghost { background: transparent; color: #0b57d0; }
+.btn.small { padding: 2px 6px; font-size: 11px; }
+.muted { color: #999; }
+.card { margin: 8px 16px; padding: 12px; border: 1px solid #ddd; border-radius: 8px; }
+.pagination a { padding: 4px 8px; }
+table { border-collapse: collapse; margin: 16px; }
+td, th { border: 1px solid #ddd; padding: 4px 8px; font-size: 13px; }
+"""
+
+
+def page(title, body, lang="ko", extra_css=""):
+    style = f"<style>{extra_css}</style>" if extra_css else ""
+    return (f"<!doctype html>\n<html lang=\"{lang}\"><head><meta charset=\"utf-8\">"
+            f"<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">"
+            f"<title>{title}</title><link rel=\"stylesheet\" href=\"common.css\">{style}</head>\n"
+            f"<body>\n{body}\n</body></html>\n")
+
+
+def words(rng, pool, count):
+    return " ".join(rng.choice(pool) for _ in range(count))
+
+
+def header(rng):
+    links = "".join(f'<a href="#n{i}">{rng.choice(KO_WORDS)}</a>' for i in range(6))
+    return f'<header><nav>{links}</nav><button class="btn">{rng.choice(KO_WORDS)}</button></header>'
+
+
+def pagination(pages=5):
+    links = "".join(f'<a href="?page={i}">{i}</a>' for i in range(1, pages + 1))
+    return f'<div class="pagination">{links}<a href="?page=2">다음</a></div>'
+
+
+def small(rng):
+    body = [header(rng), "<main>"]
+    for i in range(4):
+        body.append(f'<div class="card"><h2>{words(rng, KO_WORDS, 2)}</h2><p>{words(rng, KO_WORDS, 12)}</p>'
+                    f'<button class="btn">{rng.choice(KO_WORDS)}</button></div>')
+    body.append("</main><footer>고객센터 1588-0000</footer>")
+    return page("small", "\n".join(body))
+
+
+def large(rng):
+    body = [header(rng), "<main>"]
+    for i in range(120):
+        color = rng.choice(PALETTE)
+        size = rng.choice([11, 12, 13, 14, 16, 18])
+        body.append(f'<section class="card" id="s{i}"><h3 style="color:{color}">{words(rng, KO_WORDS, 3)}</h3>'
+                    f'<p style="font-size:{size}px">{words(rng, KO_WORDS, 20)}</p>'
+                    f'<ul>' + "".join(f'<li><a href="#s{i}-{j}">{words(rng, KO_WORDS, 2)}</a></li>' for j in range(5))
+                    + f'</ul><button class="btn ghost">{rng.choice(KO_WORDS)}</button></section>')
+    rows = "".join("<tr>" + "".join(f"<td>{rng.choice(KO_WORDS)} {rng.randint(1, 999)}</td>" for _ in range(6)) + "</tr>"
+                   for _ in range(80))
+    body.append(f"<table><tr>{''.join(f'<th>{w}</th>' for w in KO_WORDS[:6])}</tr>{rows}</table>")
+    body.append(pagination(10))
+    body.append("</main><footer>고객센터 1588-0000</footer>")
+    return page("large", "\n".join(body))
+
+
+def nested(rng):
+    depth = 60
+    opening, closing = [], []
+    for level in range(depth):
+        opening.append(f'<div class="n{level % 5}" style="padding-left:1px">')
+        closing.append("</div>")
+        if level % 6 == 0:
+            opening.append(f'<span>{words(rng, KO_WORDS, 3)}</span>')
+        if level % 10 == 9:
+            opening.append(f'<button class="btn small">{rng.choice(KO_WORDS)}</button>')
+    innermost = "".join(f'<p>{words(rng, KO_WORDS, 8)}</p>' for _ in range(20))
+    # 같은 깊은 트리를 여러 번 반복해 하위 트리 중복 제거 경로를 많이 타게 한다
+    tree = "".join(opening) + innermost + "".join(reversed(closing))
+    return page("nested", "\n".join([header(rng), tree, tree, tree]))
+
+
+def buttons(rng):
+    body = [header(rng), "<main>"]
+    kinds = ["btn", "btn ghost", "btn small", "btn muted"]
+    for i in range(400):
+        label = rng.choice(KO_WORDS)
+        kind = i % 5
+        if kind == 0:
+            body.append(f'<button class="{rng.choice(kinds)}">{label}</button>')
+        elif kind == 1:
+            body.append(f'<a role="button" class="{rng.choice(kinds)}" href="#b{i}">{label}</a>')
+        elif kind == 2:
+            body.append(f'<input type="button" class="{rng.choice(kinds)}" value="{label}">')
+        elif kind == 3:
+            body.append(f'<div class="btn" onclick="void(0)" style="background:{rng.choice(PALETTE)}">{label}</div>')
+        else:
+            body.append(f'<input type="submit" value="{label}" style="color:{rng.choice(PALETTE)}">')
+        if i % 20 == 19:
+            body.append("<br>")
+    body.append(pagination(8))
+    body.append("</main>")
+    return page("buttons", "\n".join(body))
+
+
+def mixed(rng):
+    body = [header(rng), "<main>"]
+    for i in range(60):
+        ko_share = i / 59  # 문단마다 한국어 비중을 0→1 로 바꾼다
+        sentence = " ".join(rng.choice(KO_WORDS) if rng.random() < ko_share else rng.choice(EN_WORDS)
+                            for _ in range(16))
+        body.append(f'<p lang="{"ko" if ko_share >= 0.5 else "en"}">{sentence} {rng.randint(1, 2025)}년 '
+                    f'v{rng.randint(1, 9)}.{rng.randint(0, 9)} (약 {rng.randint(1, 99)}%)</p>')
+        if i % 10 == 0:
+            body.append(f'<button class="btn">{rng.choice(EN_WORDS)} {rng.choice(KO_WORDS)}</button>')
+    body.append("</main>")
+    return page("mixed", "\n".join(body))
+
+
+def tall(rng):
+    body = [header(rng), "<main>"]
+    for i in range(150):
+        body.append(f'<section class="card" style="min-height:200px"><h3>{i + 1}. {words(rng, KO_WORDS, 2)}</h3>'
+                    f'<p>{words(rng, KO_WORDS, 10)}</p><button class="btn">{rng.choice(KO_WORDS)}</button></section>')
+    body.append(pagination(5))
+    body.append("</main>")
+    return page("tall", "\n".join(body))
+
+
+FIXTURES = {
+    "small": small,
+    "large": large,
+    "nested": nested,
+    "buttons": buttons,
+    "mixed": mixed,
+    "tall": tall,
+}
+
+
+def main():
+    with open(os.path.join(HERE, "common.css"), "w", encoding="utf-8") as f:
+        f.write(COMMON_CSS)
+    for name, build in FIXTURES.items():
+        path = os.path.join(HERE, f"{name}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(build(random.Random(f"{SEED}-{name}")))
+        print(f"{path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
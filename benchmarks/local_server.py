@@ -0,0 +1,30 @@
+"""벤치마크용 로컬 HTTP 서버 (네트워크 없이 재현 가능한 측정)"""
+import contextlib
+import functools
+import http.server
+import threading
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve_handler(handler):
+    """handler 를 127.0.0.1 임의 포트로 띄우고 base URL 을 돌려준다"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextlib.contextmanager
+def serve_directory(directory, handler_class=_QuietHandler):
+    """directory 를 127.0.0.1 임의 포트로 서빙하고 base URL 을 돌려준다"""
+    with serve_handler(functools.partial(handler_class, directory=directory)) as base_url:
+        yield base_url
@@ -0,0 +1,325 @@
+"""
+오프라인 종단 간 벤치마크: benchmarks/fixtures 의 합성 페이지를 로컬 서버로 띄워 측정한다.
+
+  analyze  : BrowserPool 컨텍스트 + WebAnalyzer.analyze (크롤링만)
+  pipeline : run_analysis 전체 (추론/렌더링 포함, 업로드/콜백은 대역으로 대체)
+
+페이지별 p50/p95 지연, WebDriver 왕복 수, 단계별 p50(timings.stages), 전체 pages/min,
+최대 RSS(이 프로세스 + chromedriver/Chromium 자식 프로세스 합)를 JSON 으로 남긴다.
+--baseline 을 주면 이전 결과와 페이지별 p50/p95 를 비교해 --threshold 이상 느려진 항목이 있으면 종료 코드 1.
+--profiles 를 주면 페이지마다 여러 뷰포트 프로필을 분석한다: --profile-mode session 은 한 세션에서
+CDP 로 전환(추론 1회), separate 는 프로필마다 분석을 처음부터 따로 돌린다 (비교용).
+
+    python benchmarks/run_e2e.py --repeats 5 --output bench_e2e.json
+    python benchmarks/run_e2e.py --mode pipeline --detector stub --baseline bench_e2e.json
+    python benchmarks/run_e2e.py --mode pipeline --detector stub --profiles mobile,tablet,desktop --profile-mode separate
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(HERE, "fixtures")
+sys.path.insert(0, os.path.join(HERE, "..", "element_analysis"))
+sys.path.insert(0, HERE)
+
+from local_server import serve_directory
+from spans import Tracer, activate
+
+FIXTURES = ["small", "large", "nested", "buttons", "mixed", "tall"]
+
+
+# ----------------------------- 메모리 -----------------------------
+def process_tree_rss(root_pid):
+    """root_pid 와 모든 자손 프로세스의 RSS 합(바이트). /proc 이 없으면 None"""
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        ppid = int(stat[stat.rfind(b")") + 2:].split()[1])  # comm 에 공백이 있을 수 있다
+        children.setdefault(ppid, []).append(int(entry))
+    total, stack, page = 0, [root_pid], os.sysconf("SC_PAGE_SIZE")
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                total += int(f.read().split()[1]) * page
+        except OSError:
+            pass
+        stack.extend(children.get(pid, []))
+    return total
+
+
+class RssSampler:
+    """백그라운드에서 프로세스 트리 RSS 를 주기적으로 읽어 최댓값을 기록"""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def sample(self):
+        rss = process_tree_rss(os.getpid())
+        if rss is not None:
+            self.peak = max(self.peak, rss)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+# ----------------------------- 대역 -----------------------------
+class StubUploader:
+    """ArtifactUploader 대역: 업로드 대신 --upload-seconds 만큼 쉬고 같은 형태의 결과를 돌려준다"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stub-upload")
+
+    def submit(self, key_prefix, path=None, image=None):
+        return self._executor.submit(self._upload, key_prefix, path)
+
+    def _upload(self, key_prefix, path):
+        started = time.perf_counter()
+        time.sleep(self.seconds)
+        size = os.path.getsize(path) if path and os.path.exists(path) else 0
+        return {"url": f"stub://{key_prefix}.png", "artifacts": {"png": f"stub://{key_prefix}.png"},
+                "bytes": {"png": size}, "seconds": round(time.perf_counter() - started, 3), "started": started}
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+class StubDelivery:
+    """CallbackDelivery 대역: 보내지 않고 본문 크기만 기록"""
+
+    def __init__(self):
+        self.payload_bytes = []
+
+    def submit(self, task_id, url, payload):
+        self.payload_bytes.append(len(json.dumps(payload, ensure_ascii=False).encode("utf-8")))
+
+
+class StubDetector:
+    """모델 없이 돌릴 때의 UIAnalyzer 대역 (탐지 0건, 스크린샷을 그대로 결과 이미지로 사용)"""
+
+    def __init__(self):
+        self.BUTTON_COUNT = 0
+        self.region_detections = None
+        self.region_stats = None
+        self.annotated_image = None
+        self._path = None
+
+    def detect_ui_elements(self, image_path, region_cache=None):
+        self._path = image_path
+
+    def detect_many(self, images):
+        self._path = images[0]
+        return [{"button_count": 0} for _ in images]
+
+    def render_annotation(self):
+        return self._path
+
+
+# ----------------------------- 측정 -----------------------------
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))], 4)
+
+
+def run_analyze(pool, url, profiles=None):
+    from crawl import WebAnalyzer
+
+    tracer = Tracer()
+    with pool.acquire() as driver, activate(tracer):
+        crawler = WebAnalyzer(driver=driver)
+        tracer.round_trips = lambda: crawler.driver.round_trips
+        crawler.analyze(url, profiles=profiles)
+        round_trips = crawler.round_trips
+    return round_trips, tracer.stages()
+
+
+def run_pipeline(pool, url, detector, uploader, delivery, profiles=None):
+    from main import run_analysis
+
+    results = run_analysis(url, backend_url="http://stand-in/result", task_id="bench", analyzer=detector,
+                           browser_pool=pool, delivery=delivery, uploader=uploader, profiles=profiles)
+    timings = results["timings"]
+    round_trips = sum(s.get("round_trips", 0) for s in timings["spans"] if s["name"] == "crawl")
+    return round_trips, timings["stages"]
+
+
+def summarize(samples):
+    walls = [s["seconds"] for s in samples]
+    stages = {}
+    for sample in samples:
+        for name, seconds in sample["stages"].items():
+            stages.setdefault(name, []).append(seconds)
+    return {
+        "runs": len(samples),
+        "p50": percentile(walls, 0.5),
+        "p95": percentile(walls, 0.95),
+        "mean": round(sum(walls) / len(walls), 4),
+        "round_trips": max(s["round_trips"] for s in samples),
+        "stages_p50": {name: percentile(values, 0.5) for name, values in sorted(stages.items())}
+    }
+
+
+def compare(current, baseline, threshold):
+    """페이지별 p50/p95 변화율. threshold 이상 느려지면 regression"""
+    rows, regressions = {}, []
+    for name, now in current["fixtures"].items():
+        before = baseline.get("fixtures", {}).get(name)
+        if not before:
+            continue
+        row = {}
+        for metric in ("p50", "p95", "round_trips"):
+            if before.get(metric):
+                change = (now[metric] - before[metric]) / before[metric]
+                row[metric] = round(change, 3)
+                if change > threshold:
+                    regressions.append(f"{name}.{metric} +{change:.0%}")
+        rows[name] = row
+    return {"baseline_mode": baseline.get("mode"), "threshold": threshold, "changes": rows,
+            "regressions": regressions}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["analyze", "pipeline"], default="analyze")
+    parser.add_argument("--fixtures", default=",".join(FIXTURES), help="쉼표로 구분한 페이지 이름")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1, help="측정에서 뺄 첫 실행 수 (페이지별)")
+    parser.add_argument("--detector", choices=["model", "stub"], default="model",
+                        help="pipeline 모드 추론: 실제 모델(MODEL_PATH) 또는 대역")
+    parser.add_argument("--upload-seconds", type=float, default=0.2, help="업로드 대역이 걸리는 시간")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="회귀로 볼 증가율")
+    parser.add_argument("--profiles", help="쉼표로 구분한 뷰포트 프로필 (예: mobile,tablet,desktop)")
+    parser.add_argument("--profile-mode", choices=["session", "separate"], default="session",
+                        help="session: 한 세션에서 전환, separate: 프로필마다 따로 실행")
+    parser.add_argument("--verbose", action="store_true", help="분석 로그 출력")
+    args = parser.parse_args()
+
+    from browser_pool import BrowserPool
+
+    names = [name.strip() for name in args.fixtures.split(",") if name.strip()]
+    # 페이지 1회 측정 = profile_runs 의 분석을 모두 돈 시간
+    profile_runs = [None]
+    if args.profiles:
+        from device_profiles import parse_profiles
+        profiles = parse_profiles(args.profiles)
+        profile_runs = [profiles] if args.profile_mode == "session" else [[name] for name in profiles]
+    detector = uploader = delivery = None
+    if args.mode == "pipeline":
+        if args.detector == "stub":
+            detector = StubDetector()
+        else:
+            from element import UIAnalyzer
+            detector = UIAnalyzer()
+        uploader, delivery = StubUploader(args.upload_seconds), StubDelivery()
+
+    samples = {name: [] for name in names}
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    workdir = tempfile.TemporaryDirectory()  # 스크린샷/result.json 이 작업 디렉토리에 쌓이지 않게
+    cwd = os.getcwd()
+    os.chdir(workdir.name)
+    pool = BrowserPool(size=1)
+    try:
+        with serve_directory(FIXTURES_DIR) as base, RssSampler() as rss, quiet:
+            pool.warm_up()
+            started = time.perf_counter()
+            measured_seconds = 0.0
+            # 페이지를 번갈아 돌려 캐시/GC 영향이 한 페이지에 몰리지 않게 한다
+            for run in range(args.warmup + args.repeats):
+                for name in names:
+                    url = f"{base}/{name}.html"
+                    run_started = time.perf_counter()
+                    round_trips, stages = 0, {}
+                    for profiles in profile_runs:
+                        if args.mode == "analyze":
+                            trips, run_stages = run_analyze(pool, url, profiles)
+                        else:
+                            trips, run_stages = run_pipeline(pool, url, detector, uploader, delivery, profiles)
+                        round_trips += trips
+                        for stage, value in run_stages.items():
+                            stages[stage] = stages.get(stage, 0.0) + value
+                    seconds = time.perf_counter() - run_started
+                    if run >= args.warmup:
+                        measured_seconds += seconds
+                        samples[name].append({"seconds": seconds, "round_trips": round_trips, "stages": stages})
+            total_seconds = time.perf_counter() - started
+    finally:
+        pool.close()
+        if uploader:
+            uploader.shutdown()
+        os.chdir(cwd)
+        workdir.cleanup()
+
+    measured_pages = sum(len(s) for s in samples.values())
+    result = {
+        "mode": args.mode,
+        "detector": args.detector if args.mode == "pipeline" else None,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {"python": platform.python_version(), "machine": platform.machine(),
+                        "cpus": os.cpu_count()},
+        "repeats": args.repeats,
+        "profiles": args.profiles,
+        "profile_mode": args.profile_mode if args.profiles else None,
+        "fixtures": {name: summarize(s) for name, s in samples.items()},
+        "overall": {
+            "pages": measured_pages,
+            "pages_per_minute": round(measured_pages / measured_seconds * 60, 2),
+            "wall_seconds": round(total_seconds, 2),
+            "peak_rss_mb": round(rss.peak / 2 ** 20, 1) if rss.peak else None,
+            # ru_maxrss 는 Linux 에서 KB 단위
+            "peak_python_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        }
+    }
+    if delivery and delivery.payload_bytes:
+        result["overall"]["callback_payload_bytes_p50"] = percentile(delivery.payload_bytes, 0.5)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            result["comparison"] = compare(result, json.load(f), args.threshold)
+        exit_code = 1 if result["comparison"]["regressions"] else 0
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import atexit
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+from crawl import apply_cdp_blocking_and_css, create_driver
+
+
+class BrowserLease:
+    """풀에서 빌린 드라이버 + 분석 1회용 격리 브라우저 컨텍스트"""
+
+    def __init__(self, pool, handle, context_id, target_id):
+        self.pool = pool
+        self.handle = handle
+        self.driver = handle.driver
+        self.context_id = context_id
+        self.target_id = target_id
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.pool._release(self)
+
+    def __enter__(self):
+        return self.driver
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class _DriverHandle:
+    def __init__(self, work_dir):
+        self.user_data_dir = tempfile.mkdtemp(prefix="chrome_profile_", dir=work_dir)
+        self.driver = create_driver(self.user_data_dir)
+        self.home_handle = self.driver.current_window_handle  # 항상 남겨 두는 기본 탭
+        self.uses = 0
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"WebDriver 종료 중 오류: {e}")
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+class BrowserPool:
+    """
+    Chromium 드라이버를 띄워 둔 채 재사용하는 풀.
+
+    acquire() 마다 CDP Target.createBrowserContext 로 쿠키/스토리지/캐시가 분리된
+    새 컨텍스트와 탭을 만들어 주고, release() 시 컨텍스트째 폐기한다.
+    브라우저 실행(수 초) 대신 컨텍스트 생성(수십 ms)만 분석마다 발생한다.
+    """
+
+    def __init__(self, size=1, max_uses=100, work_dir=None):
+        self.size = size
+        self.max_uses = max_uses
+        self.work_dir = work_dir or os.path.join(os.getcwd(), "tmp", "file")
+        os.makedirs(self.work_dir, exist_ok=True)
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self.last_context_seconds = 0.0
+        atexit.register(self.close)
+
+    def warm_up(self):
+        """첫 분석 전에 드라이버를 미리 띄워 둔다"""
+        handles = [self._checkout() for _ in range(self.size)]
+        for handle in handles:
+            self._idle.put(handle)
+
+    def acquire(self, timeout=None):
+        handle = self._checkout(timeout)
+        try:
+            return self._open_context(handle)
+        except Exception as e:
+            # 컨텍스트를 만들 수 없으면 드라이버가 망가진 것으로 보고 교체
+            print(f"브라우저 컨텍스트 생성 실패, 드라이버 재시작: {e}")
+            self._discard(handle)
+        handle = self._checkout(timeout)
+        try:
+            return self._open_context(handle)
+        except Exception:
+            self._discard(handle)
+            raise
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                handle = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(handle)
+        atexit.unregister(self.close)
+
+    # ---------------- 내부 ----------------
+    def _checkout(self, timeout=None):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return _DriverHandle(self.work_dir)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get(timeout=timeout)
+
+    def _open_context(self, handle):
+        started = time.perf_counter()
+        driver = handle.driver
+        context_id = driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+        target_id = driver.execute_cdp_cmd(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+        )["targetId"]
+        driver.switch_to.window(target_id)
+        # 차단 규칙/주입 스크립트는 타깃 단위이므로 새 탭마다 다시 적용
+        apply_cdp_blocking_and_css(driver)
+        handle.uses += 1
+        self.last_context_seconds = time.perf_counter() - started
+        print(f"브라우저 컨텍스트 생성: {self.last_context_seconds * 1000:.1f}ms (uses={handle.uses})")
+        return BrowserLease(self, handle, context_id, target_id)
+
+    def _release(self, lease):
+        handle = lease.handle
+        try:
+            driver = handle.driver
+            driver.execute_cdp_cmd("Target.closeTarget", {"targetId": lease.target_id})
+            driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": lease.context_id})
+            driver.switch_to.window(handle.home_handle)
+        except Exception as e:
+            print(f"브라우저 컨텍스트 정리 실패, 드라이버 폐기: {e}")
+            self._discard(handle)
+            return
+        if self._closed or (self.max_uses and handle.uses >= self.max_uses):
+            self._discard(handle)
+        else:
+            self._idle.put(handle)
+
+    def _discard(self, handle):
+        handle.quit()
+        with self._lock:
+            self._created -= 1
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+WCAG 명암비 계산 (벡터화)
+
+- CSS 색 문자열은 고유값마다 한 번만 파싱해 캐시한다 (rgb/rgba, 공백 문법, #hex, hsl/hsla, color(srgb ...), 일부 이름).
+- 반투명 배경은 흰 캔버스 위에, 반투명 글자색은 그 배경 위에 합성한 뒤 비율을 계산한다.
+- 불투명 색에서는 기존 get_luminance/contrast_ratio 와 같은 값을 낸다.
+- 파싱할 수 없는 색은 NaN 을 돌려준다.
+"""
+import colorsys
+import re
+from functools import lru_cache
+
+import numpy as np
+
+CANVAS = (255.0, 255.0, 255.0)  # 배경이 끝까지 투명하면 흰 캔버스 위에 그려진 것으로 본다
+
+NAMED_COLORS = {
+    "transparent": (0.0, 0.0, 0.0, 0.0),
+    "black": (0.0, 0.0, 0.0, 1.0),
+    "white": (255.0, 255.0, 255.0, 1.0),
+    "red": (255.0, 0.0, 0.0, 1.0),
+    "green": (0.0, 128.0, 0.0, 1.0),
+    "blue": (0.0, 0.0, 255.0, 1.0),
+    "gray": (128.0, 128.0, 128.0, 1.0),
+    "grey": (128.0, 128.0, 128.0, 1.0),
+    "yellow": (255.0, 255.0, 0.0, 1.0),
+    "orange": (255.0, 165.0, 0.0, 1.0),
+}
+
+_FUNC_RE = re.compile(r"^\s*(rgba?|hsla?|color)\(\s*(.*?)\s*\)\s*$", re.IGNORECASE)
+_NAN4 = (np.nan, np.nan, np.nan, np.nan)
+
+
+def _channel(token, scale=255.0):
+    token = token.strip()
+    if token.endswith("%"):
+        return float(token[:-1]) / 100.0 * scale
+    return float(token)
+
+
+def _alpha(token):
+    token = token.strip()
+    return float(token[:-1]) / 100.0 if token.endswith("%") else float(token)
+
+
+def _split_args(args):
+    """'r, g, b, a' / 'r g b / a' 두 문법 모두 [r, g, b], alpha 로 분리"""
+    if "," in args:
+        parts = [p.strip() for p in args.split(",")]
+        return parts[:3], (parts[3] if len(parts) > 3 else None)
+    main, _, alpha = args.partition("/")
+    return main.split(), (alpha.strip() or None)
+
+
+@lru_cache(maxsize=8192)
+def parse_color(css):
+    """CSS 색 → (r, g, b, a) [r,g,b: 0~255, a: 0~1]. 알 수 없으면 None"""
+    if not css:
+        return None
+    value = css.strip().lower()
+    if value in NAMED_COLORS:
+        return NAMED_COLORS[value]
+
+    if value.startswith("#"):
+        digits = value[1:]
+        if len(digits) in (3, 4):
+            digits = "".join(ch * 2 for ch in digits)
+        if len(digits) not in (6, 8):
+            return None
+        try:
+            channels = [int(digits[i:i + 2], 16) for i in range(0, len(digits), 2)]
+        except ValueError:
+            return None
+        alpha = channels[3] / 255.0 if len(channels) == 4 else 1.0
+        return (float(channels[0]), float(channels[1]), float(channels[2]), alpha)
+
+    match = _FUNC_RE.match(value)
+    if not match:
+        return None
+    func, args = match.group(1), match.group(2)
+    try:
+        if func == "color":
+            space, _, rest = args.partition(" ")
+            if space != "srgb":
+                return None
+            channels, alpha = _split_args(rest)
+            r, g, b = (_channel(c, 1.0) * 255.0 for c in channels)
+        else:
+            channels, alpha = _split_args(args)
+            if len(channels) != 3:
+                return None
+            if func.startswith("hsl"):
+                hue = float(channels[0].replace("deg", "")) / 360.0
+                sat = _channel(channels[1], 1.0)
+                light = _channel(channels[2], 1.0)
+                r, g, b = (c * 255.0 for c in colorsys.hls_to_rgb(hue % 1.0, light, sat))
+            else:
+                r, g, b = (_channel(c) for c in channels)
+        a = _alpha(alpha) if alpha is not None else 1.0
+    except ValueError:
+        return None
+    return (r, g, b, min(max(a, 0.0), 1.0))
+
+
+def to_rgba_array(colors):
+    """색 문자열 목록 → (N, 4) 배열. 고유 문자열만 파싱, 실패는 NaN"""
+    table = {}
+    rows = []
+    for css in colors:
+        row = table.get(css)
+        if row is None:
+            row = table[css] = parse_color(css) or _NAN4
+        rows.append(row)
+    return np.asarray(rows, dtype=np.float64).reshape(-1, 4)
+
+
+def composite(top, bottom):
+    """(N,4) RGBA 를 (N,3) RGB 위에 source-over 합성"""
+    alpha = top[:, 3:4]
+    return top[:, :3] * alpha + bottom * (1.0 - alpha)
+
+
+def relative_luminance(rgb):
+    c = rgb / 255.0
+    linear = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrast_ratios(foregrounds, backgrounds):
+    """글자색/배경색 문자열 배열 → WCAG 명암비 배열 (파싱 실패 쌍은 NaN)"""
+    fg = to_rgba_array(foregrounds)
+    bg = to_rgba_array(backgrounds)
+    bg_rgb = composite(bg, np.broadcast_to(np.array(CANVAS), (len(bg), 3)))
+    fg_rgb = composite(fg, bg_rgb)
+    l1 = relative_luminance(fg_rgb)
+    l2 = relative_luminance(bg_rgb)
+    return (np.maximum(l1, l2) + 0.05) / (np.minimum(l1, l2) + 0.05)
+
+
+def contrast_ratio(foreground, background):
+    """단일 쌍 명암비 (float, 파싱 실패 시 NaN)"""
+    return float(contrast_ratios([foreground], [background])[0])
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -8,12 +7,15 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from collections import defaultdict
-import re
+from stylesheets import collect_stylesheets
+from device_profiles import DEVICE_PROFILES, DRIVER_PROFILE, PROFILE_RELOAD, PROFILE_SETTLE_SECONDS
+from contrast import contrast_ratios
+import scoring
+from spans import span
+import numpy as np
+import base64
 import time
 import os
-import cairosvg
-import pytesseract
-from PIL import Image
 import io
 import atexit
 import signal
@@ -21,7 +23,8 @@ import sys
 import shutil
 
 # --- 외부 도구 경로 (환경에 맞게 조정 가능) ---
-pytesseract.pytesseract.tesseract_cmd = '/usr/bin/tesseract'
+# cairosvg/pytesseract/requests 는 필요한 단계에서만 import 한다 (콜드 스타트 단축)
+TESSERACT_PATH = '/usr/bin/tesseract'
 CHROME_CANDIDATES = [
     os.environ.get("CHROME_BIN"),
     "/usr/bin/google-chrome",
@@ -30,40 +33,358 @@ CHROME_CANDIDATES = [
     "/usr/bin/chromium"
 ]
 CHROMEDRIVER_PATH = "/usr/bin/chromedriver"
+MAX_SCREENSHOT_HEIGHT = 12000  # 전체 페이지 캡처 최대 높이(CSS px)
+
+# 텍스트/스타일 분석 대상 선택자
+VIEWPORT_ELEMENT_SELECTOR = (
+    "a,button,input,textarea,select,label,"
+    "[role='button'],[onclick],[href],[class*='btn'],[class*='button'],"
+    "[id*='btn'],[id*='button'],h1,h2,h3,h4,h5,h6,p,li,span,div"
+)
+
+# 요약용 버튼 메타 수집 선택자
+BUTTON_SELECTORS = [
+    "button","[role='button']","input[type='button']","input[type='submit']","input[type='reset']",
+    "a[href]","a[onclick]","[class*='btn']","[class*='button']","[id*='btn']","[id*='button']",
+    "span[onclick]","div[onclick]","[style*='cursor: pointer']","[style*='cursor:pointer']"
+]
+
+# 투명 배경이면 불투명한 조상 배경을 찾아 쓴다 (끝까지 투명하면 흰 캔버스). 두 수집기가 함께 쓴다.
+EFFECTIVE_BACKGROUND_JS = r"""
+const opaque = bg => bg && !(bg.includes('rgba(0, 0, 0, 0)') || bg.includes('transparent'));
+function effectiveBackground(el, own) {
+    if (!((own.includes('rgba') && own.endsWith(', 0)')) || own.includes('transparent'))) return own;
+    for (let n = el; n; n = n.parentElement) {
+        const bg = window.getComputedStyle(n).backgroundColor;
+        if (opaque(bg)) return bg;
+    }
+    return 'rgb(255, 255, 255)';
+}
+"""
+
+# 뷰포트 요소 수집기: 가시성/뷰포트 판정, 실제 배경색(투명이면 조상 탐색), 텍스트 자식 여부를
+# 페이지 안에서 한 번에 계산한다 (요소당 WebDriver 왕복 없음).
+# 문서 전체를 한 번 전위 순회해 요소마다 nodeId(전위 순번)와 subtreeEnd(마지막 자손의 순번)를 붙이므로,
+# "채택된 조상의 하위인가" 는 파이썬에서 구간 비교 한 번으로 판정할 수 있다.
+COLLECT_VIEWPORT_ELEMENTS_JS = EFFECTIVE_BACKGROUND_JS + r"""
+const walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_ELEMENT);
+const nodes = [], pre = new Map();
+for (let n = walker.currentNode; n; n = walker.nextNode()) { pre.set(n, nodes.length); nodes.push(n); }
+const end = nodes.map((_, i) => i);
+for (let i = nodes.length - 1; i > 0; i--) {
+    const parent = nodes[i].parentElement;
+    const j = parent ? pre.get(parent) : undefined;
+    if (j !== undefined && end[i] > end[j]) end[j] = end[i];
+}
+
+const all = Array.from(document.querySelectorAll(arguments[0]));
+const vh = window.innerHeight, vw = window.innerWidth;
+const elements = [], records = [];
+for (const el of all) {
+    try {
+        const c = window.getComputedStyle(el);
+        const r = el.getBoundingClientRect();
+        const opacity = parseFloat(c.opacity);
+        const vis = c.display !== 'none' && c.visibility !== 'hidden' && opacity > 0;
+        const inV = r.bottom > 0 && r.right > 0 && r.top < vh && r.left < vw;
+        if (!(vis && inV)) continue;
+        const index = elements.length;
+        const text = el.innerText?.trim() || '';
+        const role = el.getAttribute('role');
+        const onclick = el.getAttribute('onclick') !== null;
+        const tagName = el.tagName.toLowerCase();
+        const isVisible = vis && r.width > 0 && r.height > 0;
+        const hasTextChild = Array.from(el.children).some(ch => (ch.innerText || '').trim());
+        const isButton = tagName === 'button' || role === 'button' || onclick;
+        // WebElement 참조는 채택될 수 있는 요소만 돌려보내 응답 크기를 줄인다
+        const candidate = isVisible && (isButton || (text && !hasTextChild));
+        const nodeId = pre.get(el);
+        elements.push(candidate ? el : null);
+        records.push({
+            index, tagName, text, role, onclick,
+            nodeId, subtreeEnd: end[nodeId],
+            fontSize: c.fontSize,
+            color: c.color,
+            backgroundColor: effectiveBackground(el, c.backgroundColor),
+            display: c.display,
+            visibility: c.visibility,
+            opacity,
+            width: r.width,
+            height: r.height,
+            hasSvg: el.querySelectorAll('svg').length > 0,
+            hasImg: el.querySelectorAll('img').length > 0,
+            isVisible, hasTextChild
+        });
+    } catch (e) { /* 분리된 노드 등은 건너뜀 */ }
+}
+return {elements, records};
+"""
+
+# 페이지네이션 버튼 후보 선택자 / 라벨
+PAGINATION_SELECTORS = [
+    "button", "[role='button']", "a[href]", "[onclick]",
+    "[class*='btn']", "[class*='button']", "[id*='btn']", "[id*='button']",
+    "span[onclick]", "div[onclick]", "[style*='cursor:pointer']", "[style*='cursor: pointer']"
+]
+PAGINATION_LABELS = ['◀','▶','<','>','이전','다음','prev','next']
+
+# 버튼 탐색기: 페이지네이션 버튼과 뷰포트 내 버튼 메타데이터를 한 번의 호출로 수집한다.
+#   pagination: 보이는 후보 중 텍스트가 숫자이거나 이전/다음 라벨인 요소 + 클릭 가능성
+#   buttons   : 보이고 뷰포트 안에 있는 버튼 후보의 위치/텍스트/색상/커서 등 요약용 메타
+#               (background_color 는 뷰포트 수집기와 같은 조상 배경 보정을 거친 값)
+COLLECT_BUTTONS_JS = EFFECTIVE_BACKGROUND_JS + r"""
+const [paginationSelector, buttonSelector, labels] = arguments;
+const vh = window.innerHeight, vw = window.innerWidth;
+const digits = /^[\p{Nd}\p{No}]+$/u;  // 파이썬 str.isdigit 의 상위 집합, 최종 판정은 파이썬에서
+const visibleBox = (el, c) => {
+    const r = el.getBoundingClientRect();
+    const ok = c.display !== 'none' && c.visibility !== 'hidden' && parseFloat(c.opacity) > 0 &&
+               r.width > 0 && r.height > 0;
+    return ok ? r : null;
+};
+
+const pagination = [];
+for (const el of document.querySelectorAll(paginationSelector)) {
+    const c = window.getComputedStyle(el);
+    if (!visibleBox(el, c)) continue;
+    let text = (el.innerText || '').trim();
+    if (!text) {
+        const value = typeof el.value === 'string' ? el.value : el.getAttribute('value');
+        text = (el.getAttribute('aria-label') || el.getAttribute('title') || value || '').trim();
+    }
+    if (!(digits.test(text) || labels.includes(text))) continue;
+    const tag = el.tagName.toLowerCase();
+    const role = (el.getAttribute('role') || '').toLowerCase();
+    const hasClick = !!el.getAttribute('onclick') ||
+        (['a', 'button', 'input'].includes(tag) && (el.getAttribute('href') !== null || tag === 'button')) ||
+        role === 'button' ||
+        (c.cursor || '').toLowerCase().includes('pointer');
+    pagination.push({element: el, text, has_click_event: hasClick});
+}
+
+const buttons = [];
+for (const el of document.querySelectorAll(buttonSelector)) {
+    const c = window.getComputedStyle(el);
+    const r = visibleBox(el, c);
+    if (!r || !(r.bottom > 0 && r.right > 0 && r.top < vh && r.left < vw)) continue;
+    buttons.push({
+        x: r.x, y: r.y, width: r.width, height: r.height,
+        text: el.innerText?.trim() || el.getAttribute('aria-label') ||
+              el.getAttribute('title') || el.getAttribute('value') ||
+              el.getAttribute('placeholder') || el.getAttribute('href') || '(없음)',
+        background_color: effectiveBackground(el, c.backgroundColor), text_color: c.color, cursor: c.cursor,
+        border: c.border, boxShadow: c.boxShadow,
+        element_type: el.tagName.toLowerCase(),
+        role: el.getAttribute('role'), href: el.getAttribute('href'),
+        onclick: el.getAttribute('onclick'), class: el.className
+    });
+}
+return {pagination, buttons};
+"""
+
+
+def install_round_trip_counter(driver):
+    """driver.execute 를 감싸 WebDriver 명령(= 브라우저 왕복) 수를 센다. 드라이버당 1회만 설치"""
+    if not hasattr(driver, "round_trips"):
+        original_execute = driver.execute
+        driver.round_trips = 0
+
+        def counted_execute(driver_command, params=None):
+            driver.round_trips += 1
+            return original_execute(driver_command, params)
+
+        driver.execute = counted_execute
+    return driver
+
+
+def create_driver(user_data_dir):
+    """모바일 에뮬레이션이 적용된 headless Chromium 드라이버 생성"""
+    options = Options()
+    options.page_load_strategy = 'eager'  # DOMContentLoaded 기준
+
+    # 안정/성능 옵션
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-features=VizDisplayCompositor")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-plugins")
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-backgrounding-occluded-windows")
+    options.add_argument("--disable-renderer-backgrounding")
+    options.add_argument("--log-level=3")
+    options.add_argument("--no-zygote")
+    options.add_argument("--disable-background-networking")
+
+    # 캡처 선명도
+    options.add_argument("--high-dpi-support=2")
+    options.add_argument("--force-device-scale-factor=2")
+
+    # 프로필
+    os.makedirs(user_data_dir, exist_ok=True)
+    options.add_argument(f"--user-data-dir={user_data_dir}")
+
+    # 콘텐츠 설정(이미지는 CDP로 차단하므로 여기선 최소화)
+    prefs = {"profile.default_content_setting_values": {
+        "notifications": 2, "media_stream": 2, "geolocation": 2, "popups": 2
+    }}
+    options.add_experimental_option("prefs", prefs)
+
+    # 스타일시트 본문을 CDP 로 읽기 위해 네트워크 이벤트만 performance 로그로 받는다
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    # 모바일 에뮬로 정의 (다른 프로필은 분석 중 CDP 로 전환)
+    mobile = DEVICE_PROFILES[DRIVER_PROFILE]
+    mobile_emulation = {
+        "deviceMetrics": {"width": mobile["width"], "height": mobile["height"],
+                          "pixelRatio": mobile["deviceScaleFactor"]},
+        "userAgent": mobile["userAgent"]
+    }
+    options.add_experimental_option("mobileEmulation", mobile_emulation)
+
+    # 바이너리/드라이버
+    chrome_path = next((p for p in CHROME_CANDIDATES if p and os.path.exists(p)), None)
+    if not chrome_path:
+        raise FileNotFoundError("Chrome/Chromium 실행 파일을 찾을 수 없습니다")
+    options.binary_location = chrome_path
+    print(f"Chrome 경로: {chrome_path}")
+
+    if not os.path.exists(CHROMEDRIVER_PATH):
+        raise FileNotFoundError(f"ChromeDriver를 찾을 수 없습니다: {CHROMEDRIVER_PATH}")
+
+    service = Service(CHROMEDRIVER_PATH)
+    driver = webdriver.Chrome(service=service, options=options)
+
+    # 타임아웃
+    driver.set_page_load_timeout(20) 
+    driver.set_script_timeout(10)    
+    driver.implicitly_wait(5)
+
+    print("WebDriver 초기화 완료")
+    return driver
+
+
+def apply_cdp_blocking_and_css(driver):
+    """CDP 리소스 차단 + 전역 CSS 주입(애니/트랜지션 제거, 세로 스크롤 금지, 폰트 폴백)"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        blocked = [
+            "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif",
+            "*.mp4", "*.webm",
+            "*.woff", "*.woff2", "*.ttf", "*.otf",
+            "*google-analytics*", "*googletagmanager*", "*doubleclick*",
+            "*adservice*", "*adsense*", "*ads/*", "*/ads/*",
+            "*connect.facebook.net*", "*bat.bing.com*"
+        ]
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+        print(f"CDP 차단 패턴 적용: {len(blocked)}개")
+
+        # 문서 생성 시점에 스타일 주입
+        inject_js = r"""
+          (function() {
+            try {
+              const style = document.createElement('style');
+              style.setAttribute('data-wa-hardening', 'true');
+              style.textContent = `
+                * { animation: none !important; transition: none !important; }
+                html, body { overflow-y: hidden !important; overscroll-behavior: none !important; }
+                html, body { scroll-behavior: auto !important; }
+                body, *:not(i):not(svg) {
+                  font-family: -apple-system, system-ui, BlinkMacSystemFont, "Segoe UI",
+                               Roboto, "Helvetica Neue", Arial, "Apple SD Gothic Neo",
+                               "Noto Sans KR", "Malgun Gothic", sans-serif !important;
+                }
+              `;
+              document.documentElement.appendChild(style);
+            } catch (e) {}
+          })();
+        """
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": inject_js})
+        print("전역 CSS/JS 주입 준비 완료 (애니메이션 차단 + 스크롤 금지 + 폰트 폴백)")
+    except Exception as e:
+        print(f"CDP 차단/주입 세팅 실패: {e}")
 
 
 class WebAnalyzer:
-    def __init__(self, enable_svg_ocr: bool = False):
+    def __init__(self, enable_svg_ocr: bool = False, driver=None):
         # 상태/임시자원
+        # driver 를 넘기면(BrowserPool 세션) 드라이버 수명은 호출자가 관리한다
         self.driver = None
+        self.owns_driver = driver is None
         self.temp_dirs = []
         self.temp_files = []
-        self.setup_signal_handlers()
-        self.setup_cleanup()
+        if self.owns_driver:
+            self.setup_signal_handlers()
+            self.setup_cleanup()
         self.setup_directories()
 
         # 분석 상태
+        self.reset_state()
+
+        # 기준
+        self.min_contrast = scoring.MIN_CONTRAST  # WCAG AA
+        self.min_text_size_px = scoring.MIN_TEXT_SIZE_PX
+        self.min_button_size = scoring.MIN_BUTTON_SIZE
+
+        # 옵션
+        self.enable_svg_ocr = enable_svg_ocr
+
+        # 스타일 키 → 명암비 (키만으로 결정되므로 분석이 바뀌어도 유지, 증분 분석 시 스냅샷에서 채움)
+        self.known_contrasts = {}
+
+        # WebDriver
+        if self.owns_driver:
+            self.driver = install_round_trip_counter(self.setup_driver())
+            self.apply_cdp_blocking_and_css()  # 리소스 차단 + 전역 CSS 주입
+        else:
+            self.driver = install_round_trip_counter(driver)
+        self._round_trip_base = self.driver.round_trips
+
+    # 뷰포트(프로필)마다 다시 수집하는 상태 — 페이지 HTML/스타일시트/명암비 캐시는 공유
+    VIEW_STATE = ("style_groups", "accepted_subtrees", "analysis_results", "button_elements", "page_buttons",
+                  "TOTAL_BUTTON_COUNT", "korean_ratio", "_korean_totals", "vscroll", "hscroll",
+                  "CONTRAST_RATIO_SCORE", "FONT_SIZE_SCORE", "KOREAN_TEXT_RATIO_SCORE")
+
+    def reset_state(self):
+        """분석 1회 단위 상태 초기화 (같은 인스턴스로 여러 URL 분석 가능)"""
+        self.stylesheets = []        # [(href, text|None, source)]
+        self.page_html = ""
+        self.profiles = []           # analyze(profiles=) 로 받은 프로필 이름 (첫 번째가 인스턴스 상태 기준)
+        self.profile_views = {}      # 프로필 이름 → 뷰 결과 (screenshot_path, records, ...)
+        self.reset_view_state()
+        if getattr(self, "driver", None) is not None:
+            self._round_trip_base = self.driver.round_trips
+
+    def reset_view_state(self):
         self.style_groups = defaultdict(list)
-        self.processed_elements = set()
+        self.accepted_subtrees = []  # 채택된 요소의 (nodeId, subtreeEnd, text) — 전위 순서
         self.analysis_results = {}
         self.button_elements = []
         self.page_buttons = []
         self.TOTAL_BUTTON_COUNT = 0
         self.korean_ratio = 0.0
+        self._korean_totals = None  # (한글 문자 수, 전체 문자 수), 분석당 한 번 계산
         self.vscroll = False
         self.hscroll = False
+        self.CONTRAST_RATIO_SCORE = 0
+        self.FONT_SIZE_SCORE = 0
+        self.KOREAN_TEXT_RATIO_SCORE = 0
 
-        # 기준
-        self.min_contrast = 4.5       # WCAG AA
-        self.min_text_size_px = 16
-        self.min_button_size = 44
+    def view_state(self):
+        return {name: getattr(self, name) for name in self.VIEW_STATE}
 
-        # 옵션
-        self.enable_svg_ocr = enable_svg_ocr
+    def restore_view_state(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
 
-        # WebDriver
-        self.driver = self.setup_driver()
-        self.apply_cdp_blocking_and_css()  # 리소스 차단 + 전역 CSS 주입
+    @property
+    def round_trips(self):
+        """현재 분석에서 발생한 WebDriver 왕복 수"""
+        if self.driver is None:
+            return 0
+        return self.driver.round_trips - self._round_trip_base
 
     # ----------------------------- 공용 유틸 -----------------------------
     def setup_signal_handlers(self):
@@ -79,6 +400,9 @@ class WebAnalyzer:
 
     def cleanup_all(self):
         """드라이버/임시파일 정리 (명시적 close 혹은 프로세스 종료 시 호출)"""
+        if not self.owns_driver:
+            self.driver = None  # 빌린 드라이버는 풀에 반납만 한다
+            return
         try:
             if getattr(self, 'driver', None) and getattr(self.driver, 'session_id', None):
                 self.driver.quit()
@@ -94,6 +418,8 @@ class WebAnalyzer:
             if os.path.exists(temp_dir):
                 shutil.rmtree(temp_dir, ignore_errors=True)
         self.cleanup_all()
+        # 상주 워커에서 인스턴스가 계속 쌓이지 않도록 atexit 등록 해제
+        atexit.unregister(self.cleanup_all)
 
     def setup_directories(self):
         try:
@@ -108,123 +434,39 @@ class WebAnalyzer:
     # ----------------------------- 브라우저 세팅 -----------------------------
     def setup_driver(self):
         try:
-            options = Options()
-            options.page_load_strategy = 'eager'  # DOMContentLoaded 기준
-
-            # 안정/성능 옵션
-            options.add_argument("--headless=new")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--disable-features=VizDisplayCompositor")
-            options.add_argument("--disable-extensions")
-            options.add_argument("--disable-plugins")
-            options.add_argument("--disable-background-timer-throttling")
-            options.add_argument("--disable-backgrounding-occluded-windows")
-            options.add_argument("--disable-renderer-backgrounding")
-            options.add_argument("--log-level=3")
-            options.add_argument("--no-zygote")
-            options.add_argument("--disable-background-networking")
-
-            # 캡처 선명도
-            options.add_argument("--high-dpi-support=2")
-            options.add_argument("--force-device-scale-factor=2")
-
-            # 프로필
             self.user_data_dir = os.path.join(self.work_dir, "chrome_temp_profile")
-            os.makedirs(self.user_data_dir, exist_ok=True)
-            options.add_argument(f"--user-data-dir={self.user_data_dir}")
-
-            # 콘텐츠 설정(이미지는 CDP로 차단하므로 여기선 최소화)
-            prefs = {"profile.default_content_setting_values": {
-                "notifications": 2, "media_stream": 2, "geolocation": 2, "popups": 2
-            }}
-            options.add_experimental_option("prefs", prefs)
-
-            # 모바일 에뮬로 정의
-            mobile_emulation = {
-                "deviceMetrics": {"width": 375, "height": 812, "pixelRatio": 3.0},
-                "userAgent": ("Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) "
-                              "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1")
-            }
-            options.add_experimental_option("mobileEmulation", mobile_emulation)
-
-            # 바이너리/드라이버
-            chrome_path = next((p for p in CHROME_CANDIDATES if p and os.path.exists(p)), None)
-            if not chrome_path:
-                raise FileNotFoundError("Chrome/Chromium 실행 파일을 찾을 수 없습니다")
-            options.binary_location = chrome_path
-            print(f"Chrome 경로: {chrome_path}")
-
-            if not os.path.exists(CHROMEDRIVER_PATH):
-                raise FileNotFoundError(f"ChromeDriver를 찾을 수 없습니다: {CHROMEDRIVER_PATH}")
-
-            service = Service(CHROMEDRIVER_PATH)
-            driver = webdriver.Chrome(service=service, options=options)
-
-            # 타임아웃
-            driver.set_page_load_timeout(20) 
-            driver.set_script_timeout(10)    
-            driver.implicitly_wait(5)
-
-            print("WebDriver 초기화 완료")
-            return driver
-
+            return create_driver(self.user_data_dir)
         except Exception as e:
             print(f"WebDriver 초기화 실패: {e}")
             self.cleanup_all()
             raise
 
     def apply_cdp_blocking_and_css(self):
-        """CDP 리소스 차단 + 전역 CSS 주입(애니/트랜지션 제거, 세로 스크롤 금지, 폰트 폴백)"""
-        try:
-            self.driver.execute_cdp_cmd("Network.enable", {})
-            blocked = [
-                "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif",
-                "*.mp4", "*.webm",
-                "*.woff", "*.woff2", "*.ttf", "*.otf",
-                "*google-analytics*", "*googletagmanager*", "*doubleclick*",
-                "*adservice*", "*adsense*", "*ads/*", "*/ads/*",
-                "*connect.facebook.net*", "*bat.bing.com*"
-            ]
-            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
-            print(f"CDP 차단 패턴 적용: {len(blocked)}개")
-
-            # 문서 생성 시점에 스타일 주입
-            inject_js = r"""
-              (function() {
-                try {
-                  const style = document.createElement('style');
-                  style.setAttribute('data-wa-hardening', 'true');
-                  style.textContent = `
-                    * { animation: none !important; transition: none !important; }
-                    html, body { overflow-y: hidden !important; overscroll-behavior: none !important; }
-                    html, body { scroll-behavior: auto !important; }
-                    body, *:not(i):not(svg) {
-                      font-family: -apple-system, system-ui, BlinkMacSystemFont, "Segoe UI",
-                                   Roboto, "Helvetica Neue", Arial, "Apple SD Gothic Neo",
-                                   "Noto Sans KR", "Malgun Gothic", sans-serif !important;
-                    }
-                  `;
-                  document.documentElement.appendChild(style);
-                } catch (e) {}
-              })();
-            """
-            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": inject_js})
-            print("전역 CSS/JS 주입 준비 완료 (애니메이션 차단 + 스크롤 금지 + 폰트 폴백)")
-        except Exception as e:
-            print(f"CDP 차단/주입 세팅 실패: {e}")
+        apply_cdp_blocking_and_css(self.driver)
+
+    def apply_profile(self, name, height=None):
+        """같은 탭에서 뷰포트/UA 전환 (브라우저 재시작/재로드 없음, 레이아웃만 다시 계산된다)"""
+        profile = DEVICE_PROFILES[name]
+        self.driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+            "width": profile["width"],
+            "height": height or profile["height"],
+            "deviceScaleFactor": profile["deviceScaleFactor"],
+            "mobile": profile["mobile"]
+        })
+        if height is None:
+            self.driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {"userAgent": profile["userAgent"]})
+            self.driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": profile["mobile"]})
 
     def take_full_screenshot(self):
         try:
             WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
             screenshot_path = os.path.join(self.output_dir, "screenshot.png")
+            mobile = DEVICE_PROFILES[DRIVER_PROFILE]
             total_height = self.driver.execute_script(
-                "return Math.max(document.body.scrollHeight, document.documentElement.scrollHeight) || 812"
-            )
-            max_height = 12000
-            target_height = min(total_height, max_height)
-            self.driver.set_window_size(375, target_height)
+                "return Math.max(document.body.scrollHeight, document.documentElement.scrollHeight)"
+            ) or mobile["height"]
+            target_height = min(total_height, MAX_SCREENSHOT_HEIGHT)
+            self.driver.set_window_size(mobile["width"], target_height)
             if self.driver.save_screenshot(screenshot_path):
                 print(f"스크린샷 저장 완료: {screenshot_path}")
                 return screenshot_path
@@ -237,35 +479,64 @@ class WebAnalyzer:
             print(f"스크린샷 저장 실패: {e}")
             return None
 
+    def take_profile_screenshot(self, name, screenshot_path):
+        """
+        프로필 너비로 전체 페이지 캡처. 뷰포트 높이를 페이지 높이로 늘려 CDP 로 캡처하고 그대로 둔다:
+        take_full_screenshot 처럼 이후 DOM/버튼 수집도 늘어난 뷰포트(페이지 전체) 기준이다.
+        프로필 뷰포트는 다음 프로필로 전환할 때(switch_profile)나 analyze 가 끝날 때 되돌린다.
+        이미지는 take_full_screenshot 과 같이 deviceScaleFactor 배율 (너비 = width × deviceScaleFactor)
+        """
+        try:
+            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            profile = DEVICE_PROFILES[name]
+            total_height = self.driver.execute_script(
+                "return Math.max(document.body.scrollHeight, document.documentElement.scrollHeight)"
+            ) or profile["height"]
+            target_height = max(profile["height"], min(total_height, MAX_SCREENSHOT_HEIGHT))
+            self.apply_profile(name, height=target_height)
+            shot = self.driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "png",
+                "clip": {"x": 0, "y": 0, "width": profile["width"], "height": target_height, "scale": 1}
+            })
+            with open(screenshot_path, "wb") as f:
+                f.write(base64.b64decode(shot["data"]))
+            print(f"스크린샷 저장 완료 ({name} {profile['width']}x{target_height} @{profile['deviceScaleFactor']:g}x): "
+                  f"{screenshot_path}")
+            return screenshot_path
+        except TimeoutException:
+            print("페이지 로딩 타임아웃")
+            return None
+        except Exception as e:
+            print(f"스크린샷 저장 실패 ({name}): {e}")
+            return None
+
     def save_page_content(self):
         try:
-            html = self.driver.page_source
+            with span("page_source") as s:
+                html = self.driver.page_source
+                s.set(bytes=len(html))
+            self.page_html = html
             html_path = os.path.join(self.output_dir, "page.html")
             with open(html_path, "w", encoding="utf-8") as f:
                 f.write(html)
             self.temp_files.append(html_path)
             print("HTML 저장 완료")
 
-            # 외부 CSS 시도(6s 타임아웃). 차단으로 실패 가능 → 무시
-            css_links = []
-            try:
-                link_elements = self.driver.find_elements(By.CSS_SELECTOR, 'link[rel="stylesheet"]')
-                css_links = [link.get_attribute('href') for link in link_elements if link.get_attribute('href')]
-            except Exception as e:
-                print(f"CSS 링크 수집 실패: {e}")
-
-            sess = requests.Session()
-            for i, link in enumerate(css_links):
+            # 외부 CSS: 브라우저가 이미 받은 본문을 우선 사용, 없는 것만 병렬 다운로드
+            with span("stylesheets") as s:
                 try:
-                    resp = sess.get(link, timeout=6)
-                    resp.encoding = resp.apparent_encoding
-                    css_path = os.path.join(self.output_dir, f"style_{i+1}.css")
-                    with open(css_path, "w", encoding="utf-8") as f:
-                        f.write(resp.text)
-                    self.temp_files.append(css_path)
-                    print(f"CSS {i+1} 다운로드 완료")
+                    sheets = collect_stylesheets(self.driver, self.output_dir)
                 except Exception as e:
-                    print(f"CSS {i+1} 다운로드 실패: {e}")
+                    print(f"CSS 수집 실패: {e}")
+                    sheets = []
+                sources = defaultdict(int)
+                for _, _, source in sheets:
+                    sources[source or "missing"] += 1
+                s.set(sheets=len(sheets), **sources)
+            self.stylesheets = sheets
+            for i, (_, text, _) in enumerate(sheets):
+                if text is not None:
+                    self.temp_files.append(os.path.join(self.output_dir, f"style_{i+1}.css"))
         except Exception as e:
             print(f"페이지 콘텐츠 저장 실패: {e}")
 
@@ -279,69 +550,36 @@ class WebAnalyzer:
             print(f"스크립트 실행 중 오류: {e}")
             return None
 
-    def find_pagination_buttons(self):
-        self.page_buttons = []
-        selectors = [
-            "button", "[role='button']", "a[href]", "[onclick]",
-            "[class*='btn']", "[class*='button']", "[id*='btn']", "[id*='button']",
-            "span[onclick]", "div[onclick]", "[style*='cursor:pointer']", "[style*='cursor: pointer']"
-        ]
-        candidates = []
-        for sel in selectors:
-            try:
-                candidates.extend(self.driver.find_elements(By.CSS_SELECTOR, sel))
-            except Exception as e:
-                print(f"선택자 '{sel}' 처리 실패: {e}")
-        candidates = list(set(candidates))
-        print(f"페이지 버튼 후보: {len(candidates)}개")
-
-        for el in candidates:
-            try:
-                if not self.is_visible(el):
-                    continue
-                text = (el.text or "").strip()
-                if not text:
-                    text = (el.get_attribute("aria-label") or el.get_attribute("title") or el.get_attribute("value") or "").strip()
-                if text.isdigit() or text in ['◀','▶','<','>','이전','다음','prev','next']:
-                    # 클릭 가능성 판정 (휴리스틱)
-                    has_click = bool(el.get_attribute("onclick"))
-                    if not has_click:
-                        tag = el.tag_name.lower()
-                        role = (el.get_attribute("role") or "").lower()
-                        href = el.get_attribute("href")
-                        cursor = (self.safe_execute_script("return window.getComputedStyle(arguments[0]).cursor;", el) or "").lower()
-                        has_click = (
-                            (tag in ("a", "button", "input") and (href or tag == "button")) or
-                            (role == "button") or
-                            ("pointer" in cursor)
-                        )
-                    self.page_buttons.append({"element": el, "text": text, "has_click_event": has_click})
-            except StaleElementReferenceException:
-                continue
-            except Exception as e:
-                print(f"페이지 버튼 분석 중 오류: {e}")
-        self.TOTAL_BUTTON_COUNT = len(self.page_buttons)
-        print(f"페이지 버튼 탐지 완료: {self.TOTAL_BUTTON_COUNT}개")
-
-    def is_processed_child(self, el):
-        """이미 처리된 요소의 하위인지 확인하여 중복 분석 방지"""
+    def discover_buttons(self):
+        """페이지네이션 버튼 + 뷰포트 버튼 메타를 단일 in-page 패스로 수집"""
         try:
-            parent = el
-            while parent:
-                if parent in self.processed_elements:
-                    return True
-                parent = self.driver.execute_script("return arguments[0].parentElement;", parent)
-            return False
-        except Exception:
-            return False
+            result = self.driver.execute_script(
+                COLLECT_BUTTONS_JS, ",".join(PAGINATION_SELECTORS), ",".join(BUTTON_SELECTORS), PAGINATION_LABELS
+            ) or {}
+        except Exception as e:
+            print(f"버튼 탐색 실패: {e}")
+            result = {}
+
+        self.page_buttons = [
+            b for b in result.get("pagination", [])
+            if b["text"].isdigit() or b["text"] in PAGINATION_LABELS
+        ]
+        self.button_elements = result.get("buttons", [])
+        self.TOTAL_BUTTON_COUNT = len(self.button_elements)
+        print(f"페이지 버튼 탐지 완료: {len(self.page_buttons)}개")
+        print(f"뷰포트 내에서 {self.TOTAL_BUTTON_COUNT}개의 버튼 요소를 찾았습니다.")
 
     def has_scrollbar(self):
         try:
-            sh = self.driver.execute_script("return Math.max(document.body.scrollHeight, document.documentElement.scrollHeight)")
-            ch = self.driver.execute_script("return window.innerHeight")
-            sw = self.driver.execute_script("return Math.max(document.body.scrollWidth, document.documentElement.scrollWidth)")
-            cw = self.driver.execute_script("return window.innerWidth")
-            return (sh or 0) > (ch or 0), (sw or 0) > (cw or 0)
+            dims = self.driver.execute_script("""
+                return {
+                    sh: Math.max(document.body.scrollHeight, document.documentElement.scrollHeight),
+                    ch: window.innerHeight,
+                    sw: Math.max(document.body.scrollWidth, document.documentElement.scrollWidth),
+                    cw: window.innerWidth
+                };
+            """) or {}
+            return (dims.get('sh') or 0) > (dims.get('ch') or 0), (dims.get('sw') or 0) > (dims.get('cw') or 0)
         except Exception as e:
             print(f"스크롤 확인 실패: {e}")
             return False, False
@@ -355,24 +593,15 @@ class WebAnalyzer:
         L1, L2 = max(self.get_luminance(rgb1), self.get_luminance(rgb2)), min(self.get_luminance(rgb1), self.get_luminance(rgb2))
         return (L1 + 0.05) / (L2 + 0.05)
 
-    def get_valid_background_color(self, el):
-        while el:
-            style = self.driver.execute_script("""
-                const computed = window.getComputedStyle(arguments[0]);
-                return { backgroundColor: computed.backgroundColor };
-            """, el)
-            bg = style['backgroundColor']
-            if bg and not ("rgba(0, 0, 0, 0)" in bg or "transparent" in bg):
-                return bg
-            el = self.driver.execute_script("return arguments[0].parentElement;", el)
-        return "rgb(255, 255, 255)"
-
-    def has_text_child(self, el):
-        try:
-            children = el.find_elements(By.XPATH, "./*")
-            return any((c.text or "").strip() for c in children)
-        except Exception:
-            return False
+    def style_group_contrasts(self):
+        """스타일 그룹 키 목록과 그룹별 명암비 배열 (파싱 실패 그룹은 NaN)"""
+        keys = list(self.style_groups.keys())
+        missing = [k for k in keys if k not in self.known_contrasts]
+        if missing:
+            computed = contrast_ratios([k[1] for k in missing], [k[2] for k in missing])
+            self.known_contrasts.update(zip(missing, computed.tolist()))
+        ratios = np.array([self.known_contrasts[k] for k in keys], dtype=np.float64)
+        return keys, ratios
 
     def is_button_like(self, el):
         tag = el.tag_name.lower()
@@ -383,13 +612,12 @@ class WebAnalyzer:
         try:
             rect = self.safe_execute_script("""
                 const r = arguments[0].getBoundingClientRect();
-                return {top:r.top,left:r.left,bottom:r.bottom,right:r.right};
+                return {top:r.top,left:r.left,bottom:r.bottom,right:r.right,
+                        vh:window.innerHeight,vw:window.innerWidth};
             """, el)
             if not rect:
                 return False
-            vh = self.safe_execute_script("return window.innerHeight;") or 0
-            vw = self.safe_execute_script("return window.innerWidth;") or 0
-            return (rect['bottom'] > 0 and rect['right'] > 0 and rect['top'] < vh and rect['left'] < vw)
+            return (rect['bottom'] > 0 and rect['right'] > 0 and rect['top'] < rect['vh'] and rect['left'] < rect['vw'])
         except Exception:
             return False
 
@@ -408,57 +636,40 @@ class WebAnalyzer:
             return False
 
     # ----------------------------- 배치 수집/분석 -----------------------------
-    def get_elements_data_batch(self, elements):
+    def collect_viewport_elements(self):
+        """뷰포트 요소와 분석용 레코드를 단일 execute_script 로 수집"""
         try:
-            return self.driver.execute_script("""
-                const elements = arguments[0];
-                const results = [];
-                for (let i=0;i<elements.length;i++){
-                    try {
-                        const el = elements[i];
-                        const c = window.getComputedStyle(el);
-                        const r = el.getBoundingClientRect();
-                        results.push({
-                            index: i,
-                            tagName: el.tagName.toLowerCase(),
-                            text: el.innerText?.trim() || '',
-                            fontSize: c.fontSize,
-                            color: c.color,
-                            backgroundColor: c.backgroundColor,
-                            display: c.display,
-                            visibility: c.visibility,
-                            opacity: parseFloat(c.opacity),
-                            width: r.width,
-                            height: r.height,
-                            role: el.getAttribute('role'),
-                            onclick: el.getAttribute('onclick') !== null,
-                            hasSvg: el.querySelectorAll('svg').length > 0,
-                            hasImg: el.querySelectorAll('img').length > 0,
-                            isVisible: c.display !== 'none' && c.visibility !== 'hidden' && parseFloat(c.opacity) > 0 && r.width>0 && r.height>0
-                        });
-                    } catch(e){ results.push({index:i, error:e.message}); }
-                }
-                return results;
-            """, elements)
+            result = self.driver.execute_script(COLLECT_VIEWPORT_ELEMENTS_JS, VIEWPORT_ELEMENT_SELECTOR) or {}
+            elements, records = result.get("elements", []), result.get("records", [])
+            print(f"뷰포트 내 요소 수: {len(records)}개")
+            return elements, records
         except Exception as e:
-            print(f"배치 데이터 수집 실패: {e}")
-            return []
+            print(f"뷰포트 요소 수집 실패: {e}")
+            return [], []
 
-    def process_elements_batch(self, elements):
-        print(f"배치 처리 시작: {len(elements)}개 요소")
-        elements_data = self.get_elements_data_batch(elements)
+    def process_elements_batch(self, elements, elements_data):
+        """
+        레코드는 문서(전위) 순서이므로, 채택된 요소의 서브트리 구간 [nodeId, subtreeEnd] 안에 들어오는
+        요소는 모두 그 하위다. 채택 요소의 하위는 다시 채택되지 않으므로 열린 구간은 항상 하나뿐이고,
+        중복 판정은 요소당 정수 비교 한 번(O(1))이다.
+        """
+        print(f"배치 처리 시작: {len(elements_data)}개 요소")
         processed, skipped = 0, 0
+        covered_until = -1  # 마지막으로 채택된 요소의 subtreeEnd
         for i, data in enumerate(elements_data):
             try:
-                if 'error' in data or not data['isVisible']:
+                if not data['isVisible'] or data['nodeId'] <= covered_until:
                     skipped += 1; continue
                 element = elements[data['index']]
-                if self.is_processed_child(element):
+                if element is None:  # 수집기에서 후보가 아닌 것으로 판정된 요소
                     skipped += 1; continue
-                self.analyze_element_from_data(element, data)
+                member = self.analyze_element_from_data(element, data)
+                if member:
+                    covered_until = data['subtreeEnd']
+                    self.accepted_subtrees.append((data['nodeId'], data['subtreeEnd'], member[2]))
                 processed += 1
                 if processed % 100 == 0:
-                    print(f"진행률: {processed}/{len(elements)} 처리됨")
+                    print(f"진행률: {processed}/{len(elements_data)} 처리됨")
             except StaleElementReferenceException:
                 skipped += 1
             except Exception as e:
@@ -492,122 +703,125 @@ class WebAnalyzer:
             has_content = has_text or (is_button and has_icon)
             if not has_content and not is_button:
                 return
-            if (not is_button) and has_text and self.has_text_child(element):
+            if (not is_button) and has_text and data['hasTextChild']:
                 return
 
             font_size = data['fontSize']
             color = data['color']
-            bg_color = data['backgroundColor']
-            # 투명 배경 보정
-            if (("rgba" in bg_color and bg_color.endswith(", 0)")) or ("transparent" in bg_color)):
-                bg_color = self.get_valid_background_color(element)
+            bg_color = data['backgroundColor']  # 투명 배경은 수집기에서 조상 배경으로 보정됨
 
             width, height = data['width'], data['height']
-            font_size_px = float(font_size.replace("px", "").strip()) if isinstance(font_size, str) and font_size.endswith("px") else 16.0
+            font_size_px = scoring.font_px(font_size)
 
-            self.processed_elements.add(element)
             key = (font_size, color, bg_color)
-            self.style_groups[key].append((element, data['index'], text, is_button, has_icon, width, height, font_size_px))
+            member = (element, data['index'], text, is_button, has_icon, width, height, font_size_px)
+            self.style_groups[key].append(member)
+            return member
         except Exception as e:
             print(f"요소 분석 실패: {e}")
+        return None
 
     # ----------------------------- 상위 흐름 -----------------------------
-    def get_viewport_elements(self):
-        try:
-            selector = (
-                "a,button,input,textarea,select,label,"
-                "[role='button'],[onclick],[href],[class*='btn'],[class*='button'],"
-                "[id*='btn'],[id*='button'],h1,h2,h3,h4,h5,h6,p,li,span,div"
-            )
-            elements = self.driver.execute_script("""
-                const sel = arguments[0];
-                const all = Array.from(document.querySelectorAll(sel));
-                const vh = window.innerHeight, vw = window.innerWidth;
-                return all.filter(el => {
-                    const r = el.getBoundingClientRect();
-                    const s = window.getComputedStyle(el);
-                    const vis = s.display !== 'none' && s.visibility !== 'hidden' && parseFloat(s.opacity) > 0;
-                    const inV = r.bottom > 0 && r.right > 0 && r.top < vh && r.left < vw;
-                    return vis && inV;
-                });
-            """, selector)
-            print(f"뷰포트 내 요소 수: {len(elements)}개")
-            return elements
-        except Exception as e:
-            print(f"뷰포트 요소 수집 실패: {e}")
-            return []
-
-    def analyze(self, url):
+    def analyze(self, url, profiles=None):
+        """
+        profiles: DEVICE_PROFILES 이름 목록. 주면 페이지를 한 번만 로드하고 같은 탭에서 프로필마다
+        뷰포트/UA 만 바꿔 스크린샷·DOM 수집·요약 점수를 반복한다 (HTML/CSS 수집은 한 번).
+        프로필별 결과는 profile_views, 인스턴스 상태(style_groups 등)는 첫 프로필 기준이다.
+        없으면 드라이버 기본 에뮬레이션(모바일)으로 한 번.
+        """
+        self.reset_state()
+        self.profiles = list(profiles or [])
         try:
-            self.driver.get(url)
-            time.sleep(2)  # 초기 안정화
-            v_scroll, h_scroll = self.has_scrollbar()
-            self.vscroll, self.hscroll = v_scroll, h_scroll
-            print(f"👉 세로 스크롤: {'있음' if v_scroll else '없음'}")
-            print(f"👉 가로 스크롤: {'있음' if h_scroll else '없음'}")
-
-            self.analysis_results["scrollbar"] = {"vertical_scroll": v_scroll, "horizontal_scroll": h_scroll}
-
-            self.take_full_screenshot()
-            self.save_page_content()
-            self.find_pagination_buttons()
-
-            elements = self.get_viewport_elements()
-            self.process_elements_batch(elements)
-
-            # 버튼 메타 수집(요약용)
-            btn_selectors = [
-                "button","[role='button']","input[type='button']","input[type='submit']","input[type='reset']",
-                "a[href]","a[onclick]","[class*='btn']","[class*='button']","[id*='btn']","[id*='button']",
-                "span[onclick]","div[onclick]","[style*='cursor: pointer']","[style*='cursor:pointer']"
-            ]
-            combined = ",".join(btn_selectors)
-            all_candidates = self.driver.find_elements(By.CSS_SELECTOR, combined)
-            viewport_buttons = [el for el in all_candidates if self.is_visible(el) and self.is_in_viewport(el)]
-
-            buttons_data = self.driver.execute_script("""
-                return arguments[0].map(el => {
-                    const r = el.getBoundingClientRect();
-                    const c = window.getComputedStyle(el);
-                    return {
-                        x: r.x, y: r.y, width: r.width, height: r.height,
-                        text: el.innerText?.trim() || el.getAttribute('aria-label') ||
-                              el.getAttribute('title') || el.getAttribute('value') ||
-                              el.getAttribute('placeholder') || el.getAttribute('href') || '(없음)',
-                        background_color: c.backgroundColor, text_color: c.color, cursor: c.cursor,
-                        border: c.border, boxShadow: c.boxShadow,
-                        element_type: el.tagName.toLowerCase(),
-                        role: el.getAttribute('role'), href: el.getAttribute('href'),
-                        onclick: el.getAttribute('onclick'), class: el.className
-                    };
-                });
-            """, viewport_buttons)
-
-            self.button_elements = buttons_data
-            self.TOTAL_BUTTON_COUNT = len(buttons_data)
-            print(f"뷰포트 내에서 {self.TOTAL_BUTTON_COUNT}개의 버튼 요소를 찾았습니다.")
-
-            # 요약에 쓰는 점수(전체 텍스트 기준)
-            contrast_scores, font_size_scores = [], []
-            for (font_size, color, bg_color), group in self.style_groups.items():
-                try:
-                    rgb_fg = tuple(map(int, re.findall(r'\d+', color)[:3]))
-                    rgb_bg = tuple(map(int, re.findall(r'\d+', bg_color)[:3]))
-                    contrast = self.contrast_ratio(rgb_fg, rgb_bg)
-                    contrast_scores.append(min(contrast / self.min_contrast, 1.0) * 100)
-                    font_px = float(font_size.replace("px", "").strip()) if isinstance(font_size, str) and font_size.endswith("px") else 16.0
-                    font_size_scores.append(min(font_px / self.min_text_size_px, 1.0) * 100)
-                except Exception:
-                    continue
+            if self.profiles:
+                self.apply_profile(self.profiles[0])  # 첫 로드부터 첫 프로필의 UA/뷰포트로
+            with span("page_load", stage=True):
+                self.driver.get(url)
+                time.sleep(2)  # 초기 안정화
+
+            if not self.profiles:
+                self.analyze_view(self.take_full_screenshot)
+                return
 
-            self.CONTRAST_RATIO_SCORE = sum(contrast_scores) / len(contrast_scores) if contrast_scores else 0
-            self.FONT_SIZE_SCORE = sum(font_size_scores) / len(font_size_scores) if font_size_scores else 0
-            self.KOREAN_TEXT_RATIO_SCORE = self.calculate_korean_ratio()
-            self.finalize_analysis_results()
+            primary = None
+            for i, name in enumerate(self.profiles):
+                with span("profile", profile=name):
+                    if i:
+                        self.reset_view_state()
+                        self.switch_profile(name)
+                    screenshot_path = os.path.join(self.output_dir, "screenshot.png" if i == 0
+                                                   else f"screenshot_{name}.png")
+                    shot = self.analyze_view(lambda: self.take_profile_screenshot(name, screenshot_path),
+                                             collect_page=(i == 0))
+                    self.profile_views[name] = {
+                        "profile": dict(DEVICE_PROFILES[name]),
+                        "screenshot_path": shot,
+                        "vertical_scroll": self.vscroll,
+                        "horizontal_scroll": self.hscroll,
+                        "records": self.crawl_records()  # scoring.score_records 로 드라이버 없이 채점
+                    }
+                    if i == 0:
+                        primary = self.view_state()
+            self.restore_view_state(primary)
+            self.analysis_results["profiles"] = list(self.profiles)
 
         except Exception as e:
             print(f"웹페이지 분석 중 오류 발생: {e}")
             raise
+        finally:
+            if self.profiles and self.owns_driver and self.driver is not None:
+                # 직접 띄운 드라이버는 다음 분석을 위해 기본 에뮬레이션으로 되돌린다 (풀의 탭은 버려짐)
+                try:
+                    self.apply_profile(DRIVER_PROFILE)
+                except Exception as e:
+                    print(f"기본 프로필 복원 실패: {e}")
+
+    def switch_profile(self, name):
+        """다음 프로필로 전환. PROFILE_RELOAD 면 다시 로드하되 하위 리소스는 브라우저 캐시에서 받는다"""
+        with span("profile_switch", profile=name, reload=PROFILE_RELOAD):
+            self.apply_profile(name)
+            if PROFILE_RELOAD:
+                self.driver.refresh()
+            time.sleep(PROFILE_SETTLE_SECONDS)  # matchMedia/resize 핸들러가 DOM 을 바꿀 시간
+
+    def analyze_view(self, take_screenshot, collect_page=True):
+        """현재 뷰포트 기준 수집: 스크롤 → 스크린샷 → (HTML/CSS) → DOM/버튼 → 요약 점수. 스크린샷 경로 반환"""
+        with span("scrollbar"):
+            v_scroll, h_scroll = self.has_scrollbar()
+        self.vscroll, self.hscroll = v_scroll, h_scroll
+        print(f"👉 세로 스크롤: {'있음' if v_scroll else '없음'}")
+        print(f"👉 가로 스크롤: {'있음' if h_scroll else '없음'}")
+
+        self.analysis_results["scrollbar"] = {"vertical_scroll": v_scroll, "horizontal_scroll": h_scroll}
+
+        with span("screenshot", stage=True):
+            screenshot_path = take_screenshot()
+
+        if collect_page:
+            with span("page_content", stage=True):
+                self.save_page_content()
+
+        with span("dom_collection", stage=True):
+            with span("collect_viewport_elements") as s:
+                elements, records = self.collect_viewport_elements()
+                s.set(records=len(records), candidates=sum(1 for el in elements if el is not None))
+            with span("process_elements_batch") as s:
+                self.process_elements_batch(elements, records)
+                s.set(accepted=len(self.accepted_subtrees), style_groups=len(self.style_groups))
+
+            # 페이지네이션 버튼 + 요약용 버튼 메타 (한 번에)
+            with span("discover_buttons") as s:
+                self.discover_buttons()
+                s.set(page_buttons=len(self.page_buttons), buttons=len(self.button_elements))
+
+        # 요약에 쓰는 점수(전체 텍스트 기준)
+        with span("summary_scores"):
+            keys, ratios = self.style_group_contrasts()
+            font_pxs = scoring.font_px_array([k[0] for k in keys])
+            self.CONTRAST_RATIO_SCORE = scoring.summary_contrast_score(ratios, self.min_contrast)
+            self.FONT_SIZE_SCORE = scoring.summary_font_size_score(font_pxs, ratios, self.min_text_size_px)
+            self.KOREAN_TEXT_RATIO_SCORE = self.calculate_korean_ratio()
+            self.finalize_analysis_results()
+        return screenshot_path
 
     def finalize_analysis_results(self):
         try:
@@ -616,38 +830,36 @@ class WebAnalyzer:
             unique_styles = len(self.style_groups)
             print(f"총 분석된 요소: {total_elements}개")
             print(f"고유한 스타일 그룹: {unique_styles}개")
-            self.korean_ratio = self.calculate_korean_ratio()
+            self.korean_ratio = self.KOREAN_TEXT_RATIO_SCORE  # analyze() 에서 계산한 값 재사용
             self.analysis_results.update({
                 "total_elements": total_elements,
                 "unique_styles": unique_styles,
                 "korean_ratio": self.korean_ratio,
-                "page_buttons_count": len(self.page_buttons)
+                "page_buttons_count": len(self.page_buttons),
+                "webdriver_round_trips": self.round_trips
             })
+            print(f"WebDriver 왕복 횟수: {self.round_trips}회")
             print("분석 결과 정리 완료")
         except Exception as e:
             print(f"결과 정리 중 오류: {e}")
 
     # ----------------------------- 텍스트/점수 -----------------------------
     def is_korean_text(self, text):
-        korean_ranges = [(0xAC00, 0xD7A3), (0x1100, 0x11FF), (0x3130, 0x318F), (0xA960, 0xA97F), (0xD7B0, 0xD7FF)]
-        korean_count = 0; total_count = 0
-        for ch in text:
-            if ch.strip() and ch.isalnum():
-                total_count += 1
-                code = ord(ch)
-                for start, end in korean_ranges:
-                    if start <= code <= end:
-                        korean_count += 1; break
-        return korean_count, total_count
+        return scoring.korean_counts(text)
+
+    def element_texts(self):
+        """채택된 요소의 텍스트 (문서 순서, 중첩된 요소는 바깥 요소만)"""
+        return scoring.outermost_texts(self.accepted_subtrees)
+
+    def korean_text_totals(self):
+        """(한글 문자 수, 전체 문자 수) — 분석당 한 번만 센다"""
+        if self._korean_totals is None:
+            self._korean_totals = scoring.korean_totals(self.element_texts())
+        return self._korean_totals
 
     def calculate_korean_ratio(self):
-        total_chars = 0; korean_chars = 0
         print("\n=== 한글 비율 계산 시작 ===")
-        for (_, _, _), group in self.style_groups.items():
-            for el, idx, text, is_button, has_icon, width, height, font_size_px in group:
-                if text:
-                    kc, tc = self.is_korean_text(text)
-                    total_chars += tc; korean_chars += kc
+        korean_chars, total_chars = self.korean_text_totals()
         if not total_chars:
             print("분석할 텍스트가 없습니다.")
             return 0.0
@@ -659,6 +871,11 @@ class WebAnalyzer:
 
     def svg_to_text_ocr(self, svg_html):
         try:
+            # enable_svg_ocr 인 경우에만 호출되므로 여기서 import
+            import cairosvg
+            import pytesseract
+            from PIL import Image
+            pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
             png_bytes = cairosvg.svg2png(bytestring=svg_html.encode('utf-8'))
             image = Image.open(io.BytesIO(png_bytes))
             text = pytesseract.image_to_string(image, lang='kor+eng')
@@ -667,60 +884,46 @@ class WebAnalyzer:
             return ""
 
     # --- 점수 요약 ---
+    # 계산은 scoring 모듈 (드라이버 없이 같은 값을 낼 수 있게)
     def count_visual_feedback_changes(self, button):
-        changes = [
-            button.get('background_change', False),
-            button.get('text_change', False),
-            button.get('border_change', False),
-            button.get('shadow_change', False),
-            button.get('transform_change', False),
-            button.get('size_change', False),
-        ]
-        return sum(bool(c) for c in changes)
+        return scoring.visual_feedback_changes(button)
 
     def get_button_visual_feedback_score(self):
-        if not self.button_elements: return 0
-        count = sum(1 for b in self.button_elements if self.count_visual_feedback_changes(b) >= 2)
-        return (count / len(self.button_elements)) * 100
+        return scoring.button_visual_feedback_score(self.button_elements)
 
     def get_button_size_score(self):
-        if not self.button_elements: return 0
-        count = sum(1 for b in self.button_elements if b['width'] >= self.min_button_size and b['height'] >= self.min_button_size)
-        return (count / len(self.button_elements)) * 100
+        return scoring.button_size_score([b['width'] for b in self.button_elements],
+                                         [b['height'] for b in self.button_elements], self.min_button_size)
 
     def get_button_contrast_score(self):
-        if not self.button_elements: return 0
-        ok = 0
-        for b in self.button_elements:
-            try:
-                bg_rgb = tuple(map(int, re.findall(r'\d+', b['background_color'])[:3]))
-                text_rgb = tuple(map(int, re.findall(r'\d+', b['text_color'])[:3]))
-                if self.contrast_ratio(bg_rgb, text_rgb) >= self.min_contrast:
-                    ok += 1
-            except Exception:
-                continue
-        return (ok / len(self.button_elements)) * 100
+        return scoring.button_contrast_score([b['text_color'] for b in self.button_elements],
+                                             [b['background_color'] for b in self.button_elements], self.min_contrast)
 
     def get_font_size_score(self):
-        total = 0; count = 0
-        for (font_size, _, _), group in self.style_groups.items():
-            px = float(font_size.replace("px", "").strip()) if isinstance(font_size, str) and font_size.endswith("px") else 16.0
-            n = len(group); total += n
-            if px >= self.min_text_size_px: count += n
-        return (count / total) * 100 if total else 0
+        keys = list(self.style_groups.keys())
+        counts = [len(self.style_groups[k]) for k in keys]
+        return scoring.font_size_score(scoring.font_px_array([k[0] for k in keys]), counts, self.min_text_size_px)
 
     def get_overall_contrast_score(self):
-        total = 0; count = 0
-        for (font_size, color, bg_color), group in self.style_groups.items():
-            try:
-                rgb_fg = tuple(map(int, re.findall(r'\d+', color)[:3]))
-                rgb_bg = tuple(map(int, re.findall(r'\d+', bg_color)[:3]))
-                contrast = self.contrast_ratio(rgb_fg, rgb_bg)
-                n = len(group); total += n
-                if contrast >= self.min_contrast: count += n
-            except Exception:
-                continue
-        return (count / total) * 100 if total else 0
+        keys, ratios = self.style_group_contrasts()
+        counts = [len(self.style_groups[k]) for k in keys]
+        return scoring.overall_contrast_score(ratios, counts, self.min_contrast)
+
+    def crawl_records(self):
+        """드라이버 없이 다시 채점할 수 있는 열 단위 레코드 (scoring.score_records 입력)"""
+        keys, ratios = self.style_group_contrasts()
+        return {
+            "groups": {
+                "font_size": [k[0] for k in keys],
+                "color": [k[1] for k in keys],
+                "background_color": [k[2] for k in keys],
+                "count": [len(self.style_groups[k]) for k in keys],
+                "contrast": [None if np.isnan(r) else r for r in ratios.tolist()]
+            },
+            "texts": self.element_texts(),
+            "buttons": list(self.button_elements),
+            "crawled_button_count": self.TOTAL_BUTTON_COUNT
+        }
 
     def get_analysis_summary(self):
         if not self.analysis_results:
@@ -731,6 +934,7 @@ class WebAnalyzer:
 고유한 스타일 그룹: {self.analysis_results.get('unique_styles', 0)}개
 한글 텍스트 비율: {self.analysis_results.get('korean_ratio', 0):.1f}%
 페이지 버튼 수: {self.analysis_results.get('page_buttons_count', 0)}개
+WebDriver 왕복 횟수: {self.analysis_results.get('webdriver_round_trips', 0)}회
 
 스크롤 정보:
 - 세로 스크롤: {'있음' if self.analysis_results.get('scrollbar', {}).get('vertical_scroll', False) else '없음'}
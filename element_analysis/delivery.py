@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+콜백 결과 전달 (내구성 있는 outbox + 백그라운드 재시도)
+
+분석이 끝나면 결과를 outbox/pending 에 먼저 원자적으로 기록하고 바로 반환한다.
+전송은 백그라운드 스레드가 keep-alive 세션으로 처리한다.
+
+  - 2xx                       → 전달 완료 (pending 에서 삭제)
+  - 4xx (408/429 제외)        → 재시도해도 소용없으므로 즉시 dead
+  - 그 외 / 네트워크 오류     → 지수 백오프(+지터) 후 재시도, DELIVERY_MAX_ATTEMPTS 초과 시 dead
+  - 프로세스가 죽어도 pending 파일은 남고, 다음 시작 시 다시 보낸다
+
+수신 측 중복 처리를 위해 Idempotency-Key 헤더에 task_id 를 넣는다.
+"""
+import json
+from collections import deque
+import os
+import random
+import sys
+import threading
+import time
+
+OUTBOX_DIR = os.environ.get("OUTBOX_DIR", os.path.join(os.getcwd(), "outbox"))
+DELIVERY_MAX_ATTEMPTS = int(os.environ.get("DELIVERY_MAX_ATTEMPTS", 8))
+DELIVERY_BASE_DELAY = float(os.environ.get("DELIVERY_BASE_DELAY", 1.0))   # 첫 재시도 대기(초)
+DELIVERY_MAX_DELAY = float(os.environ.get("DELIVERY_MAX_DELAY", 60.0))
+DELIVERY_TIMEOUT = float(os.environ.get("DELIVERY_TIMEOUT", 10.0))        # 요청 1회 타임아웃(초)
+DELIVERY_FLUSH_TIMEOUT = float(os.environ.get("DELIVERY_FLUSH_TIMEOUT", 30.0))
+
+
+def is_permanent_failure(status):
+    return 400 <= status < 500 and status not in (408, 429)
+
+
+def _log(message):
+    # 워커는 작업마다 stdout/stderr 를 작업 로그로 돌리므로, 백그라운드 전송 로그는 프로세스 stderr 로 남긴다
+    print(message, file=sys.__stderr__, flush=True)
+
+
+class Outbox:
+    """pending/ 과 dead/ 두 디렉토리에 작업당 JSON 파일 1개"""
+
+    def __init__(self, directory=OUTBOX_DIR):
+        self.directory = directory
+        self.pending_dir = os.path.join(directory, "pending")
+        self.dead_dir = os.path.join(directory, "dead")
+        os.makedirs(self.pending_dir, exist_ok=True)
+        os.makedirs(self.dead_dir, exist_ok=True)
+
+    @staticmethod
+    def _write(path, entry):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _pending_path(self, task_id):
+        return os.path.join(self.pending_dir, f"{task_id}.json")
+
+    def put(self, entry):
+        self._write(self._pending_path(entry["task_id"]), entry)
+
+    def load_pending(self):
+        entries = []
+        for name in sorted(os.listdir(self.pending_dir)):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.pending_dir, name), "r", encoding="utf-8") as f:
+                    entries.append(json.load(f))
+            except (OSError, ValueError) as e:
+                _log(f"[ERROR] outbox 항목 읽기 실패: {name} ({e})")
+        return entries
+
+    def remove(self, task_id):
+        try:
+            os.remove(self._pending_path(task_id))
+        except OSError:
+            pass
+
+    def bury(self, entry):
+        """dead/ 로 옮긴다 (수동 확인/재전송용)"""
+        self._write(os.path.join(self.dead_dir, f"{entry['task_id']}.json"), entry)
+        self.remove(entry["task_id"])
+
+
+class CallbackDelivery:
+    """outbox 에 쌓인 결과를 백그라운드에서 전달한다"""
+
+    def __init__(self, outbox=None, max_attempts=DELIVERY_MAX_ATTEMPTS, base_delay=DELIVERY_BASE_DELAY,
+                 max_delay=DELIVERY_MAX_DELAY, timeout=DELIVERY_TIMEOUT):
+        self.outbox = outbox or Outbox()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._entries = {}                 # task_id → entry (pending 의 메모리 사본)
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread = None
+        self._session = None
+        self._stats = {"delivered": 0, "dead": 0, "attempts": 0, "retries": 0,
+                       "latency_total": 0.0, "latency_max": 0.0, "last_latency": None}
+        self._latencies = deque(maxlen=1000)  # 최근 전달 지연(초), 백분위 계산용
+
+    # ---------------- 외부 API ----------------
+    def start(self):
+        """이전 프로세스가 남긴 pending 을 다시 불러오고 전송 스레드를 띄운다"""
+        recovered = self.outbox.load_pending()
+        with self._cond:
+            for entry in recovered:
+                entry["next_attempt_at"] = time.time()
+                self._entries[entry["task_id"]] = entry
+        if recovered:
+            _log(f"[INFO] outbox 에서 미전달 결과 {len(recovered)}건 재전송 예정")
+        self._thread = threading.Thread(target=self._loop, name="callback-delivery", daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, task_id, url, payload):
+        """결과를 outbox 에 기록하고 즉시 반환한다"""
+        now = time.time()
+        entry = {
+            "task_id": task_id,
+            "url": url,
+            "payload": payload,
+            "attempts": 0,
+            "enqueued_at": now,
+            "next_attempt_at": now,
+            "last_error": None
+        }
+        self.outbox.put(entry)
+        with self._cond:
+            self._entries[task_id] = entry
+            self._cond.notify_all()
+
+    def flush(self, timeout=DELIVERY_FLUSH_TIMEOUT):
+        """pending 이 비거나 timeout 까지 기다린다. 남은 건수를 반환 (디스크에는 그대로 남음)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._entries:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return len(self._entries)
+
+    def stop(self, flush_timeout=DELIVERY_FLUSH_TIMEOUT):
+        left = self.flush(flush_timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=self.timeout + 1)
+        if self._session:
+            self._session.close()
+        if left:
+            _log(f"[INFO] 미전달 결과 {left}건은 outbox 에 남겨 다음 실행에서 재전송합니다.")
+        return left
+
+    def stats(self):
+        with self._cond:
+            s = dict(self._stats)
+            s["pending"] = len(self._entries)
+            latencies = sorted(self._latencies)
+        delivered = s.pop("latency_total")
+        s["latency_avg"] = round(delivered / s["delivered"], 3) if s["delivered"] else None
+        for name, q in (("latency_p50", 0.5), ("latency_p95", 0.95)):
+            s[name] = round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 3) if latencies else None
+        return s
+
+    # ---------------- 전송 루프 ----------------
+    def _client(self):
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)  # 같은 백엔드로 keep-alive 재사용
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def _next_due(self):
+        """가장 이른 전송 대상과 그때까지 남은 시간"""
+        if not self._entries:
+            return None, None
+        entry = min(self._entries.values(), key=lambda e: e["next_attempt_at"])
+        return entry, max(0.0, entry["next_attempt_at"] - time.time())
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    entry, wait = self._next_due()
+                    if entry is not None and wait == 0:
+                        break
+                    self._cond.wait(wait)
+            self._attempt(entry)
+
+    def _attempt(self, entry):
+        entry["attempts"] += 1
+        status, error = None, None
+        try:
+            response = self._client().post(
+                entry["url"],
+                json=entry["payload"],
+                timeout=self.timeout,
+                headers={
+                    "Idempotency-Key": str(entry["task_id"]),
+                    "X-Delivery-Attempt": str(entry["attempts"]),
+                    "X-Enqueued-At": str(entry["enqueued_at"])
+                }
+            )
+            status = response.status_code
+            if not 200 <= status < 300:
+                error = f"HTTP {status}"
+        except Exception as e:
+            error = str(e)
+
+        entry["last_error"] = error
+        if error is None:
+            outcome = "delivered"
+            self.outbox.remove(entry["task_id"])
+            _log(f"[INFO] 결과 전달 완료: {entry['task_id']} (HTTP {status}, {entry['attempts']}회 시도)")
+        elif (status is not None and is_permanent_failure(status)) or entry["attempts"] >= self.max_attempts:
+            outcome = "dead"
+            self.outbox.bury(entry)
+            _log(f"[ERROR] 결과 전달 포기: {entry['task_id']} ({error}, {entry['attempts']}회 시도) → dead")
+        else:
+            outcome = "retry"
+            delay = min(self.max_delay, self.base_delay * 2 ** (entry["attempts"] - 1))
+            entry["next_attempt_at"] = time.time() + delay * random.uniform(0.8, 1.2)
+            self.outbox.put(entry)  # 시도 횟수/다음 시각을 디스크에도 반영
+            _log(f"[WARN] 결과 전달 실패: {entry['task_id']} ({error}), {delay:.1f}s 후 재시도")
+
+        with self._cond:
+            self._stats["attempts"] += 1
+            if entry["attempts"] > 1:
+                self._stats["retries"] += 1
+            if outcome == "delivered":
+                latency = time.time() - entry["enqueued_at"]
+                self._stats["delivered"] += 1
+                self._stats["latency_total"] += latency
+                self._stats["latency_max"] = max(self._stats["latency_max"], round(latency, 3))
+                self._stats["last_latency"] = round(latency, 3)
+                self._latencies.append(latency)
+            elif outcome == "dead":
+                self._stats["dead"] += 1
+            if outcome != "retry":
+                self._entries.pop(entry["task_id"], None)
+            self._cond.notify_all()
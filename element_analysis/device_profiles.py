@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+분석 뷰포트 프로필 (모바일/태블릿/데스크톱)
+
+WebAnalyzer.analyze(url, profiles=[...]) 는 페이지를 한 번만 로드하고 같은 탭에서
+CDP Emulation.setDeviceMetricsOverride / setUserAgentOverride 로 프로필을 바꿔 가며 수집한다.
+width/height/deviceScaleFactor/mobile 은 setDeviceMetricsOverride 인자 그대로다.
+
+표준 라이브러리만 쓴다 (app 의 요청 검증과 워커 양쪽에서 import).
+"""
+import os
+
+IPHONE_UA = ("Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) "
+             "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1")
+IPAD_UA = ("Mozilla/5.0 (iPad; CPU OS 16_0 like Mac OS X) "
+           "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1")
+DESKTOP_UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+DEVICE_PROFILES = {
+    "mobile": {"width": 375, "height": 812, "deviceScaleFactor": 3.0, "mobile": True, "userAgent": IPHONE_UA},
+    "tablet": {"width": 768, "height": 1024, "deviceScaleFactor": 2.0, "mobile": True, "userAgent": IPAD_UA},
+    "desktop": {"width": 1366, "height": 768, "deviceScaleFactor": 1.0, "mobile": False, "userAgent": DESKTOP_UA},
+}
+
+# crawl.create_driver 의 mobileEmulation (프로필을 지정하지 않은 분석은 이 프로필 하나)
+DRIVER_PROFILE = "mobile"
+
+# 요청에 profiles 가 없을 때 분석할 프로필 (쉼표 구분, 앞의 것이 결과 JSON 최상위 점수의 기준)
+ANALYSIS_PROFILES = os.environ.get("ANALYSIS_PROFILES", DRIVER_PROFILE)
+# 프로필을 바꿀 때 페이지를 다시 로드할지 (on: UA 로 서버 응답이 달라지는 사이트용, 리소스는 브라우저 캐시에서)
+PROFILE_RELOAD = os.environ.get("PROFILE_RELOAD", "off") == "on"
+PROFILE_SETTLE_SECONDS = float(os.environ.get("PROFILE_SETTLE_SECONDS", 0.5))  # 전환 후 resize 핸들러 대기
+
+
+def parse_profiles(value=None):
+    """
+    프로필 이름 목록 또는 "mobile,desktop" → 검증된 이름 목록 (순서 유지, 중복 제거).
+    값이 없으면 ANALYSIS_PROFILES, 모르는 이름이 있으면 ValueError
+    """
+    if value is None or value == "" or value == []:
+        value = ANALYSIS_PROFILES
+    names = value.split(",") if isinstance(value, str) else list(value)
+    names = list(dict.fromkeys(str(name).strip() for name in names if str(name).strip()))
+    unknown = [name for name in names if name not in DEVICE_PROFILES]
+    if unknown or not names:
+        raise ValueError(f"알 수 없는 프로필: {', '.join(unknown) or '(없음)'} (가능: {', '.join(DEVICE_PROFILES)})")
+    return names
+
+
+def profiles_key(names):
+    """결과 캐시 키에 넣을 프로필 식별자 (모바일 하나면 기존 키와 같은 "mobile")"""
+    return "+".join(names)
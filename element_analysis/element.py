@@ -1,32 +1,141 @@
 import torch
 import torchvision
-from PIL import Image
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from torchvision.ops import batched_nms
+from PIL import Image, ImageDraw, ImageFont
+import hashlib
+import io
 import os
+import threading
+import time
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 import numpy as np
-import pytesseract
+
+from spans import span
 
 # 상수
 TESSERACT_PATH = '/usr/bin/tesseract'
 MIN_CONFIDENCE = 60
 CONFIDENCE_THRESHOLD = 0.5
+MAX_DETECTIONS = 50  # 이미지당 상위 N개 박스만 사용
+BUTTON_LABELS = [3, 4, 5, 8, 12]  # Checked View, Icon, Input Field, Text Button, Switch
+INFERENCE_BATCH_SIZE = int(os.environ.get("INFERENCE_BATCH_SIZE", 4))
+
+# 타일 추론 설정 (세로로 긴 전체 페이지 스크린샷용, 단위: 스크린샷 px)
+# TILED_INFERENCE_MIN_HEIGHT 보다 긴 이미지는 자동으로 타일 모드 사용 (0이면 비활성)
+TILE_HEIGHT = int(os.environ.get("TILE_HEIGHT", 1624))
+TILE_OVERLAP = int(os.environ.get("TILE_OVERLAP", 256))
+TILED_INFERENCE_MIN_HEIGHT = int(os.environ.get("TILED_INFERENCE_MIN_HEIGHT", 4000))
+NMS_IOU_THRESHOLD = 0.5
+TILE_EDGE_MARGIN = 2  # 타일 경계에 걸친 박스 판정 여유(px)
+
+# 탐지 결과 이미지(detection_result.png) 렌더링
+# RENDER_DETECTIONS: eager(탐지 직후) | defer(render_annotation 호출 시) | off(생성 안 함)
+RENDER_MODE = os.environ.get("RENDER_DETECTIONS", "eager")
+ANNOTATION_RENDERER = os.environ.get("ANNOTATION_RENDERER", "pil")  # pil | matplotlib
+PNG_COMPRESS_LEVEL = 1  # 용량보다 인코딩 속도 우선
+
+# 경로, 인코딩된 바이트, PIL 이미지 모두 입력으로 허용
+ImageSource = Union[str, bytes, Image.Image]
 
 # 모델 체크포인트 경로
-MODEL_PATH = "/app/checkpoints/screenrecognition-web350k-vins.torchscript"
+MODEL_PATH = os.environ.get("MODEL_PATH", "/app/checkpoints/screenrecognition-web350k-vins.torchscript")
+
+# 모델 최적화/스레드 설정
+# MODEL_OPTIMIZE: none | freeze | optimize (torch.jit.freeze / optimize_for_inference)
+MODEL_OPTIMIZE = os.environ.get("MODEL_OPTIMIZE", "none")
+MODEL_WARMUP = os.environ.get("MODEL_WARMUP", "1") == "1"
+WARMUP_SHAPE = (3, 812, 375)  # 모바일 뷰포트 한 화면 크기
+TORCH_NUM_THREADS = int(os.environ.get("TORCH_NUM_THREADS", 0))
+TORCH_INTEROP_THREADS = int(os.environ.get("TORCH_INTEROP_THREADS", 0))
 
 # 저장 경로 통일
 OUTPUT_DIR = os.path.join(os.getcwd(), "tmp", "file")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+@dataclass
+class LoadedModel:
+    module: torch.jit.ScriptModule
+    load_time: float
+    warmup_time: float
+    optimize: str
+
+
+class ModelRegistry:
+    """Process-wide cache so each checkpoint is deserialized once"""
+    _lock = threading.Lock()
+    _models: Dict[Tuple[str, str], LoadedModel] = {}
+    _threads_configured = False
+
+    @classmethod
+    def get(cls, path: str = MODEL_PATH, optimize: str = MODEL_OPTIMIZE,
+            warmup: bool = MODEL_WARMUP) -> LoadedModel:
+        """Return the cached model, loading/optimizing/warming it up on first use"""
+        key = (path, optimize)
+        with cls._lock:
+            if key not in cls._models:
+                cls._configure_threads()
+                cls._models[key] = cls._load(path, optimize, warmup)
+            return cls._models[key]
+
+    @classmethod
+    def _configure_threads(cls):
+        if cls._threads_configured:
+            return
+        if TORCH_NUM_THREADS > 0:
+            torch.set_num_threads(TORCH_NUM_THREADS)
+        if TORCH_INTEROP_THREADS > 0:
+            try:
+                torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+            except RuntimeError as e:
+                # 이미 병렬 작업이 시작된 뒤에는 변경할 수 없다
+                print(f"[WARN] inter-op 스레드 설정 실패: {e}")
+        cls._threads_configured = True
+
+    @staticmethod
+    def _load(path: str, optimize: str, warmup: bool) -> LoadedModel:
+        started = time.perf_counter()
+        model = torch.jit.load(path, map_location=torch.device('cpu'))
+        model.eval()
+        if optimize in ("freeze", "optimize"):
+            try:
+                if optimize == "optimize":
+                    model = torch.jit.optimize_for_inference(model)
+                else:
+                    model = torch.jit.freeze(model)
+            except Exception as e:
+                print(f"[WARN] 모델 {optimize} 실패, 원본 모델 사용: {e}")
+                optimize = "none"
+        load_time = time.perf_counter() - started
+
+        warmup_time = 0.0
+        if warmup:
+            started = time.perf_counter()
+            with torch.no_grad():
+                model([torch.zeros(WARMUP_SHAPE)])
+            warmup_time = time.perf_counter() - started
+
+        print(f"[INFO] 모델 로드 {load_time:.3f}s, 워밍업 {warmup_time:.3f}s "
+              f"(optimize={optimize}, threads={torch.get_num_threads()})")
+        return LoadedModel(model, load_time, warmup_time, optimize)
+
+
 class UIAnalyzer:
     def __init__(self):
         self.class_mapping = self._load_class_mapping()
-        pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
         self.contrast_index = 0
         self.button_elements = []
+        self.timings = {}
+        self.detections = None
+        self.annotation_path = None
+        self.annotated_image = None  # 렌더링된 이미지 (업로드 시 PNG 재디코딩 없이 인코딩)
+        self.region_detections = None  # {영역 픽셀 해시: detection} (영역 캐시를 쓸 때만)
+        self.region_stats = None
+        self._source_image = None
+
+    def warm_up(self) -> None:
+        """Load (and warm up) the shared model ahead of the first request"""
+        ModelRegistry.get()
 
     def _load_class_mapping(self) -> Dict[int, str]:
         """Load VINS class mapping"""
@@ -38,67 +147,333 @@ class UIAnalyzer:
         }
 
     @staticmethod
-    def load_and_preprocess_image(image_path: str) -> Tuple[torch.Tensor, Image.Image]:
+    def to_pil(image: ImageSource) -> Image.Image:
+        """Accept a path, encoded bytes or PIL image and return an RGB PIL image"""
+        if isinstance(image, Image.Image):
+            pil = image
+        elif isinstance(image, (bytes, bytearray)):
+            pil = Image.open(io.BytesIO(image))
+        else:
+            pil = Image.open(image)
+        if pil.mode != 'RGB':
+            pil = pil.convert('RGB')
+        return pil
+
+    @staticmethod
+    def load_and_preprocess_image(image_path: ImageSource) -> Tuple[torch.Tensor, Image.Image]:
         """Load and preprocess image"""
-        image = Image.open(image_path)
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        image = UIAnalyzer.to_pil(image_path)
         transform = torchvision.transforms.ToTensor()
         return transform(image), image
 
+    @staticmethod
+    def _filter_detections(detection: Dict[str, torch.Tensor],
+                           limit: Optional[int] = MAX_DETECTIONS) -> Dict[str, object]:
+        """Keep the top `limit` boxes above the confidence threshold (None: all, capped later)"""
+        scores = detection['scores'][:limit]
+        keep = scores > CONFIDENCE_THRESHOLD
+        boxes = detection['boxes'][:limit][keep].numpy()
+        labels = detection['labels'][:limit][keep].numpy()
+        return {
+            'boxes': boxes,
+            'scores': scores[keep].numpy(),
+            'labels': labels,
+            'button_count': int(np.isin(labels, BUTTON_LABELS).sum())
+        }
+
+    @staticmethod
+    def _top_detections(detection: Dict[str, object], limit: int = MAX_DETECTIONS) -> Dict[str, object]:
+        """First `limit` boxes of a filtered detection (scores are in descending order)"""
+        labels = detection['labels'][:limit]
+        return {
+            'boxes': detection['boxes'][:limit],
+            'scores': detection['scores'][:limit],
+            'labels': labels,
+            'button_count': int(np.isin(labels, BUTTON_LABELS).sum())
+        }
 
-    def detect_ui_elements(self, image_path: str) -> None:
-        """Detect and analyze UI elements in the image"""
-        self.BUTTON_COUNT = 0
-        BUTTON_LABELS = [3, 4, 5, 8, 12]  # Checked View, Icon, Input Field, Text Button, Switch
-        
-        # 모델 로드
-        model = torch.jit.load(MODEL_PATH, map_location=torch.device('cpu'))
-        model.eval()
+    def detect_batch(self, images: Sequence[ImageSource], batch_size: int = INFERENCE_BATCH_SIZE,
+                     limit: Optional[int] = MAX_DETECTIONS) -> List[Dict[str, object]]:
+        """
+        Run many screenshots through the detector in micro-batches.
+        Returns one {boxes, scores, labels, button_count} dict per input image.
+        Tiles pass limit=None so MAX_DETECTIONS applies once per page after merge_tile_detections.
+        """
+        model = ModelRegistry.get().module
+        transform = torchvision.transforms.ToTensor()
+        results = []
+        inference_elapsed = 0.0
+        for offset in range(0, len(images), max(1, batch_size)):
+            # 배치 단위로만 디코딩해 메모리에 올라가는 이미지 수를 제한
+            chunk = images[offset:offset + max(1, batch_size)]
+            tensors = [transform(self.to_pil(image)) for image in chunk]
+            with torch.no_grad():
+                started = time.perf_counter()
+                _, detections = model(tensors)
+                inference_elapsed += time.perf_counter() - started
+            results.extend(self._filter_detections(d, limit) for d in detections)
+        self.timings["inference"] = inference_elapsed
+        return results
+
+    @staticmethod
+    def tile_offsets(height: int, tile_height: int = TILE_HEIGHT, overlap: int = TILE_OVERLAP) -> List[int]:
+        """Top y of each tile; the last tile is aligned to the bottom edge"""
+        if height <= tile_height:
+            return [0]
+        stride = max(1, tile_height - overlap)
+        offsets = list(range(0, height - tile_height, stride))
+        offsets.append(height - tile_height)
+        return offsets
+
+    @staticmethod
+    def merge_tile_detections(per_tile: List[Dict[str, object]], offsets: List[int], tile_heights: List[int],
+                              overlap: int = TILE_OVERLAP, iou_threshold: float = NMS_IOU_THRESHOLD,
+                              limit: int = MAX_DETECTIONS) -> Dict[str, object]:
+        """Map tile boxes back to page coordinates, merge duplicates with per-class NMS, keep the top `limit`"""
+        boxes, scores, labels = [], [], []
+        last = len(per_tile) - 1
+        for i, (detection, offset, tile_h) in enumerate(zip(per_tile, offsets, tile_heights)):
+            tile_boxes = detection['boxes']
+            if len(tile_boxes) == 0:
+                continue
+            # 내부 경계에 잘린 박스는 버린다. 겹침 영역보다 작으면 이웃 타일에 온전히 들어 있다
+            fits_overlap = (tile_boxes[:, 3] - tile_boxes[:, 1]) < overlap
+            cut_top = (tile_boxes[:, 1] <= TILE_EDGE_MARGIN) if i > 0 else np.zeros(len(tile_boxes), bool)
+            cut_bottom = (tile_boxes[:, 3] >= tile_h - TILE_EDGE_MARGIN) if i < last else np.zeros(len(tile_boxes), bool)
+            keep = ~((cut_top | cut_bottom) & fits_overlap)
+
+            shifted = tile_boxes[keep].copy()
+            shifted[:, [1, 3]] += offset
+            boxes.append(shifted)
+            scores.append(detection['scores'][keep])
+            labels.append(detection['labels'][keep])
+
+        if not boxes:
+            return {'boxes': np.zeros((0, 4), np.float32), 'scores': np.zeros(0, np.float32),
+                    'labels': np.zeros(0, np.int64), 'button_count': 0}
+
+        boxes_t = torch.from_numpy(np.concatenate(boxes))
+        scores_t = torch.from_numpy(np.concatenate(scores))
+        labels_t = torch.from_numpy(np.concatenate(labels))
+        keep = batched_nms(boxes_t, scores_t, labels_t, iou_threshold)[:limit]  # 점수 내림차순
+        merged_labels = labels_t[keep].numpy()
+        return {
+            'boxes': boxes_t[keep].numpy(),
+            'scores': scores_t[keep].numpy(),
+            'labels': merged_labels,
+            'button_count': int(np.isin(merged_labels, BUTTON_LABELS).sum())
+        }
+
+    def detect_tiled(self, image: ImageSource, tile_height: int = TILE_HEIGHT, overlap: int = TILE_OVERLAP,
+                     batch_size: int = INFERENCE_BATCH_SIZE) -> Dict[str, object]:
+        """Split a tall screenshot into overlapping full-width tiles and batch them through the model"""
+        pil = self.to_pil(image)
+        width, height = pil.size
+        offsets = self.tile_offsets(height, tile_height, overlap)
+        tiles = [pil.crop((0, y, width, min(y + tile_height, height))) for y in offsets]
+        per_tile = self.detect_batch(tiles, batch_size=batch_size, limit=None)
+        print(f"[INFO] 타일 추론: {len(tiles)}개 타일 ({width}x{tile_height}, overlap {overlap})")
+        return self.merge_tile_detections(per_tile, offsets, [t.size[1] for t in tiles], overlap)
+
+    @staticmethod
+    def region_hash(image: Image.Image) -> str:
+        """Content hash of a screenshot region (size + raw pixels)"""
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16).hexdigest()
+        return f"{image.size[0]}x{image.size[1]}-{digest}"
+
+    def detect_regions(self, image: Image.Image, tiled: bool,
+                       region_cache: Dict[str, Dict[str, object]]) -> Dict[str, object]:
+        """
+        Same regions as a full run (the tiles, or the whole image), but pixel-identical regions
+        reuse region_cache detections and only the rest go through the model.
+        """
+        width, height = image.size
+        offsets = self.tile_offsets(height) if tiled else [0]
+        regions = [image.crop((0, y, width, min(y + TILE_HEIGHT, height))) for y in offsets] if tiled else [image]
+        hashes = [self.region_hash(region) for region in regions]
+
+        # 같은 페이지 안에서 반복되는 영역(빈 여백 등)도 한 번만 추론
+        pending = list(dict.fromkeys(h for h in hashes if h not in region_cache))
+        self.timings["inference"] = 0.0
+        fresh = self.detect_batch([regions[hashes.index(h)] for h in pending],
+                                  limit=None if tiled else MAX_DETECTIONS) if pending else []
+        by_hash = {h: region_cache[h] for h in hashes if h in region_cache}
+        by_hash.update(zip(pending, fresh))
+
+        self.region_detections = {h: by_hash[h] for h in hashes}
+        self.region_stats = {
+            "total": len(regions),
+            "reused": sum(1 for h in hashes if h in region_cache),
+            "detected": len(pending)
+        }
+        per_region = [by_hash[h] for h in hashes]
+        if tiled:
+            print(f"[INFO] 타일 추론: {len(regions)}개 타일 중 {len(pending)}개만 추론 (나머지는 이전 결과 재사용)")
+            return self.merge_tile_detections(per_region, offsets, [r.size[1] for r in regions])
+        return per_region[0]
+
+    def detect_ui_elements(self, image_path: ImageSource, tiled: Optional[bool] = None,
+                           render: str = RENDER_MODE,
+                           region_cache: Optional[Dict[str, Dict[str, object]]] = None) -> None:
+        """
+        Detect and analyze UI elements in the image (tiled=None picks by image height).
+        render: eager renders detection_result.png now, defer waits for render_annotation(), off skips it.
+        region_cache: previous {region hash: detection}; when given, unchanged regions are not re-detected.
+        """
+        # 모델 로드 (프로세스당 1회, 이후 호출은 캐시 사용)
+        started = time.perf_counter()
+        loaded = ModelRegistry.get()
+        load_elapsed = time.perf_counter() - started
+
+        original_image = self.to_pil(image_path)
+        if tiled is None:
+            tiled = bool(TILED_INFERENCE_MIN_HEIGHT) and original_image.size[1] > TILED_INFERENCE_MIN_HEIGHT
+        self.region_detections = self.region_stats = None
+        with span("inference", stage=True, tiled=bool(tiled)) as s:
+            if region_cache is not None:
+                detection = self.detect_regions(original_image, tiled, region_cache)
+                s.set(**{f"regions_{k}": v for k, v in self.region_stats.items()})
+            elif tiled:
+                detection = self.detect_tiled(original_image)
+            else:
+                detection = self.detect_batch([original_image])[0]
+            s.set(boxes=len(detection['boxes']), buttons=detection['button_count'],
+                  model_seconds=round(self.timings.get("inference", 0.0), 4))
+        self._set_result(detection, original_image, loaded, load_elapsed, render)
+
+    def detect_many(self, images: Sequence[ImageSource], tiled: Optional[bool] = None,
+                    render: str = RENDER_MODE) -> List[Dict[str, object]]:
+        """
+        Detect several screenshots (e.g. one per device profile) with a single detect_batch call.
+        Tall images are tiled first and all regions share the same micro-batches.
+        The first image becomes the current result (detections, BUTTON_COUNT, render_annotation).
+        """
+        started = time.perf_counter()
+        loaded = ModelRegistry.get()
+        load_elapsed = time.perf_counter() - started
+
+        pils = [self.to_pil(image) for image in images]
+        regions, plans = [], []  # plans: 이미지마다 (regions 시작 위치, 영역 수, 타일 오프셋 또는 None)
+        for pil in pils:
+            width, height = pil.size
+            tile = tiled if tiled is not None else bool(TILED_INFERENCE_MIN_HEIGHT) and height > TILED_INFERENCE_MIN_HEIGHT
+            offsets = self.tile_offsets(height) if tile else None
+            crops = [pil.crop((0, y, width, min(y + TILE_HEIGHT, height))) for y in offsets] if tile else [pil]
+            plans.append((len(regions), len(crops), offsets))
+            regions.extend(crops)
+
+        self.region_detections = self.region_stats = None
+        with span("inference", stage=True, images=len(pils), regions=len(regions)) as s:
+            per_region = self.detect_batch(regions, limit=None)  # 상한은 이미지 단위로 아래에서
+            detections = []
+            for start, count, offsets in plans:
+                if offsets is None:
+                    detections.append(self._top_detections(per_region[start]))
+                else:
+                    detections.append(self.merge_tile_detections(
+                        per_region[start:start + count], offsets,
+                        [r.size[1] for r in regions[start:start + count]]))
+            s.set(boxes=sum(len(d['boxes']) for d in detections),
+                  buttons=sum(d['button_count'] for d in detections),
+                  model_seconds=round(self.timings.get("inference", 0.0), 4))
+        print(f"[INFO] 스크린샷 {len(pils)}개를 영역 {len(regions)}개로 한 번에 추론")
+        self._set_result(detections[0], pils[0], loaded, load_elapsed, render)
+        return detections
+
+    def _set_result(self, detection: Dict[str, object], original_image: Image.Image, loaded: LoadedModel,
+                    load_elapsed: float, render: str) -> None:
+        self.detections = detection
+        self.BUTTON_COUNT = detection['button_count']
+        self.timings.update({
+            "model_load": load_elapsed,
+            "model_load_initial": loaded.load_time,
+            "warmup": loaded.warmup_time
+        })
+        print(f"[INFO] 모델 준비 {load_elapsed:.3f}s, 추론 {self.timings['inference']:.3f}s")
+
+        self._source_image = original_image if render != "off" else None
+        self.annotation_path = None
+        self.annotated_image = None
+        self.timings.pop("rendering", None)  # 이전 작업의 렌더링 시간이 남지 않도록
+        if render == "eager":
+            self.render_annotation()
+
+    def render_annotation(self, output_path: Optional[str] = None) -> Optional[str]:
+        """Render the last detections onto the screenshot (once) and return the PNG path"""
+        if self.annotation_path:
+            return self.annotation_path
+        if self._source_image is None or self.detections is None:
+            return None
+        output_path = output_path or os.path.join(OUTPUT_DIR, "detection_result.png")
+        started = time.perf_counter()
+        with span("rendering", stage=True, renderer=ANNOTATION_RENDERER):
+            if ANNOTATION_RENDERER == "matplotlib":
+                render_detections_matplotlib(self._source_image, self.detections, self.class_mapping, output_path)
+                annotated = None  # 업로더가 PNG 를 다시 읽는다
+            else:
+                annotated = render_detections(self._source_image, self.detections, self.class_mapping, output_path)
+        self.timings["rendering"] = time.perf_counter() - started
+        self.annotated_image = annotated  # 박스가 그려진 사본 (원본 스크린샷은 그대로)
+        self._source_image = None
+        self.annotation_path = output_path
+        return output_path
+
+
+def render_detections(image: Image.Image, detection: Dict[str, object],
+                      class_mapping: Dict[int, str], output_path: str) -> Image.Image:
+    """Draw boxes and labels on a copy of the image at native resolution and return the copy"""
+    image = image.copy()  # 호출자의 스크린샷(프로필/증분 분석에서 재사용)은 건드리지 않는다
+    draw = ImageDraw.Draw(image)
+    # 고해상도(DSF 2~3) 스크린샷에서도 보이도록 선 두께/글자 크기를 폭에 맞춘다
+    scale = max(1, image.size[0] // 375)
+    font = ImageFont.load_default(size=12 * scale)
+    for box, score, label in zip(detection['boxes'], detection['scores'], detection['labels']):
+        x1, y1, x2, y2 = (float(v) for v in box)
+        draw.rectangle((x1, y1, x2, y2), outline=(255, 0, 0), width=2 * scale)
+        class_name = class_mapping.get(int(label), f"unknown-{int(label)}")
+        text = f"{class_name}: {score:.2f}"
+        left, top, right, bottom = draw.textbbox((x1, y1), text, font=font)
+        text_y = max(0, y1 - (bottom - top) - 4 * scale)
+        draw.rectangle((x1, text_y, x1 + (right - left) + 4 * scale, text_y + (bottom - top) + 4 * scale),
+                       fill=(200, 0, 0))
+        draw.text((x1 + 2 * scale, text_y), text, fill=(255, 255, 255), font=font)
+    image.save(output_path, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return image
+
+
+def render_detections_matplotlib(image: Image.Image, detection: Dict[str, object],
+                                 class_mapping: Dict[int, str], output_path: str) -> None:
+    """Legacy matplotlib renderer (kept for comparison, imported only when used)"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+
+    fig, ax = plt.subplots(1, figsize=(10, 10))
+    ax.imshow(image)
+
+    for box, score, label in zip(detection['boxes'], detection['scores'], detection['labels']):
+        rect = patches.Rectangle(
+            (box[0], box[1]),
+            box[2] - box[0],
+            box[3] - box[1],
+            linewidth=2, edgecolor='r', facecolor='none'
+        )
+        ax.add_patch(rect)
 
-        # 모델로드 및 이미지 경로지정
-        image_tensor, original_image = self.load_and_preprocess_image(image_path)
-        original_image_np = np.array(original_image)
-
-        with torch.no_grad():
-            losses, detections = model([image_tensor])
-            
-            fig, ax = plt.subplots(1, figsize=(10, 10))
-            ax.imshow(original_image)
-
-            for i in range(min(50, len(detections[0]['boxes']))):
-                if detections[0]['scores'][i] > CONFIDENCE_THRESHOLD:
-                    element_data = {
-                        'box': detections[0]['boxes'][i].numpy(),
-                        'score': detections[0]['scores'][i].item(),
-                        'label': detections[0]['labels'][i].item()
-                    }
-                    
-                    if element_data['label'] in BUTTON_LABELS:
-                        self.BUTTON_COUNT += 1
-                    
-                    rect = patches.Rectangle(
-                        (element_data['box'][0], element_data['box'][1]),
-                        element_data['box'][2] - element_data['box'][0],
-                        element_data['box'][3] - element_data['box'][1],
-                        linewidth=2, edgecolor='r', facecolor='none'
-                    )
-                    ax.add_patch(rect)
-                    
-                    class_name = self.class_mapping.get(element_data['label'],
-                                                      f"unknown-{element_data['label']}")
-                    ax.text(
-                        element_data['box'][0],
-                        element_data['box'][1] - 5,
-                        f"{class_name}: {element_data['score']:.2f}",
-                        color='white',
-                        fontsize=12,
-                        bbox=dict(facecolor='red', alpha=0.5)
-                    )            
-            plt.axis('off')
-            plt.title("UI Element Detection - VINS")
-            plt.savefig(os.path.join(OUTPUT_DIR, "detection_result.png"))
-            plt.close()
+        class_name = class_mapping.get(int(label), f"unknown-{int(label)}")
+        ax.text(
+            box[0],
+            box[1] - 5,
+            f"{class_name}: {score:.2f}",
+            color='white',
+            fontsize=12,
+            bbox=dict(facecolor='red', alpha=0.5)
+        )
+    plt.axis('off')
+    plt.title("UI Element Detection - VINS")
+    plt.savefig(output_path)
+    plt.close(fig)
 
 def main():
     image_path = os.path.join(OUTPUT_DIR, "screenshot.png")  # 스크린샷 경로
@@ -1,15 +1,30 @@
 import os
 import json
+import time
+import traceback
+import subprocess
+from contextlib import redirect_stdout, redirect_stderr
 from datetime import datetime
-from element import UIAnalyzer
-from crawl import WebAnalyzer
+from urllib.parse import urlparse
 import sys
-import requests
-import boto3
 
+from result_cache import ResultCache, RESULT_CACHE_ENABLED, MODEL_VERSION, cache_key, content_fingerprint
+from delivery import CallbackDelivery, Outbox
+from uploader import ArtifactUploader
+from spans import Tracer, TRACE_DIR, install, span
+from device_profiles import DRIVER_PROFILE, parse_profiles, profiles_key
 
+# torch/selenium/boto3 등 무거운 모듈은 해당 단계에서만 import 한다.
+# (element/crawl 을 여기서 import 하면 URL 검증 전에 수 초가 소요됨)
 
-def send_results_to_backend(results, backend_url=None, task_id=None):
+# --profile-startup 에서 측정할 모듈 (엔트리포인트가 실제로 쓰는 순서)
+STARTUP_PROFILE_MODULES = [
+    "numpy", "PIL.Image", "requests", "selenium.webdriver", "torch", "torchvision",
+    "boto3", "cairosvg", "pytesseract", "matplotlib.pyplot", "crawl", "element", "main"
+]
+
+
+def send_results_to_backend(results, backend_url=None, task_id=None, delivery=None):
     if not backend_url:
         print("[INFO] 백엔드 주소가 없어 전송을 생략합니다.")
         return
@@ -23,6 +38,14 @@ def send_results_to_backend(results, backend_url=None, task_id=None):
         "results": results
     }
 
+    # outbox 에 기록만 하고 바로 반환 (전송/재시도는 백그라운드)
+    if delivery is not None:
+        delivery.submit(task_id, backend_url, payload)
+        print("[INFO] 결과를 outbox 에 기록했습니다. 백그라운드에서 전송합니다.")
+        return
+
+    import requests
+
     try:
         response = requests.post(
             backend_url,
@@ -37,55 +60,6 @@ def send_results_to_backend(results, backend_url=None, task_id=None):
 
 
 
-def calculate_score(button_detection_score, button_visual_score, button_size_score, button_contrast_score, font_size_score, overall_contrast_score, korean_ratio_score):
-    # 1. 버튼 탐지도 & 버튼 시각적 피드백 (35%)
-    button_score = (button_detection_score * 0.8 + button_visual_score * 0.2) * 0.25
-    
-    # 2. 버튼 크기 & 버튼 명암 대비 (10%)
-    button_style_score = (button_size_score * 0.5 + button_contrast_score * 0.5) * 0.05
-    
-    # 3. 폰트 크기 & 전체 명암 대비 (25%)
-    text_score = (font_size_score * 0.5 + overall_contrast_score * 0.5) * 0.4
-    
-    # 4. 한국어 비율 (30%)
-    korean_score = korean_ratio_score * 0.3
-    
-    return button_score + button_style_score + text_score + korean_score
-
-def get_category_level(score):
-    if score < 20:
-        return "(심각)"
-    elif score < 30:
-        return "(보통)"
-    else:
-        return "(양호)"
-
-def get_severity_level(score):
-    if score < 20:
-        return "심각"
-    elif score < 30:
-        return "보통"
-    else:
-        return "양호"
-
-def get_severity_color(score):
-    if score < 20:
-        return "red"
-    elif score < 30:
-        return "orange"
-    else:
-        return "green"
-
-def get_accessibility_level(score):
-    if score >= 50:
-        return "매우 우수 (A등급)"
-    elif score >= 40:
-        return "우수 (B등급)"
-    elif score >= 30:
-        return "보통 (C등급)"
-    else:
-        return "미흡 (D등급)"
-
 def save_results_to_json(results, filename="accessibility_analysis_results.json"):
     """분석 결과를 JSON 파일로 저장"""
     try:
@@ -101,51 +75,98 @@ def save_results_to_json(results, filename="accessibility_analysis_results.json"
         print(f"JSON 저장 중 오류 발생: {e}")
         return None
 
-def run_analysis(url, backend_url=None, task_id=None, website_id=None):
+def run_analysis(url, backend_url=None, task_id=None, website_id=None, analyzer=None, browser_pool=None,
+                 cache=None, force=False, snapshots=None, incremental=False, delivery=None, uploader=None,
+                 profiles=None):
+    from crawl import WebAnalyzer
+    from scoring import (calculate_score, button_detection_score as compute_button_detection_score, find_issues,
+                         get_severity_level, get_severity_color, get_accessibility_level)
+
     start_time = datetime.now()  # 시작 시간 기록
+    # 뷰포트 프로필: 드라이버 기본(모바일) 하나면 기존 흐름, 아니면 한 세션에서 CDP 로 전환하며 수집
+    profiles = parse_profiles(profiles)
+    emulated = profiles != [DRIVER_PROFILE]
     print("크롤링 시작...")
-    crawler = WebAnalyzer()
+    # 브라우저 풀이 있으면 띄워 둔 브라우저의 격리 컨텍스트를 빌려 쓴다
+    lease = browser_pool.acquire() if browser_pool else None
     try:
-        crawler.analyze(url)
-        
-        # 2. 스크린샷 분석 실행
-        print("\n스크린샷 분석 시작...")
+        crawler = WebAnalyzer(driver=lease.driver if lease else None)
+    except Exception:
+        if lease:
+            lease.release()
+        raise
+    # 단계별 span (결과 JSON timings, 선택적으로 Chrome trace 파일)
+    tracer = Tracer(round_trips=lambda: crawler.driver.round_trips)
+    previous_tracer = install(tracer)
+    try:
+        # 증분 분석: website_id 의 직전 스냅샷에서 명암비/영역 탐지 결과를 가져온다
+        previous_snapshot = None
+        if incremental and website_id:
+            from snapshot import SnapshotStore, known_contrasts_from
+            snapshots = snapshots or SnapshotStore()
+            previous_snapshot = None if force else snapshots.load(website_id)
+            crawler.known_contrasts.update(known_contrasts_from(previous_snapshot))
+        else:
+            snapshots = None
 
-        analyzer = UIAnalyzer()
-        screenshot_path = os.path.join(os.getcwd(), "tmp", "file","screenshot.png")
+        with span("crawl"):
+            crawler.analyze(url, profiles=profiles if emulated else None)
 
-        analyzer.detect_ui_elements(screenshot_path)
-        print("스크린샷 분석 완료")
+        # 같은 모델로 DOM/CSS 가 같은 페이지를 이미 분석했다면 추론/업로드를 건너뛴다
+        key = fingerprint = cached = None
+        if cache is not None:
+            key = cache_key(url, profiles_key(profiles))
+            fingerprint = content_fingerprint(crawler.page_html, [text for _, text, _ in crawler.stylesheets])
+            cached = None if force else cache.match(key, fingerprint)
+        screenshot_path = os.path.join(os.getcwd(), "tmp", "file","screenshot.png")
 
-        # ✅ S3 업로드
-        s3_url = None 
-        s3 = boto3.client('s3')
-        bucket_name = "s3-bucket-934029856517-20251029"
-        s3_key = f"screenshots/{datetime.now().strftime('%Y%m%d_%H%M%S')}_detection_result.png"
+        detection_reused = bool(cached and cached.get("detection"))
+        upload = None
+        if detection_reused:
+            print("\n[INFO] 페이지 내용이 캐시와 같아 스크린샷 분석/업로드를 생략합니다.")
+            element_button_count = cached["detection"]["button_count"]
+            profile_button_counts = cached["detection"].get("profile_button_counts", {})
+            s3_url = cached["detection"].get("s3_url")
+            artifacts = cached["detection"].get("artifacts", {})
+        else:
+            # 2. 스크린샷 분석 실행
+            print("\n스크린샷 분석 시작...")
 
-        try:
-            s3.upload_file("tmp/file/detection_result.png", bucket_name, s3_key)
-            s3_url = f"https://{bucket_name}.s3.ap-northeast-2.amazonaws.com/{s3_key}"
-            print(f"[INFO] S3 업로드 완료: {s3_url}")
-        except Exception as e:
-            print(f"[ERROR] S3 업로드 실패: {e}")
-            s3_url = None
+            if analyzer is None:
+                from element import UIAnalyzer
+                analyzer = UIAnalyzer()
 
+            profile_button_counts = {}
+            if emulated:
+                # 모든 프로필 스크린샷을 한 번의 추론 호출로 (영역 캐시는 단일 프로필에서만 사용)
+                paths = [crawler.profile_views[name]["screenshot_path"] for name in profiles]
+                detections = analyzer.detect_many(paths)
+                profile_button_counts = {name: d["button_count"] for name, d in zip(profiles, detections)}
+            else:
+                region_cache = None
+                if snapshots is not None:
+                    from snapshot import region_cache_from
+                    region_cache = region_cache_from(previous_snapshot, MODEL_VERSION)
+                analyzer.detect_ui_elements(screenshot_path, region_cache=region_cache)
+            element_button_count = analyzer.BUTTON_COUNT
+            print("스크린샷 분석 완료")
 
+            # ✅ S3 업로드는 백그라운드로 보내고 점수 계산과 겹쳐 진행
+            # (RENDER_DETECTIONS=off 이면 결과 이미지가 없으므로 생략)
+            s3_url, artifacts = None, {}
+            annotated_path = analyzer.render_annotation()
+            if annotated_path:
+                uploader = uploader or ArtifactUploader()
+                key_prefix = f"screenshots/{datetime.now().strftime('%Y%m%d_%H%M%S')}_{task_id or 'local'}_detection_result"
+                upload = uploader.submit(key_prefix, path=annotated_path, image=analyzer.annotated_image)
 
         vertical_scroll = crawler.vscroll
         horizontal_scroll = crawler.hscroll
+        scoring = tracer.begin("scoring")
         # 3. 버튼 개수 차이 계산 (버튼 탐지도)
         crawl_button_count = crawler.TOTAL_BUTTON_COUNT
-        element_button_count = analyzer.BUTTON_COUNT
         button_count_diff = abs(crawl_button_count - element_button_count)
-        if crawl_button_count > 0:
-            if crawl_button_count == 0 :
-                button_detection_score = 100
-            else :
-                button_detection_score = max(0, (1 - button_count_diff / crawl_button_count) * 100)
-        else:
-            button_detection_score = 0
+        button_detection_score = compute_button_detection_score(crawl_button_count, element_button_count)
         
          # 4. 각종 점수 계산
         button_visual_score = crawler.get_button_visual_feedback_score()
@@ -167,22 +188,31 @@ def run_analysis(url, backend_url=None, task_id=None, website_id=None):
         )
         
         # 문제가 있는 항목만 필터링
-        issues = []
-        if button_detection_score < 30:
-            issues.append(("버튼 탐지도", button_detection_score))
-        if button_visual_score < 30:
-            issues.append(("버튼 시각적 피드백", button_visual_score))
-        if button_size_score < 30:
-            issues.append(("버튼 크기", button_size_score))
-        if button_contrast_score < 30:
-            issues.append(("버튼 명암 대비", button_contrast_score))
-        if font_size_score < 30:
-            issues.append(("폰트 크기", font_size_score))
-        if overall_contrast_score < 30:
-            issues.append(("전체 명암 대비", overall_contrast_score))
-        if korean_ratio_score < 30:
-            issues.append(("한국어 비율", korean_ratio_score))
-        
+        issues = find_issues({
+            "button_detection": button_detection_score,
+            "button_visual_feedback": button_visual_score,
+            "button_size": button_size_score,
+            "button_contrast": button_contrast_score,
+            "font_size": font_size_score,
+            "overall_contrast": overall_contrast_score,
+            "korean_ratio": korean_ratio_score
+        })
+        # 프로필별 점수: 크롤링 레코드를 드라이버 없이 다시 채점 (첫 프로필은 위 점수와 같다)
+        profile_sections = build_profile_results(crawler.profile_views, profile_button_counts) if emulated else None
+
+        tracer.end(scoring)
+
+        # 결과 JSON 에 URL 이 필요하므로 여기서만 업로드 완료를 기다린다
+        if upload is not None:
+            with span("upload_wait"):
+                uploaded = ArtifactUploader.resolve(upload)
+            if uploaded:
+                s3_url, artifacts = uploaded["url"], uploaded["artifacts"]
+                print(f"[INFO] S3 업로드 완료: {s3_url} ({uploaded['bytes']}, {uploaded['seconds']}s)")
+                # 업로드는 백그라운드 스레드에서 돌았으므로 잰 시간을 그대로 span 으로 추가
+                tracer.add("upload", uploaded["seconds"], stage=True, start=uploaded["started"],
+                           **{f"{fmt}_bytes": size for fmt, size in uploaded["bytes"].items()})
+
         # JSON 결과 구성
         results = {
             "analysis_info": {
@@ -190,9 +220,12 @@ def run_analysis(url, backend_url=None, task_id=None, website_id=None):
                 "analysis_date": datetime.now().isoformat(),
                 "screenshot_path": screenshot_path,
                 "s3_url": s3_url,  # ✅ 업로드된 이미지 S3 URL
+                "artifacts": artifacts,  # 형식별 URL (ARTIFACT_FORMATS)
                 "task_id" : task_id,
-                "website_id": website_id  # 새로 추가
-
+                "website_id": website_id,  # 새로 추가
+                "content_fingerprint": fingerprint,
+                "detection_reused": detection_reused,
+                "profiles": profiles  # 첫 프로필이 아래 점수의 기준
             },
             "scroll_info":{
                 "vertical_scroll" : vertical_scroll,
@@ -269,23 +302,107 @@ def run_analysis(url, backend_url=None, task_id=None, website_id=None):
                 }
                 for issue in issues
             ],
-            "recommendations": generate_recommendations(issues, final_score)
+            "recommendations": generate_recommendations(issues, final_score),
+            # 단계별 span: stages 는 app 의 /metrics 히스토그램으로 들어간다 (callback 은 app 이 수신 시 측정)
+            "timings": tracer.to_dict()
         }
+        if profile_sections is not None:
+            results["profiles"] = profile_sections
+        trace_path = os.path.join(TRACE_DIR, f"{task_id or 'local'}.trace.json") if TRACE_DIR else None
+        if trace_path:
+            results["timings"]["trace_file"] = trace_path
         
+        if snapshots is not None:
+            from snapshot import build_snapshot, diff_report
+            snapshot_span = tracer.begin("snapshot")
+            current_snapshot = build_snapshot(
+                url, crawler.style_groups, crawler.known_contrasts,
+                None if detection_reused else analyzer.region_detections,
+                MODEL_VERSION, previous_snapshot
+            )
+            results["incremental"] = diff_report(previous_snapshot, current_snapshot,
+                                                 None if detection_reused else analyzer.region_stats)
+            try:
+                snapshots.save(website_id, current_snapshot)
+            except OSError as e:
+                print(f"[ERROR] 스냅샷 저장 실패: {e}")
+            tracer.end(snapshot_span)
+
         # JSON 파일로 저장
         filename = "result.json"
         save_results_to_json(results, filename)
-        send_results_to_backend(results, backend_url=backend_url,task_id=task_id)        
+        if cache is not None:
+            try:
+                cache.put(key, fingerprint, results, url=url,
+                          detection={"button_count": element_button_count, "s3_url": s3_url,
+                                     "artifacts": artifacts, "profile_button_counts": profile_button_counts})
+                print(f"[INFO] 결과 캐시 저장 ({cache.stats()})")
+            except OSError as e:
+                print(f"[ERROR] 결과 캐시 저장 실패: {e}")
+        # 아래 span 들은 결과 JSON 이후라 trace 파일에만 남는다
+        with span("callback_enqueue"):
+            send_results_to_backend(results, backend_url=backend_url, task_id=task_id, delivery=delivery)
         print_summary(results)
+        if trace_path:
+            try:
+                tracer.write_chrome_trace(trace_path, process_name=f"analysis {task_id or ''}".strip())
+                print(f"[INFO] trace 저장: {trace_path}")
+            except OSError as e:
+                print(f"[ERROR] trace 저장 실패: {e}")
         return results
     
     finally:
+        install(previous_tracer)
+        crawler.close()
+        if lease:
+            lease.release()
         end_time = datetime.now()  # 종료 시간 기록
         elapsed = end_time - start_time
         print(f"[INFO] 분석 종료: {end_time}")
         print(f"[INFO] 총 실행 시간: {elapsed}")
 
         
+def build_profile_results(profile_views, button_counts):
+    """WebAnalyzer.profile_views + 프로필별 탐지 버튼 수 → 결과 JSON 의 profiles 섹션"""
+    from scoring import score_records, get_severity_level, get_severity_color, get_accessibility_level
+
+    sections = {}
+    for name, view in profile_views.items():
+        profile = view["profile"]
+        crawled = view["records"]["crawled_button_count"]
+        detected = button_counts.get(name, 0)
+        scores = score_records(view["records"], detected)
+        final_score = scores.pop("final_score")
+        sections[name] = {
+            "viewport": {
+                "width": profile["width"],
+                "height": profile["height"],
+                "device_scale_factor": profile["deviceScaleFactor"],
+                "mobile": profile["mobile"]
+            },
+            "screenshot_path": view["screenshot_path"],
+            "scroll_info": {
+                "vertical_scroll": view["vertical_scroll"],
+                "horizontal_scroll": view["horizontal_scroll"]
+            },
+            "button_analysis": {
+                "crawled_button_count": crawled,
+                "detected_button_count": detected,
+                "button_count_difference": abs(crawled - detected)
+            },
+            "detailed_scores": {
+                key: {"score": round(score, 2), "level": get_severity_level(score), "color": get_severity_color(score)}
+                for key, score in scores.items()
+            },
+            "summary": {
+                "final_score": round(final_score, 2),
+                "accessibility_level": get_accessibility_level(final_score),
+                "severity_level": get_severity_level(final_score),
+                "color": get_severity_color(final_score)
+            }
+        }
+    return sections
+
 def generate_recommendations(issues, final_score):
     """문제점에 따른 개선 권고사항 생성"""
     recommendations = []
@@ -363,7 +480,156 @@ def print_summary(results):
     for rec in results["recommendations"]:
         print(f"  [{rec['priority']}] {rec['category']}: {rec['recommendation']}")
 
+def run_worker(log_dir=None, max_jobs=0, cache_dir=None, snapshot_dir=None, outbox_dir=None):
+    """
+    상주 워커 모드: stdin 으로 받은 작업(JSON 한 줄)을 순서대로 처리하고
+    결과를 stdout 으로 한 줄씩 보고한다. 프로토콜은 app 쪽 worker_pool.py 참고.
+    """
+    protocol = sys.stdout
+    sys.stdout = sys.stderr  # 분석 로그가 프로토콜 채널에 섞이지 않도록
+    log_dir = log_dir or os.path.join(os.getcwd(), "worker_logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    def reply(message):
+        protocol.write(json.dumps(message, ensure_ascii=False) + "\n")
+        protocol.flush()
+
+    # 상주 워커는 요청 전에 미리 import/로드해 두는 것이 목적이므로 여기서 바로 가져온다
+    from element import UIAnalyzer
+    from browser_pool import BrowserPool
+    from snapshot import SnapshotStore
+
+    analyzer = UIAnalyzer()  # 워커 수명 동안 재사용
+    analyzer.warm_up()       # 첫 작업 전에 모델 로드/워밍업
+    browser_pool = BrowserPool(size=1, max_uses=int(os.environ.get("BROWSER_MAX_USES", 100)))
+    browser_pool.warm_up()   # 브라우저도 미리 띄워 둔다
+    cache = None
+    if RESULT_CACHE_ENABLED:
+        cache = ResultCache(cache_dir) if cache_dir else ResultCache()
+    snapshots = SnapshotStore(snapshot_dir) if snapshot_dir else SnapshotStore()
+    # 이전 워커가 못 보낸 결과도 여기서 다시 보낸다
+    delivery = CallbackDelivery(Outbox(outbox_dir) if outbox_dir else Outbox()).start()
+    uploader = ArtifactUploader()  # S3 클라이언트를 작업 간에 재사용
+    uploader.client()            # boto3 import/클라이언트 생성도 미리
+    reply({"type": "ready", "pid": os.getpid()})
+
+    jobs_done = 0
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            print(f"[ERROR] 잘못된 작업 메시지: {line[:200]}")
+            continue
+
+        kind = message.get("type")
+        if kind == "ping":
+            reply({"type": "pong", "jobs_done": jobs_done, "delivery": delivery.stats()})
+            continue
+        if kind == "shutdown":
+            break
+        if kind != "job":
+            continue
+
+        task_id = message.get("task_id")
+        status, error = "done", None
+        started = time.monotonic()
+        # 줄 단위 버퍼링: /logs?follow=1 구독자가 출력되는 대로 받도록
+        with open(os.path.join(log_dir, f"{task_id}.log"), "a", encoding="utf-8", buffering=1) as logf, \
+                redirect_stdout(logf), redirect_stderr(logf):
+            try:
+                run_analysis(
+                    message["url"],
+                    backend_url=message.get("callback_url"),
+                    task_id=task_id,
+                    website_id=message.get("website_id"),
+                    analyzer=analyzer,
+                    browser_pool=browser_pool,
+                    cache=cache,
+                    force=bool(message.get("force")),
+                    snapshots=snapshots,
+                    incremental=bool(message.get("incremental")),
+                    delivery=delivery,
+                    uploader=uploader,
+                    profiles=message.get("profiles")
+                )
+            except Exception as e:
+                traceback.print_exc()
+                status, error = "failed", str(e)
+
+        jobs_done += 1
+        reply({
+            "type": "result",
+            "task_id": task_id,
+            "status": status,
+            "error": error,
+            "elapsed": round(time.monotonic() - started, 3),
+            "delivery": delivery.stats()
+        })
+        if max_jobs and jobs_done >= max_jobs:
+            break
+
+    browser_pool.close()
+    uploader.shutdown()
+    delivery.stop()  # 남은 것은 outbox 에 남아 다음 워커가 보낸다
+    reply({"type": "exit", "jobs_done": jobs_done})
+
+def profile_startup(modules=STARTUP_PROFILE_MODULES):
+    """
+    모듈별 import 비용 측정 (python -X importtime 을 모듈마다 새 프로세스로 실행).
+    각 값은 해당 모듈을 단독으로 처음 import 할 때의 누적 시간이다.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get("PYTHONPATH")])))
+    rows = []
+    for module in modules:
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, env=env, cwd=here
+        )
+        wall = time.perf_counter() - started
+        if proc.returncode != 0:
+            rows.append({"module": module, "error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"})
+            continue
+        cumulative_us = 0
+        for line in proc.stderr.splitlines():
+            # "import time:  self [us] | cumulative | imported package"
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == module:
+                cumulative_us = int(parts[1].strip())
+        rows.append({"module": module, "import_ms": round(cumulative_us / 1000, 1), "process_ms": round(wall * 1000, 1)})
+
+    print(f"{'module':<22}{'import(ms)':>12}{'process(ms)':>13}")
+    for row in rows:
+        if "error" in row:
+            print(f"{row['module']:<22}{'-':>12}{'-':>13}  ({row['error']})")
+        else:
+            print(f"{row['module']:<22}{row['import_ms']:>12}{row['process_ms']:>13}")
+    return rows
+
+def is_valid_url(url):
+    parsed = urlparse(url)
+    return parsed.scheme in ("http", "https") and bool(parsed.netloc)
+
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv:
+        profile_startup()
+        sys.exit(0)
+
+    if "--worker" in sys.argv:
+        args = sys.argv[1:]
+        log_dir = args[args.index("--log-dir") + 1] if "--log-dir" in args else None
+        max_jobs = int(args[args.index("--max-jobs") + 1]) if "--max-jobs" in args else 0
+        cache_dir = args[args.index("--cache-dir") + 1] if "--cache-dir" in args else None
+        snapshot_dir = args[args.index("--snapshot-dir") + 1] if "--snapshot-dir" in args else None
+        outbox_dir = args[args.index("--outbox-dir") + 1] if "--outbox-dir" in args else None
+        run_worker(log_dir=log_dir, max_jobs=max_jobs, cache_dir=cache_dir, snapshot_dir=snapshot_dir,
+                   outbox_dir=outbox_dir)
+        sys.exit(0)
+
     # argv에서 task_id 무조건 가져오기
     if len(sys.argv) < 4:
         print("[ERROR] 필수 인자가 부족합니다. url, callback_url, task_id 필요")
@@ -374,9 +640,21 @@ if __name__ == "__main__":
     task_id = sys.argv[3]
     website_id = sys.argv[4] if len(sys.argv) >= 5 else None
 
+    if not is_valid_url(url):
+        print(f"[ERROR] 잘못된 URL: {url}")
+        sys.exit(1)
+
     print(f"[INFO] URL: {url}")
     print(f"[INFO] Callback URL: {callback_url}")
     print(f"[INFO] task_id ID: {task_id}")
     print(f"[INFO] Website ID: {website_id}")
 
-    run_analysis(url, backend_url=callback_url, task_id=task_id, website_id=website_id)
+    cache = ResultCache() if RESULT_CACHE_ENABLED else None
+    incremental = os.environ.get("INCREMENTAL_ANALYSIS", "off") == "on"
+    delivery = CallbackDelivery().start()
+    try:
+        run_analysis(url, backend_url=callback_url, task_id=task_id, website_id=website_id, cache=cache,
+                     incremental=incremental, delivery=delivery)
+    finally:
+        # 종료 전 전송을 기다리되, 못 보낸 결과는 outbox 에 남아 다음 실행에서 재전송된다
+        delivery.stop()
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+분석 결과 캐시 (로컬 디스크)
+
+키      : 정규화한 URL + 뷰포트 프로필 + 모델 버전
+지문    : 페이지 HTML(스크립트/nonce 제외) + 스타일시트 본문의 해시
+
+- app 은 RESULT_CACHE_SHORTCUT=on 일 때만 키로 조회해 TTL 안의 결과를 워커 없이 바로 돌려준다.
+  키만 보고 재사용하므로 그 사이 바뀐 페이지도 옛 결과가 나간다 — 기본은 꺼져 있다.
+- 워커는 크롤링 직후 지문을 계산해 저장된 지문과 같으면 추론/업로드를 건너뛴다.
+  (내용이 같다는 것이 확인됐으므로 이 경로는 TTL 과 무관하다)
+- 항목 수가 상한을 넘으면 가장 오래 쓰이지 않은 것(mtime)부터 지운다.
+
+표준 라이브러리만 쓴다 (app 과 워커 양쪽에서 import).
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+RESULT_CACHE_DIR = os.environ.get("RESULT_CACHE_DIR", os.path.join(os.getcwd(), "result_cache"))
+RESULT_CACHE_TTL = float(os.environ.get("RESULT_CACHE_TTL", 600))
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", 500))
+RESULT_CACHE_ENABLED = os.environ.get("RESULT_CACHE", "on") != "off"
+# 크롤링 없이 키만으로 재사용하는 app 단계 지름길 (끄면 "변경 없음" 판단은 워커의 지문 비교만)
+RESULT_CACHE_SHORTCUT = os.environ.get("RESULT_CACHE_SHORTCUT", "off") == "on"
+
+# 모델이 바뀌면 탐지 결과가 달라지므로 키에 포함한다
+MODEL_VERSION = os.environ.get("MODEL_VERSION") or os.path.basename(
+    os.environ.get("MODEL_PATH", "/app/checkpoints/screenrecognition-web350k-vins.torchscript"))
+DEFAULT_PROFILE = "mobile"  # crawl.create_driver 의 375x812 모바일 에뮬레이션
+
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
+_NONCE_RE = re.compile(r'\snonce="[^"]*"', re.IGNORECASE)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    """스킴/호스트 소문자, 기본 포트·fragment 제거, 쿼리 정렬, 끝 슬래시 정리"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def cache_key(url, profile=DEFAULT_PROFILE, model_version=MODEL_VERSION):
+    raw = json.dumps([normalize_url(url), profile, model_version])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def content_fingerprint(html, stylesheet_texts=()):
+    """스크립트/nonce 처럼 요청마다 바뀌는 부분을 뺀 DOM + CSS 해시"""
+    digest = hashlib.sha256()
+    digest.update(_NONCE_RE.sub("", _SCRIPT_RE.sub("", html or "")).encode("utf-8", errors="replace"))
+    for text in stylesheet_texts:
+        digest.update(b"\0")
+        digest.update((text or "").encode("utf-8", errors="replace"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=RESULT_CACHE_DIR, ttl=RESULT_CACHE_TTL, max_entries=RESULT_CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.fingerprint_hits = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _touch(self, key):
+        try:
+            os.utime(self._path(key))  # LRU 기준 갱신
+        except OSError:
+            pass
+
+    def get(self, key):
+        """TTL 안의 항목이면 반환 (hit), 아니면 None (miss)"""
+        entry = self._read(key)
+        fresh = entry is not None and time.time() - entry.get("stored_at", 0) <= self.ttl
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not fresh:
+            return None
+        self._touch(key)
+        return entry
+
+    def match(self, key, fingerprint):
+        """저장된 지문이 같으면 항목 반환 (TTL 무시)"""
+        entry = self._read(key)
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return None
+        with self._lock:
+            self.fingerprint_hits += 1
+        self._touch(key)
+        return entry
+
+    def put(self, key, fingerprint, results, detection=None, url=None):
+        entry = {
+            "key": key,
+            "url": url,
+            "fingerprint": fingerprint,
+            "stored_at": time.time(),
+            "detection": detection or {},
+            "results": results
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)  # 읽는 쪽이 반쯤 쓴 파일을 보지 않도록
+        self.evict()
+        return entry
+
+    def invalidate(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def evict(self):
+        """항목 수 상한을 넘으면 mtime 이 오래된 것부터 삭제"""
+        if not self.max_entries:
+            return 0
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                entries.append((os.path.getmtime(os.path.join(self.directory, name)), name))
+            except OSError:
+                continue
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return 0
+        entries.sort()
+        for _, name in entries[:excess]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+        return excess
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "fingerprint_hits": self.fingerprint_hits,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+            }
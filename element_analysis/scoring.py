@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+드라이버 없는 점수 계산
+
+WebAnalyzer 의 get_*_score 와 run_analysis 의 종합 점수는 모두 이 모듈의 함수로 계산한다.
+입력은 스타일 그룹/버튼/텍스트를 열(column) 단위로 담은 평범한 배열이라 Chromium 없이
+벤치마크·프로파일링하거나, 저장해 둔 크롤링 레코드(WebAnalyzer.crawl_records())를 다시 채점할 수 있다.
+
+    records = crawler.crawl_records()
+    scores = score_records(records, detected_button_count=12)
+"""
+import numpy as np
+
+from contrast import contrast_ratios
+
+MIN_CONTRAST = 4.5       # WCAG AA
+MIN_TEXT_SIZE_PX = 16
+MIN_BUTTON_SIZE = 44
+DEFAULT_FONT_PX = 16.0   # px 가 아닌 font-size 는 기본 글꼴 크기로 본다
+ISSUE_THRESHOLD = 30     # 이 점수 미만인 항목을 문제로 보고
+
+KOREAN_RANGES = [(0xAC00, 0xD7A3), (0x1100, 0x11FF), (0x3130, 0x318F), (0xA960, 0xA97F), (0xD7B0, 0xD7FF)]
+VISUAL_FEEDBACK_KEYS = ("background_change", "text_change", "border_change",
+                        "shadow_change", "transform_change", "size_change")
+
+# 결과 JSON 의 detailed_scores 순서/이름 (run_analysis, score_records 공용)
+SCORE_NAMES = {
+    "button_detection": "버튼 탐지도",
+    "button_visual_feedback": "버튼 시각적 피드백",
+    "button_size": "버튼 크기",
+    "button_contrast": "버튼 명암 대비",
+    "font_size": "폰트 크기",
+    "overall_contrast": "전체 명암 대비",
+    "korean_ratio": "한국어 비율",
+}
+
+
+# ----------------------------- 글꼴/명암 (스타일 그룹) -----------------------------
+def font_px(font_size):
+    """computed font-size 문자열 → px"""
+    if isinstance(font_size, str) and font_size.endswith("px"):
+        return float(font_size.replace("px", "").strip())
+    return DEFAULT_FONT_PX
+
+
+def font_px_array(font_sizes):
+    """font-size 문자열 목록 → px 배열 (고유값마다 한 번만 파싱)"""
+    parsed = {}
+    return np.array([parsed[s] if s in parsed else parsed.setdefault(s, font_px(s)) for s in font_sizes],
+                    dtype=np.float64)
+
+
+def font_size_score(font_pxs, counts, min_px=MIN_TEXT_SIZE_PX):
+    """기준 크기 이상인 요소 비율(%) — 그룹 크기로 가중"""
+    font_pxs = np.asarray(font_pxs, dtype=np.float64)
+    counts = np.asarray(counts, dtype=np.int64)
+    total = int(counts.sum())
+    return int(counts[font_pxs >= min_px].sum()) / total * 100 if total else 0
+
+
+def overall_contrast_score(ratios, counts, min_contrast=MIN_CONTRAST):
+    """기준 명암비 이상인 요소 비율(%) — 그룹 크기로 가중, 파싱 실패(NaN) 그룹은 제외"""
+    ratios = np.asarray(ratios, dtype=np.float64)
+    counts = np.asarray(counts, dtype=np.int64)
+    valid = ~np.isnan(ratios)
+    total = int(counts[valid].sum())
+    return int(counts[valid & (ratios >= min_contrast)].sum()) / total * 100 if total else 0
+
+
+def summary_contrast_score(ratios, min_contrast=MIN_CONTRAST):
+    """요약용: 그룹별 min(명암비/기준, 1) 평균(%) — 가중 없음, NaN 그룹 제외"""
+    ratios = np.asarray(ratios, dtype=np.float64)
+    ratios = ratios[~np.isnan(ratios)]
+    return float(np.minimum(ratios / min_contrast, 1.0).mean() * 100) if ratios.size else 0
+
+
+def summary_font_size_score(font_pxs, ratios, min_px=MIN_TEXT_SIZE_PX):
+    """요약용: 그룹별 min(글꼴/기준, 1) 평균(%) — 명암비를 계산할 수 있는 그룹만"""
+    font_pxs = np.asarray(font_pxs, dtype=np.float64)[~np.isnan(np.asarray(ratios, dtype=np.float64))]
+    return float(np.minimum(font_pxs / min_px, 1.0).mean() * 100) if font_pxs.size else 0
+
+
+# ----------------------------- 버튼 -----------------------------
+def button_size_score(widths, heights, min_size=MIN_BUTTON_SIZE):
+    widths = np.asarray(widths, dtype=np.float64)
+    if not widths.size:
+        return 0
+    heights = np.asarray(heights, dtype=np.float64)
+    return int(np.count_nonzero((widths >= min_size) & (heights >= min_size))) / widths.size * 100
+
+
+def button_contrast_score(text_colors, background_colors, min_contrast=MIN_CONTRAST):
+    if not len(text_colors):
+        return 0
+    ratios = contrast_ratios(text_colors, background_colors)
+    return int(np.count_nonzero(ratios >= min_contrast)) / len(text_colors) * 100  # NaN 은 미달
+
+
+def visual_feedback_changes(button):
+    return sum(bool(button.get(key, False)) for key in VISUAL_FEEDBACK_KEYS)
+
+
+def button_visual_feedback_score(buttons, min_changes=2):
+    """hover 등에서 min_changes 가지 이상 바뀌는 버튼 비율(%)"""
+    if not buttons:
+        return 0
+    return sum(1 for b in buttons if visual_feedback_changes(b) >= min_changes) / len(buttons) * 100
+
+
+def button_detection_score(crawled_count, detected_count):
+    """크롤링한 버튼 수와 모델이 탐지한 버튼 수의 일치도(%)"""
+    if crawled_count <= 0:
+        return 0
+    return max(0, (1 - abs(crawled_count - detected_count) / crawled_count) * 100)
+
+
+# ----------------------------- 한국어 비율 -----------------------------
+# 코드 포인트 → 0: 세지 않음(공백/기호), 1: 영숫자, 2: 한글 영숫자. 한글 범위는 모두 BMP 안에 있다.
+NOT_COUNTED, ALNUM, KOREAN = 0, 1, 2
+KOREAN_CHUNK_CHARS = 1 << 22  # 한 번에 배열로 바꿀 문자 수 (메모리 상한)
+_korean_lut = None
+
+
+def korean_lut():
+    """BMP 코드 포인트 분류표 (첫 호출 때 한 번 만든다, 약 10ms)"""
+    global _korean_lut
+    if _korean_lut is None:
+        lut = np.fromiter((chr(c).isalnum() for c in range(0x10000)), dtype=np.uint8, count=0x10000)
+        for start, end in KOREAN_RANGES:
+            lut[start:end + 1] *= KOREAN
+        _korean_lut = lut
+    return _korean_lut
+
+
+def korean_totals(texts):
+    """
+    (한글 문자 수, 공백이 아닌 영숫자 수) — 모든 텍스트를 이어 붙여 분류표로 한 번에 센다.
+    기준은 이전 문자별 루프(ch.strip() and ch.isalnum(), KOREAN_RANGES)와 같다.
+    """
+    joined = "\n".join(t for t in texts if t)  # 구분자 \n 은 세지 않는 문자
+    lut = korean_lut()
+    korean_chars = 0; total_chars = 0
+    for offset in range(0, len(joined), KOREAN_CHUNK_CHARS):
+        chunk = joined[offset:offset + KOREAN_CHUNK_CHARS]
+        codes = np.frombuffer(chunk.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        bmp = codes < 0x10000
+        counts = np.bincount(lut[codes[bmp]], minlength=3)
+        korean_chars += int(counts[KOREAN])
+        total_chars += int(counts[ALNUM]) + int(counts[KOREAN])
+        if not bmp.all():  # 이모지/한자 확장 등 BMP 밖 문자는 드물어 문자별로 판정 (한글 범위 밖)
+            total_chars += sum(chr(c).isalnum() for c in codes[~bmp].tolist())
+    return korean_chars, total_chars
+
+
+def korean_counts(text):
+    """(한글 문자 수, 공백이 아닌 영숫자 수)"""
+    return korean_totals([text])
+
+
+def korean_ratio(texts):
+    korean_chars, total_chars = korean_totals(texts)
+    return korean_chars / total_chars * 100 if total_chars else 0.0
+
+
+def outermost_texts(subtrees):
+    """
+    문서 순서의 (nodeId, subtreeEnd, text) 중 다른 항목의 하위가 아닌 것의 텍스트.
+    innerText 는 하위 요소 텍스트를 포함하므로 중첩된 요소를 함께 세면 같은 글자를 두 번 센다.
+    """
+    texts, covered_until = [], -1
+    for node_id, subtree_end, text in subtrees:
+        if node_id <= covered_until:
+            continue
+        covered_until = subtree_end
+        texts.append(text)
+    return texts
+
+
+# ----------------------------- 종합 -----------------------------
+def calculate_score(button_detection_score, button_visual_score, button_size_score, button_contrast_score, font_size_score, overall_contrast_score, korean_ratio_score):
+    # 1. 버튼 탐지도 & 버튼 시각적 피드백 (35%)
+    button_score = (button_detection_score * 0.8 + button_visual_score * 0.2) * 0.25
+
+    # 2. 버튼 크기 & 버튼 명암 대비 (10%)
+    button_style_score = (button_size_score * 0.5 + button_contrast_score * 0.5) * 0.05
+
+    # 3. 폰트 크기 & 전체 명암 대비 (25%)
+    text_score = (font_size_score * 0.5 + overall_contrast_score * 0.5) * 0.4
+
+    # 4. 한국어 비율 (30%)
+    korean_score = korean_ratio_score * 0.3
+
+    return button_score + button_style_score + text_score + korean_score
+
+
+def find_issues(scores):
+    """{점수 이름: 점수} → 기준 미만 항목 [(한국어 항목명, 점수)] (SCORE_NAMES 순서)"""
+    return [(label, scores[name]) for name, label in SCORE_NAMES.items()
+            if name in scores and scores[name] < ISSUE_THRESHOLD]
+
+
+def get_category_level(score):
+    if score < 20:
+        return "(심각)"
+    elif score < 30:
+        return "(보통)"
+    else:
+        return "(양호)"
+
+def get_severity_level(score):
+    if score < 20:
+        return "심각"
+    elif score < 30:
+        return "보통"
+    else:
+        return "양호"
+
+def get_severity_color(score):
+    if score < 20:
+        return "red"
+    elif score < 30:
+        return "orange"
+    else:
+        return "green"
+
+def get_accessibility_level(score):
+    if score >= 50:
+        return "매우 우수 (A등급)"
+    elif score >= 40:
+        return "우수 (B등급)"
+    elif score >= 30:
+        return "보통 (C등급)"
+    else:
+        return "미흡 (D등급)"
+
+
+# ----------------------------- 저장된 레코드 채점 -----------------------------
+def score_records(records, detected_button_count=0, min_contrast=MIN_CONTRAST,
+                  min_text_size_px=MIN_TEXT_SIZE_PX, min_button_size=MIN_BUTTON_SIZE):
+    """
+    WebAnalyzer.crawl_records() 형식의 레코드 → 항목별 점수 + final_score
+
+    records = {
+        "groups": {"font_size": [...], "color": [...], "background_color": [...], "count": [...],
+                   "contrast": [... 또는 None]},  # contrast 가 없으면 색으로 계산
+        "texts": [...],       # 채택된 요소의 텍스트
+        "buttons": [...],     # discover_buttons 의 버튼 메타 (width/height/text_color/background_color/*_change)
+        "crawled_button_count": int
+    }
+    """
+    groups = records["groups"]
+    counts = groups["count"]
+    ratios = groups.get("contrast")
+    if ratios is None:
+        ratios = contrast_ratios(groups["color"], groups["background_color"])
+    ratios = np.array([np.nan if r is None else r for r in ratios], dtype=np.float64)
+    buttons = records.get("buttons", [])
+
+    scores = {
+        "button_detection": button_detection_score(records.get("crawled_button_count", 0), detected_button_count),
+        "button_visual_feedback": button_visual_feedback_score(buttons),
+        "button_size": button_size_score([b["width"] for b in buttons], [b["height"] for b in buttons],
+                                         min_button_size),
+        "button_contrast": button_contrast_score([b["text_color"] for b in buttons],
+                                                 [b["background_color"] for b in buttons], min_contrast),
+        "font_size": font_size_score(font_px_array(groups["font_size"]), counts, min_text_size_px),
+        "overall_contrast": overall_contrast_score(ratios, counts, min_contrast),
+        "korean_ratio": korean_ratio(records.get("texts", [])),
+    }
+    scores["final_score"] = calculate_score(*(scores[name] for name in SCORE_NAMES))
+    return scores
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+website_id 별 증분 분석 스냅샷
+
+지속적으로 모니터링하는 사이트는 대부분의 DOM 이 실행 사이에 그대로다. 직전 실행의
+  - 채택된 요소 시그니처 (스타일 키 + 텍스트/크기 등)
+  - 스타일 그룹 구성(멤버 해시)과 그룹별 명암비
+  - 스크린샷 영역(타일 또는 전체 이미지)의 픽셀 해시별 탐지 결과
+를 저장해 두고, 다음 실행에서는 바뀐 영역만 다시 탐지하고 새 스타일 키만 명암비를 계산한다.
+
+재사용하는 값은 모두 입력(픽셀/스타일 키)만으로 결정되는 값이라 최종 점수는 전체 실행과 같다.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(os.getcwd(), "snapshots"))
+INCREMENTAL_ANALYSIS = os.environ.get("INCREMENTAL_ANALYSIS", "off") == "on"
+SNAPSHOT_VERSION = 1
+
+
+def _digest(values):
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def member_signature(key, member):
+    """스타일 그룹 멤버 (element, index, text, is_button, has_icon, width, height, font_px) → 시그니처"""
+    _, _, text, is_button, has_icon, width, height, font_px = member
+    return _digest([list(key), text, bool(is_button), bool(has_icon), width, height, font_px])
+
+
+def detection_to_json(detection):
+    return {
+        "boxes": np.asarray(detection["boxes"]).tolist(),
+        "scores": np.asarray(detection["scores"]).tolist(),
+        "labels": np.asarray(detection["labels"]).tolist(),
+        "button_count": int(detection["button_count"])
+    }
+
+
+def detection_from_json(data):
+    return {
+        "boxes": np.asarray(data["boxes"], dtype=np.float32).reshape(-1, 4),
+        "scores": np.asarray(data["scores"], dtype=np.float32),
+        "labels": np.asarray(data["labels"], dtype=np.int64),
+        "button_count": data["button_count"]
+    }
+
+
+def build_snapshot(url, style_groups, known_contrasts, region_detections, model_version, previous=None):
+    """현재 분석 상태 → 저장용 스냅샷 (영역 탐지를 건너뛴 실행이면 이전 영역 결과를 유지)"""
+    elements, groups = [], {}
+    for key, members in style_groups.items():
+        signatures = sorted(member_signature(key, m) for m in members)
+        elements.extend(signatures)
+        ratio = known_contrasts.get(key)
+        groups[json.dumps(list(key), ensure_ascii=False)] = {
+            "members": _digest(signatures),
+            "count": len(signatures),
+            "contrast": None if ratio is None or np.isnan(ratio) else ratio
+        }
+
+    if region_detections is not None:
+        regions = {h: detection_to_json(d) for h, d in region_detections.items()}
+    elif previous and previous.get("model_version") == model_version:
+        regions = previous.get("regions", {})
+    else:
+        regions = {}
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "url": url,
+        "created_at": time.time(),
+        "model_version": model_version,
+        "elements": elements,
+        "groups": groups,
+        "regions": regions
+    }
+
+
+def known_contrasts_from(snapshot):
+    """스냅샷의 그룹별 명암비 → WebAnalyzer.known_contrasts 형태 (파싱 실패는 NaN)"""
+    if not snapshot:
+        return {}
+    return {tuple(json.loads(group_id)): (float("nan") if g["contrast"] is None else g["contrast"])
+            for group_id, g in snapshot.get("groups", {}).items()}
+
+
+def region_cache_from(snapshot, model_version):
+    """모델이 같을 때만 영역 탐지 결과를 재사용한다"""
+    if not snapshot or snapshot.get("model_version") != model_version:
+        return {}
+    return {h: detection_from_json(d) for h, d in snapshot.get("regions", {}).items()}
+
+
+def diff_report(previous, current, region_stats):
+    """결과 JSON 의 'incremental' 항목: 무엇을 재사용했고 무엇이 바뀌었는지"""
+    prev_elements = Counter(previous["elements"]) if previous else Counter()
+    cur_elements = Counter(current["elements"])
+    same_elements = sum((prev_elements & cur_elements).values())
+
+    prev_groups = previous["groups"] if previous else {}
+    cur_groups = current["groups"]
+    unchanged = sum(1 for g, v in cur_groups.items() if g in prev_groups and prev_groups[g]["members"] == v["members"])
+    changed = sum(1 for g, v in cur_groups.items() if g in prev_groups and prev_groups[g]["members"] != v["members"])
+
+    return {
+        "baseline": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(previous["created_at"])) if previous else None,
+        "elements": {
+            "total": len(current["elements"]),
+            "unchanged": same_elements,
+            "added": len(current["elements"]) - same_elements,
+            "removed": sum(prev_elements.values()) - same_elements
+        },
+        "style_groups": {
+            "total": len(cur_groups),
+            "unchanged": unchanged,
+            "changed": changed,
+            "added": len(cur_groups) - unchanged - changed,
+            "removed": sum(1 for g in prev_groups if g not in cur_groups),
+            "contrast_reused": unchanged + changed,
+            "contrast_computed": len(cur_groups) - unchanged - changed
+        },
+        # 결과 캐시로 탐지 자체를 건너뛴 경우 None
+        "regions": region_stats
+    }
+
+
+class SnapshotStore:
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, website_id):
+        # 문자 치환은 "a/b", "a.b", "a_b" 가 같은 파일이 되므로 해시로 키를 만든다
+        digest = hashlib.sha1(str(website_id).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"website_{digest}.json")
+
+    def load(self, website_id):
+        try:
+            with open(self._path(website_id), "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return snapshot if snapshot.get("version") == SNAPSHOT_VERSION else None
+
+    def save(self, website_id, snapshot):
+        path = self._path(website_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
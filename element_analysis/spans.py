@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+단계별 타이밍 span
+
+    from spans import span
+    with span("dom_collection", stage=True) as s:
+        ...
+        s.set(elements=len(records))
+
+- span 마다 wall 시간, CPU 시간(프로세스 전체, torch 스레드 포함), WebDriver 왕복 수, 요소 수 등을 기록한다.
+- 활성 Tracer 가 없으면 아무것도 기록하지 않는다 (단독으로 쓰는 WebAnalyzer/UIAnalyzer 도 그대로 동작).
+- stage=True 인 span 은 결과 JSON timings.stages 로 요약되어 app 의 /metrics 히스토그램에 들어간다.
+- Chrome trace-event 형식(chrome://tracing, Perfetto)으로도 저장할 수 있다.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+TRACE_DIR = os.environ.get("TRACE_DIR") or None  # 지정하면 작업마다 <task_id>.trace.json 저장
+
+
+class Span:
+    __slots__ = ("name", "start", "wall", "cpu", "round_trips", "depth", "stage", "thread", "attrs",
+                 "_cpu_start", "_trips_start")
+
+    def __init__(self, name, start, depth, stage, attrs):
+        self.name = name
+        self.start = start
+        self.wall = None
+        self.cpu = None
+        self.round_trips = None
+        self.depth = depth
+        self.stage = stage
+        self.thread = threading.get_ident()
+        self.attrs = dict(attrs)
+        self._cpu_start = None
+        self._trips_start = None
+
+    def set(self, **attrs):
+        """요소 수 같은 부가 정보 기록"""
+        self.attrs.update(attrs)
+
+    def to_dict(self, origin):
+        data = {
+            "name": self.name,
+            "start": round(self.start - origin, 4),
+            "wall": round(self.wall, 4) if self.wall is not None else None,
+            "cpu": round(self.cpu, 4) if self.cpu is not None else None,
+            "depth": self.depth
+        }
+        if self.round_trips is not None:
+            data["round_trips"] = self.round_trips
+        if self.attrs:
+            data["attrs"] = self.attrs
+        return data
+
+
+class _NullSpan:
+    def set(self, **attrs):
+        pass
+
+
+class Tracer:
+    def __init__(self, round_trips=None):
+        """round_trips: 현재 누적 WebDriver 왕복 수를 돌려주는 함수 (없으면 기록 안 함)"""
+        self.round_trips = round_trips
+        self.origin = time.perf_counter()
+        self.spans = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _depth(self):
+        return getattr(self._local, "depth", 0)
+
+    def _round_trips(self):
+        if self.round_trips is None:
+            return None
+        try:
+            return self.round_trips()
+        except Exception:
+            return None
+
+    def begin(self, name, stage=False, **attrs):
+        """with 로 감싸기 어려운 긴 구간용. 돌려받은 Span 을 end() 에 넘긴다"""
+        depth = self._depth()
+        record = Span(name, time.perf_counter(), depth, stage, attrs)
+        with self._lock:
+            self.spans.append(record)  # 시작 순서대로
+        record._cpu_start = time.process_time()
+        record._trips_start = self._round_trips()
+        self._local.depth = depth + 1
+        return record
+
+    def end(self, record):
+        self._local.depth = record.depth
+        record.wall = time.perf_counter() - record.start
+        record.cpu = time.process_time() - record._cpu_start
+        trips_end = self._round_trips()
+        if record._trips_start is not None and trips_end is not None:
+            record.round_trips = trips_end - record._trips_start
+
+    @contextlib.contextmanager
+    def span(self, name, stage=False, **attrs):
+        record = self.begin(name, stage, **attrs)
+        try:
+            yield record
+        finally:
+            self.end(record)
+
+    def add(self, name, wall, stage=False, start=None, **attrs):
+        """
+        다른 스레드에서 잰 구간(예: 백그라운드 업로드)을 추가.
+        start 는 time.perf_counter() 기준 시작 시각, 없으면 지금 끝난 것으로 본다.
+        """
+        start = time.perf_counter() - wall if start is None else start
+        record = Span(name, start, self._depth(), stage, attrs)
+        record.wall = wall
+        with self._lock:
+            self.spans.append(record)
+        return record
+
+    def stages(self):
+        """stage=True span 의 이름별 합계(초)"""
+        totals = {}
+        for record in self.spans:
+            if record.stage and record.wall is not None:
+                totals[record.name] = totals.get(record.name, 0.0) + record.wall
+        return {name: round(seconds, 4) for name, seconds in totals.items()}
+
+    def to_dict(self):
+        return {
+            "stages": self.stages(),
+            "spans": [record.to_dict(self.origin) for record in self.spans if record.wall is not None]
+        }
+
+    def write_chrome_trace(self, path, process_name="analysis"):
+        """chrome://tracing / Perfetto 에서 열 수 있는 trace-event JSON"""
+        events = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": process_name}}]
+        for record in self.spans:
+            if record.wall is None:
+                continue
+            args = dict(record.attrs, cpu_ms=round(record.cpu * 1000, 2) if record.cpu is not None else None)
+            if record.round_trips is not None:
+                args["round_trips"] = record.round_trips
+            events.append({
+                "name": record.name,
+                "cat": "stage" if record.stage else "span",
+                "ph": "X",
+                "ts": round((record.start - self.origin) * 1e6, 1),
+                "dur": round(record.wall * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": record.thread,
+                "args": args
+            })
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        return path
+
+
+_active = None
+
+
+def install(tracer):
+    """tracer 를 활성화하고 이전 tracer 를 돌려준다 (try/finally 로 되돌릴 때)"""
+    global _active
+    previous, _active = _active, tracer
+    return previous
+
+
+@contextlib.contextmanager
+def activate(tracer):
+    """이 블록 안의 span() 호출을 tracer 에 기록"""
+    previous = install(tracer)
+    try:
+        yield tracer
+    finally:
+        install(previous)
+
+
+@contextlib.contextmanager
+def span(name, stage=False, **attrs):
+    tracer = _active
+    if tracer is None:
+        yield _NullSpan()
+        return
+    with tracer.span(name, stage=stage, **attrs) as record:
+        yield record
+
+
+def current():
+    return _active
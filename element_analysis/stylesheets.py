@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+스타일시트 수집 단계
+
+브라우저가 이미 받아 둔 CSS 를 다시 내려받지 않도록 다음 순서로 채운다.
+  1. CDP Network.getResponseBody (서버가 보낸 원문 그대로, performance 로그의 requestId 사용)
+  2. 페이지 안에서 link.sheet.cssRules 직렬화 (응답 버퍼에서 밀려난 동일 출처/CORS 허용 시트)
+     - 브라우저가 다시 직렬화한 문자열이라 원문과 다르다 (주석/공백/알 수 없는 속성 누락)
+  3. 그래도 없는 것만 HTTP 로 병렬 다운로드 (동시성/전체 시간 예산/파일 크기 상한)
+"""
+import base64
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+STYLESHEET_FETCH_WORKERS = int(os.environ.get("STYLESHEET_FETCH_WORKERS", 4))
+STYLESHEET_TIME_BUDGET = float(os.environ.get("STYLESHEET_TIME_BUDGET", 8.0))   # 폴백 다운로드 전체 예산(초)
+STYLESHEET_TIMEOUT = float(os.environ.get("STYLESHEET_TIMEOUT", 6.0))           # 파일당 타임아웃(초)
+STYLESHEET_MAX_BYTES = int(os.environ.get("STYLESHEET_MAX_BYTES", 2 * 1024 * 1024))
+
+READ_STYLESHEETS_JS = r"""
+return Array.from(document.querySelectorAll('link[rel="stylesheet"]'))
+    .filter(link => link.href)
+    .map(link => {
+        let text = null;
+        try {
+            // 교차 출처 시트는 cssRules 접근 시 SecurityError → null 로 남겨 HTTP 로 채운다
+            if (link.sheet) text = Array.from(link.sheet.cssRules).map(r => r.cssText).join('\n');
+        } catch (e) {}
+        return {href: link.href, text};
+    });
+"""
+
+
+def read_from_page(driver):
+    """[{href, text|None}] (문서 순서, text 는 cssRules 직렬화)"""
+    return driver.execute_script(READ_STYLESHEETS_JS) or []
+
+
+def read_from_network(driver, hrefs):
+    """performance 로그에서 스타일시트 응답의 requestId 를 찾아 CDP 로 본문을 읽는다"""
+    wanted = set(hrefs)
+    request_ids = {}
+    try:
+        entries = driver.get_log("performance")
+    except Exception as e:
+        print(f"performance 로그 조회 실패: {e}")
+        return {}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method") != "Network.responseReceived":
+            continue
+        params = message.get("params", {})
+        url = params.get("response", {}).get("url")
+        if url in wanted:
+            request_ids[url] = params.get("requestId")
+
+    bodies = {}
+    for url, request_id in request_ids.items():
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception:
+            continue  # 버퍼에서 밀려났거나 캐시 응답인 경우
+        text = body.get("body", "")
+        if body.get("base64Encoded"):
+            text = base64.b64decode(text).decode("utf-8", errors="replace")
+        bodies[url] = text
+    return bodies
+
+
+def _fetch_one(session, url, deadline, timeout, max_bytes):
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("시간 예산 초과")
+    with session.get(url, timeout=min(timeout, remaining), stream=True) as resp:
+        resp.raise_for_status()
+        chunks, size = [], 0
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                print(f"CSS 크기 상한({max_bytes} bytes) 도달, 잘라서 저장: {url}")
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError("시간 예산 초과")
+        # requests 는 charset 없는 text/css 를 ISO-8859-1 로 보므로 헤더에 명시된 경우만 따른다
+        charset = resp.headers.get("Content-Type", "").partition("charset=")[2].split(";")[0].strip(' "')
+        return b"".join(chunks)[:max_bytes].decode(charset or "utf-8", errors="replace")
+
+
+def fetch_stylesheets(urls, workers=STYLESHEET_FETCH_WORKERS, budget=STYLESHEET_TIME_BUDGET,
+                      timeout=STYLESHEET_TIMEOUT, max_bytes=STYLESHEET_MAX_BYTES):
+    """동시성 제한 + 전체 시간 예산 안에서 내려받은 것만 {url: text} 로 반환"""
+    if not urls:
+        return {}
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    deadline = time.monotonic() + budget
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = {executor.submit(_fetch_one, session, url, deadline, timeout, max_bytes): url for url in urls}
+    done, not_done = wait(futures, timeout=budget)
+    # 예산을 넘긴 다운로드는 기다리지 않는다 (진행 중인 요청은 각자의 타임아웃으로 끝남)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    texts = {}
+    for future in done:
+        url = futures[future]
+        try:
+            texts[url] = future.result()
+        except Exception as e:
+            print(f"CSS 다운로드 실패: {url} ({e})")
+    for future in not_done:
+        print(f"CSS 다운로드 시간 예산 초과: {futures[future]}")
+    return texts
+
+
+def collect_stylesheets(driver, output_dir):
+    """
+    style_N.css (N = 문서 내 link 순서, 1부터) 를 저장하고
+    [(href, text|None, source)] 를 반환한다. source: page | cdp | http | None
+    """
+    sheets = read_from_page(driver)
+    results = [[s["href"], None, None] for s in sheets]
+
+    # 원문은 응답 본문에서 먼저 찾는다 (performance 로그도 여기서 비워 풀에서 재사용되는 세션에 쌓이지 않게 한다)
+    bodies = read_from_network(driver, [r[0] for r in results])
+    for r, sheet in zip(results, sheets):
+        if r[0] in bodies:
+            r[1], r[2] = bodies[r[0]], "cdp"
+        elif sheet.get("text") is not None:
+            r[1], r[2] = sheet["text"], "page"
+
+    missing = list(dict.fromkeys(r[0] for r in results if r[1] is None))
+    if missing:
+        fetched = fetch_stylesheets(missing)
+        for r in results:
+            if r[1] is None and r[0] in fetched:
+                r[1], r[2] = fetched[r[0]], "http"
+
+    for i, (href, text, source) in enumerate(results):
+        if text is None:
+            print(f"CSS {i+1} 수집 실패: {href}")
+            continue
+        with open(os.path.join(output_dir, f"style_{i+1}.css"), "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        print(f"CSS {i+1} 저장 완료 ({source})")
+    return [tuple(r) for r in results]
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+탐지 결과 이미지 업로드 (백그라운드)
+
+- boto3 클라이언트는 업로더(워커 수명)당 1개만 만들어 재사용한다.
+- 업로드는 스레드 풀에서 돌고, run_analysis 는 점수 계산/결과 구성과 겹쳐 진행한 뒤
+  결과 JSON 을 만들기 직전에만 Future 를 기다린다.
+- ARTIFACT_FORMATS 의 첫 형식(기본 png)이 s3_url 이 되고, 나머지는 analysis_info.artifacts 에 들어간다.
+  webp/jpeg 는 렌더링된 이미지를 메모리에서 바로 인코딩한다 (PNG 재디코딩 없음).
+- WebP 는 가로/세로 16383px 까지만 인코딩된다. 그보다 긴 페이지는 webp 대신 jpeg 로 올린다.
+- 형식 하나가 실패해도 나머지 형식은 올린다 (모두 실패했을 때만 업로드 실패).
+- 큰 이미지는 TransferConfig 기준으로 멀티파트 업로드된다.
+- S3_ENDPOINT_URL 을 주면 로컬 S3 호환 서버(moto, MinIO 등)로 보낼 수 있다.
+"""
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+S3_BUCKET = os.environ.get("S3_BUCKET", "s3-bucket-934029856517-20251029")
+S3_REGION = os.environ.get("S3_REGION", "ap-northeast-2")
+S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL") or None
+S3_PUBLIC_BASE_URL = os.environ.get("S3_PUBLIC_BASE_URL") or None
+ARTIFACT_FORMATS = [f.strip() for f in os.environ.get("ARTIFACT_FORMATS", "png,webp").split(",") if f.strip()]
+ARTIFACT_QUALITY = int(os.environ.get("ARTIFACT_QUALITY", 80))
+UPLOAD_WORKERS = int(os.environ.get("UPLOAD_WORKERS", 2))
+UPLOAD_TIMEOUT = float(os.environ.get("UPLOAD_TIMEOUT", 120))
+MULTIPART_THRESHOLD = int(os.environ.get("MULTIPART_THRESHOLD", 8 * 1024 * 1024))
+
+CONTENT_TYPES = {"png": "image/png", "webp": "image/webp", "jpeg": "image/jpeg"}
+EXTENSIONS = {"png": "png", "webp": "webp", "jpeg": "jpg"}
+WEBP_MAX_DIMENSION = 16383  # libwebp 한계 (가로/세로 각각)
+JPEG_MAX_DIMENSION = 65535
+
+
+def fallback_format(image, fmt):
+    """이미지 크기 때문에 fmt 로 인코딩할 수 없으면 대신 쓸 형식 (webp → jpeg → png)"""
+    if fmt == "webp" and max(image.size) > WEBP_MAX_DIMENSION:
+        fmt = "jpeg"
+    if fmt == "jpeg" and max(image.size) > JPEG_MAX_DIMENSION:
+        fmt = "png"
+    return fmt
+
+
+def encode_image(image, fmt, quality=ARTIFACT_QUALITY):
+    """PIL 이미지를 형식별 바이트로 인코딩 (크기 제한을 넘는 형식은 encodable 한 형식으로 바꾼 뒤 호출)"""
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        image.save(buffer, format="WEBP", quality=quality, method=4)
+    elif fmt == "jpeg":
+        image.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True)
+    else:
+        image.save(buffer, format="PNG", compress_level=6)
+    return buffer.getvalue()
+
+
+class ArtifactUploader:
+    def __init__(self, bucket=S3_BUCKET, region=S3_REGION, endpoint_url=S3_ENDPOINT_URL,
+                 formats=None, quality=ARTIFACT_QUALITY, workers=UPLOAD_WORKERS):
+        self.bucket = bucket
+        self.region = region
+        self.endpoint_url = endpoint_url
+        self.formats = [f for f in (formats or ARTIFACT_FORMATS) if f in CONTENT_TYPES] or ["png"]
+        self.quality = quality
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifact-upload")
+        self._client = None
+        self._transfer_config = None
+        self._lock = threading.Lock()
+
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                import boto3
+                from boto3.s3.transfer import TransferConfig
+                self._client = boto3.client("s3", region_name=self.region, endpoint_url=self.endpoint_url)
+                self._transfer_config = TransferConfig(
+                    multipart_threshold=MULTIPART_THRESHOLD,
+                    multipart_chunksize=MULTIPART_THRESHOLD,
+                    max_concurrency=4
+                )
+            return self._client
+
+    def url_for(self, key):
+        if S3_PUBLIC_BASE_URL:
+            return f"{S3_PUBLIC_BASE_URL.rstrip('/')}/{key}"
+        if self.endpoint_url:
+            return f"{self.endpoint_url.rstrip('/')}/{self.bucket}/{key}"
+        return f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
+
+    def submit(self, key_prefix, path=None, image=None):
+        """
+        업로드를 예약하고 Future 를 돌려준다.
+        path 의 PNG 는 여기서 바로 읽어 둔다 (업로드가 늦어지면 다음 작업이 같은 파일을 덮어쓸 수 있다).
+        결과: {"url": 첫 형식 URL, "artifacts": {형식: URL}, "bytes": {형식: 크기},
+               "seconds": 소요, "started": 시작 시각(time.perf_counter)}
+        """
+        png_bytes = None
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                png_bytes = f.read()
+        return self._executor.submit(self._upload, key_prefix, png_bytes, image)
+
+    def _upload(self, key_prefix, png_bytes, image):
+        started = time.perf_counter()
+        client = self.client()
+        artifacts, sizes, errors = {}, {}, {}
+        for requested in self.formats:
+            fmt = requested
+            try:
+                if fmt != "png" or png_bytes is None:
+                    if image is None:
+                        from PIL import Image
+                        image = Image.open(io.BytesIO(png_bytes))
+                    fmt = fallback_format(image, requested)
+                if fmt in artifacts:  # 대체 형식이 이미 올라감
+                    artifacts[requested] = artifacts[fmt]
+                    continue
+                if fmt == "png" and png_bytes is not None:
+                    body = png_bytes
+                else:
+                    body = encode_image(image, fmt, self.quality)
+                key = f"{key_prefix}.{EXTENSIONS[fmt]}"
+                client.upload_fileobj(io.BytesIO(body), self.bucket, key,
+                                      ExtraArgs={"ContentType": CONTENT_TYPES[fmt]},
+                                      Config=self._transfer_config)
+            except Exception as e:
+                print(f"[ERROR] {requested} 업로드 실패: {e}")
+                errors[requested] = str(e)
+                continue
+            if fmt != requested:
+                print(f"[INFO] {image.size[0]}x{image.size[1]} 이미지는 {requested} 로 인코딩할 수 없어 {fmt} 로 업로드")
+            artifacts[fmt] = self.url_for(key)
+            artifacts[requested] = artifacts[fmt]
+            sizes[fmt] = len(body)
+        if not sizes:
+            raise RuntimeError(f"모든 형식 업로드 실패: {errors}")
+        return {
+            # 첫 형식이 실패했으면 올라간 형식 중 요청 순서상 첫 번째
+            "url": next(artifacts[f] for f in self.formats if f in artifacts),
+            "artifacts": artifacts,
+            "bytes": sizes,
+            "errors": errors,
+            "seconds": round(time.perf_counter() - started, 3),
+            "started": started
+        }
+
+    @staticmethod
+    def resolve(future, timeout=UPLOAD_TIMEOUT):
+        """Future 결과를 기다린다. 실패/시간 초과면 None"""
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            print(f"[ERROR] S3 업로드 실패: {e}")
+            return None
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,256 @@
+import collections
+import os
+import queue
+import threading
+import time
+
+# =====================================================
+# 작업 로그 조회 (/logs/<task_id>)
+# -----------------------------------------------------
+# - 파일 전체를 읽지 않고 오프셋 구간만 블록 단위로 읽는다 (Range, offset/length, tail=N)
+# - follow 모드: 작업(로그 파일)마다 폴링 스레드 하나가 새로 쓰인 바이트를 한 번만 읽어
+#   구독자마다 크기 제한 큐로 나눠 준다. 구독자가 많아도 디스크 읽기/버퍼가 늘지 않는다.
+# - 느린 구독자의 큐가 차면 큐를 비우고 자기 오프셋부터 파일에서 다시 읽어 따라잡는다
+#   (연결당 메모리는 큐 크기 × 블록 크기로 제한)
+# =====================================================
+
+BLOCK_SIZE = 64 * 1024
+
+
+def iter_range(path, start, end, block_size=BLOCK_SIZE):
+    """[start, end) 구간을 블록 단위로 읽는다"""
+    if end <= start:
+        return
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = f.read(min(block_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def parse_range(header, size):
+    """
+    Range 헤더(bytes=a-b, bytes=a-, bytes=-n) → (start, end) 반개구간.
+    헤더가 없거나 형식이 다르면 None, 만족할 수 없는 범위면 ValueError
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if not first:  # 끝에서 n 바이트
+            suffix = int(last)
+            if suffix <= 0:
+                raise ValueError(header)
+            return max(0, size - suffix), size
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    except ValueError:
+        raise ValueError(header)
+    if start >= size or end <= start:
+        raise ValueError(header)
+    return start, end
+
+
+def tail_offset(path, lines, block_size=BLOCK_SIZE):
+    """마지막 lines 줄이 시작하는 오프셋 — 파일 끝에서부터 블록 단위로 거꾸로 읽는다"""
+    if lines <= 0:
+        return os.path.getsize(path)
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return 0
+        f.seek(end - 1)
+        limit = end - 1 if f.read(1) == b"\n" else end  # 마지막 줄바꿈은 새 줄의 시작이 아니다
+        found, pos = 0, limit
+        while pos > 0:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            data = f.read(size)
+            idx = len(data)
+            while True:
+                idx = data.rfind(b"\n", 0, idx)
+                if idx < 0:
+                    break
+                found += 1
+                if found == lines:
+                    return pos + idx + 1
+        return 0
+
+
+class _Subscriber:
+    def __init__(self, offset, max_chunks):
+        self.offset = offset  # 구독자에게 넘겨준 마지막 바이트 다음 위치
+        self.queue = queue.Queue(maxsize=max_chunks)
+        self.lagged = False
+
+
+class _Tail:
+    """로그 파일 하나를 폴링하는 스레드와 그 구독자들"""
+
+    def __init__(self, follower, task_id, path):
+        self.follower = follower
+        self.task_id = task_id
+        self.path = path
+        self.position = os.path.getsize(path) if os.path.exists(path) else 0
+        self.finished = False
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name=f"log-follow-{task_id}", daemon=True)
+
+    def _publish(self, item):
+        for sub in self.subscribers:
+            if sub.lagged:
+                continue
+            try:
+                sub.queue.put_nowait(item)
+            except queue.Full:
+                sub.lagged = True
+
+    def _run(self):
+        while True:
+            with self.lock:
+                if not self.subscribers:
+                    self.follower._drop(self)
+                    return
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = self.position
+            if size > self.position:
+                for data in iter_range(self.path, self.position, size):
+                    with self.lock:
+                        self._publish((self.position, data))
+                        self.position += len(data)
+            elif self.finished:
+                with self.lock:
+                    self._publish(None)  # 끝 표시
+                    self.follower._drop(self)
+                return
+            time.sleep(self.follower.poll_interval)
+
+
+class LogFollower:
+    def __init__(self, poll_interval=0.25, max_chunks=256, keepalive=15.0, max_finished=10000):
+        self.poll_interval = poll_interval
+        self.max_chunks = max_chunks
+        self.keepalive = keepalive
+        self._tails = {}
+        self._finished = collections.OrderedDict()  # 최근 끝난 작업 (늦게 붙은 구독자용)
+        self._max_finished = max_finished
+        self._lock = threading.Lock()
+
+    def finish(self, task_id):
+        """작업이 끝나 로그가 더 늘지 않음을 알린다. 구독자는 남은 내용을 받은 뒤 종료된다"""
+        with self._lock:
+            self._finished[task_id] = True
+            self._finished.move_to_end(task_id)
+            while len(self._finished) > self._max_finished:
+                self._finished.popitem(last=False)
+            tail = self._tails.get(task_id)
+        if tail:
+            tail.finished = True
+
+    def is_finished(self, task_id):
+        with self._lock:
+            return task_id in self._finished
+
+    def subscribers(self):
+        with self._lock:
+            tails = list(self._tails.values())
+        return sum(len(t.subscribers) for t in tails)
+
+    def _drop(self, tail):
+        with self._lock:
+            if self._tails.get(tail.task_id) is tail:
+                del self._tails[tail.task_id]
+
+    def _attach(self, task_id, path, offset):
+        while True:
+            with self._lock:
+                tail = self._tails.get(task_id)
+                created = tail is None
+                if created:
+                    tail = self._tails[task_id] = _Tail(self, task_id, path)
+                    tail.finished = task_id in self._finished
+            with tail.lock:
+                if self._tails.get(task_id) is not tail:  # 방금 종료된 tail
+                    continue
+                sub = _Subscriber(min(offset, tail.position), self.max_chunks)
+                backlog_end = tail.position
+                tail.subscribers.add(sub)
+            if created:
+                tail.thread.start()
+            return tail, sub, backlog_end
+
+    def follow(self, task_id, path, offset=0, timeout=None):
+        """
+        offset 부터 로그 바이트를 (offset, data) 로 내보낸다. 새 데이터가 keepalive 초 동안 없으면
+        (offset, b"") 를 내보내 연결 유지에 쓰게 하고, 작업이 끝나거나 timeout 이 지나면 종료한다.
+        """
+        tail, sub, backlog_end = self._attach(task_id, path, offset)
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            # 구독 전에 이미 쓰인 부분은 파일에서 직접 (블록 단위)
+            for data in iter_range(path, sub.offset, backlog_end):
+                yield sub.offset, data
+                sub.offset += len(data)
+            while deadline is None or time.monotonic() < deadline:
+                if sub.lagged:
+                    with tail.lock:
+                        while not sub.queue.empty():
+                            sub.queue.get_nowait()
+                        catch_up_end = tail.position
+                        sub.lagged = False
+                    for data in iter_range(path, sub.offset, catch_up_end):
+                        yield sub.offset, data
+                        sub.offset += len(data)
+                    if tail.finished and self._tails.get(tail.task_id) is not tail:
+                        return
+                    continue
+                try:
+                    item = sub.queue.get(timeout=self.keepalive)
+                except queue.Empty:
+                    yield sub.offset, b""
+                    continue
+                if item is None:
+                    return
+                start, data = item
+                if start + len(data) <= sub.offset:
+                    continue
+                data = data[max(0, sub.offset - start):]
+                yield sub.offset, data
+                sub.offset += len(data)
+        finally:
+            with tail.lock:
+                tail.subscribers.discard(sub)
+
+
+def sse_events(chunks, max_partial=BLOCK_SIZE):
+    """
+    follow() 출력 → Server-Sent Events. 완성된 줄만 이벤트로 보내고 id 는 다음에 이어 받을 오프셋이다
+    (재연결 시 Last-Event-ID 로 이어 받기). 줄바꿈 없이 너무 긴 조각은 그대로 내보낸다.
+    """
+    partial = b""
+    for offset, data in chunks:
+        if not data:
+            yield ": keepalive\n\n"
+            continue
+        partial += data
+        cut = partial.rfind(b"\n") + 1
+        if cut == 0 and len(partial) < max_partial:
+            continue
+        if cut == 0:
+            cut = len(partial)
+        body, partial = partial[:cut], partial[cut:]
+        next_offset = offset + len(data) - len(partial)
+        lines = body.decode("utf-8", "replace").rstrip("\n").split("\n")
+        yield f"id: {next_offset}\n" + "".join(f"data: {line}\n" for line in lines) + "\n"
+    if partial:
+        lines = partial.decode("utf-8", "replace").split("\n")
+        yield "".join(f"data: {line}\n" for line in lines) + "\n"
+    yield "event: end\ndata: \n\n"
@@ -0,0 +1,176 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime
+
+# =====================================================
+# 콜백 결과 저장소 (SQLite, WAL)
+# -----------------------------------------------------
+# - 본문은 받은 JSON 바이트를 그대로 zlib 압축해 저장한다 (다시 파싱/직렬화하지 않음)
+# - 조회는 저장된 바이트를 그대로 돌려준다 (클라이언트가 deflate 를 받으면 압축된 채로)
+# - task_id(UNIQUE), (website_id, analysis_date, id), (analysis_date, id) 인덱스
+#   목록은 keyset 페이지네이션이라 저장 건수가 늘어도 페이지 비용이 같다
+# - 콜백 재시도로 같은 task_id 가 다시 오면 덮어쓴다
+# =====================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL UNIQUE,
+    website_id TEXT,
+    url TEXT,
+    analysis_date TEXT NOT NULL,
+    final_score REAL,
+    received_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_website ON results (website_id, analysis_date, id);
+CREATE INDEX IF NOT EXISTS results_date ON results (analysis_date, id);
+"""
+
+UPSERT = """
+INSERT INTO results (task_id, website_id, url, analysis_date, final_score, received_at, size, payload)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(task_id) DO UPDATE SET
+    website_id = excluded.website_id, url = excluded.url, analysis_date = excluded.analysis_date,
+    final_score = excluded.final_score, received_at = excluded.received_at,
+    size = excluded.size, payload = excluded.payload
+"""
+
+SUMMARY_COLUMNS = "id, task_id, website_id, url, analysis_date, final_score, received_at, size"
+COMPRESS_LEVEL = 6
+MAX_PAGE_SIZE = 500
+
+
+def summarize(data):
+    """콜백 본문 → 인덱스용 필드 (website_id, url, analysis_date, final_score)"""
+    results = data.get("results") or {}
+    info = results.get("analysis_info") or {}
+    summary = results.get("summary") or {}
+    website_id = info.get("website_id")
+    return (
+        None if website_id is None else str(website_id),
+        info.get("url"),
+        info.get("analysis_date") or datetime.now().isoformat(),
+        summary.get("final_score")
+    )
+
+
+class ResultStore:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()  # 스레드마다 연결 하나 (Flask threaded)
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)  # autocommit, 필요할 때만 BEGIN
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # WAL 에서는 커밋마다 fsync 하지 않아도 손상되지 않는다
+            self._local.conn = conn
+        return conn
+
+    # ---------------- 쓰기 ----------------
+    def put(self, task_id, body, data=None):
+        """body: 받은 JSON 바이트, data: 이미 파싱한 dict (없으면 파싱)"""
+        if data is None:
+            data = json.loads(body)
+        self.put_many([(task_id, body, data)])
+
+    def put_many(self, items):
+        """[(task_id, body, data)] 를 한 트랜잭션으로"""
+        now = time.time()
+        rows = [(task_id, *summarize(data), now, len(body), zlib.compress(body, COMPRESS_LEVEL))
+                for task_id, body, data in items]
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(UPSERT, rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ---------------- 읽기 ----------------
+    def get_compressed(self, task_id):
+        """저장된 zlib 바이트 (HTTP Content-Encoding: deflate 로 그대로 보낼 수 있다)"""
+        row = self._connect().execute("SELECT payload FROM results WHERE task_id = ?", (task_id,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, task_id):
+        payload = self.get_compressed(task_id)
+        return zlib.decompress(payload) if payload is not None else None
+
+    def query(self, website_id=None, since=None, until=None, limit=50, cursor=None):
+        """
+        analysis_date 내림차순 목록. cursor 는 직전 페이지의 next_cursor ("<analysis_date>|<id>").
+        반환: (요약 목록, next_cursor 또는 None)
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        where, params = [], []
+        if website_id is not None:
+            where.append("website_id = ?"); params.append(str(website_id))
+        if since:
+            where.append("analysis_date >= ?"); params.append(since)
+        if until:
+            where.append("analysis_date < ?"); params.append(until)
+        if cursor:
+            date, _, last_id = cursor.rpartition("|")
+            where.append("(analysis_date, id) < (?, ?)"); params.extend([date, int(last_id)])
+        sql = f"SELECT {SUMMARY_COLUMNS} FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY analysis_date DESC, id DESC LIMIT ?"
+        rows = self._connect().execute(sql, params + [limit + 1]).fetchall()
+        items = [{
+            "task_id": row[1],
+            "website_id": row[2],
+            "url": row[3],
+            "analysis_date": row[4],
+            "final_score": row[5],
+            "received_at": datetime.fromtimestamp(row[6]).isoformat(),
+            "size": row[7]
+        } for row in rows[:limit]]
+        next_cursor = f"{rows[limit - 1][4]}|{rows[limit - 1][0]}" if len(rows) > limit else None
+        return items, next_cursor
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    # ---------------- 이전 형식 가져오기 ----------------
+    def import_directory(self, directory, batch_size=500):
+        """callback_results/<task_id>.json (indent=2) 파일들을 저장소로 옮긴다 (파일은 그대로 둔다)"""
+        imported, batch = 0, []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(directory, name), "rb") as f:
+                    data = json.loads(f.read())
+            except (OSError, ValueError) as e:
+                print(f"[WARN] {name} 건너뜀: {e}")
+                continue
+            body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            batch.append((data.get("task_id") or name[:-len(".json")], body, data))
+            if len(batch) >= batch_size:
+                self.put_many(batch); imported += len(batch); batch = []
+        if batch:
+            self.put_many(batch); imported += len(batch)
+        return imported
+
+
+if __name__ == "__main__":
+    # python result_store.py import callback_results [callback_results/results.sqlite3]
+    if len(sys.argv) < 3 or sys.argv[1] != "import":
+        print("usage: python result_store.py import <json 디렉토리> [db 경로]")
+        sys.exit(1)
+    directory = sys.argv[2]
+    db_path = sys.argv[3] if len(sys.argv) > 3 else os.path.join(directory, "results.sqlite3")
+    print(f"{ResultStore(db_path).import_directory(directory)}건 가져옴 → {db_path}")
@@ -0,0 +1,20 @@
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# app 쪽 모듈(worker_pool, log_stream ...)은 저장소 루트, 분석 모듈은 element_analysis 를 기준으로 import 한다
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "element_analysis"))
+
+FAKE_WORKER = os.path.join(ROOT, "benchmarks", "fake_worker.py")
+
+
+def wait_until(predicate, timeout=10.0, interval=0.01):
+    """predicate 가 참이 될 때까지 기다린다 (시간 초과면 False)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
@@ -0,0 +1,74 @@
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("numpy")
+
+import browser_pool  # noqa: E402  (crawl 을 import 하므로 selenium/numpy 가 있을 때만)
+from browser_pool import BrowserPool  # noqa: E402
+
+
+class FakeDriver:
+    def __init__(self, failing):
+        self.failing = failing
+        self.current_window_handle = "home"
+
+    def execute_cdp_cmd(self, cmd, params):
+        if self.failing:
+            raise RuntimeError("target crashed")
+        return {"browserContextId": "ctx", "targetId": "tab"}
+
+
+class FakeHandle:
+    """_open_context 가 처음 fail_first 개의 드라이버에서 실패하도록 만든다"""
+    created = []
+    fail_first = 0
+
+    def __init__(self, work_dir):
+        FakeHandle.created.append(self)
+        self.driver = FakeDriver(failing=len(FakeHandle.created) <= FakeHandle.fail_first)
+        self.home_handle = "home"
+        self.uses = 0
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    FakeHandle.created = []
+    monkeypatch.setattr(browser_pool, "_DriverHandle", FakeHandle)
+    monkeypatch.setattr(BrowserPool, "_open_context", fake_open_context)
+    pool = BrowserPool(size=1, work_dir=str(tmp_path))
+    yield pool
+    pool.close()
+
+
+def fake_open_context(self, handle):
+    # switch_to / CDP 차단 규칙 없이 컨텍스트 생성 실패만 흉내 낸다
+    handle.driver.execute_cdp_cmd("Target.createBrowserContext", {})
+    handle.uses += 1
+    return browser_pool.BrowserLease(self, handle, "ctx", "tab")
+
+
+def test_failed_retry_discards_the_replacement_driver(pool):
+    FakeHandle.fail_first = 2
+    with pytest.raises(RuntimeError):
+        pool.acquire(timeout=0.1)
+
+    assert len(FakeHandle.created) == 2
+    assert all(handle.quit_called for handle in FakeHandle.created)
+    assert pool._created == 0
+
+    # 슬롯이 반환되었으므로 다음 acquire 는 막히지 않고 새 드라이버를 띄운다
+    lease = pool.acquire(timeout=0.1)
+    assert lease.handle is FakeHandle.created[2] and not lease.handle.quit_called
+    assert pool._created == 1
+
+
+def test_first_failure_is_replaced_once(pool):
+    FakeHandle.fail_first = 1
+    lease = pool.acquire(timeout=0.1)
+    assert FakeHandle.created[0].quit_called
+    assert lease.handle is FakeHandle.created[1]
+    assert pool._created == 1
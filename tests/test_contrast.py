@@ -0,0 +1,85 @@
+import random
+import re
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import contrast  # noqa: E402  (numpy 가 있을 때만)
+from contrast import contrast_ratio, contrast_ratios, parse_color  # noqa: E402
+
+
+def legacy_luminance(rgb):
+    r, g, b = [x / 255.0 for x in rgb]
+    def ch(c): return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+    return 0.2126 * ch(r) + 0.7152 * ch(g) + 0.0722 * ch(b)
+
+
+def legacy_ratio(fg, bg):
+    """이전 WebAnalyzer 방식: 정규식으로 숫자 세 개를 뽑고 알파는 무시"""
+    l1 = legacy_luminance(tuple(map(int, re.findall(r'\d+', fg)[:3])))
+    l2 = legacy_luminance(tuple(map(int, re.findall(r'\d+', bg)[:3])))
+    return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
+
+
+@pytest.mark.parametrize("css, expected", [
+    ("rgb(1, 2, 3)", (1.0, 2.0, 3.0, 1.0)),
+    ("rgba(10, 20, 30, 0.5)", (10.0, 20.0, 30.0, 0.5)),
+    ("rgb(10 20 30 / 25%)", (10.0, 20.0, 30.0, 0.25)),
+    ("RGB(100%, 0%, 0%)", (255.0, 0.0, 0.0, 1.0)),
+    ("#abc", (170.0, 187.0, 204.0, 1.0)),
+    ("#000000ff", (0.0, 0.0, 0.0, 1.0)),
+    ("color(srgb 1 0 0)", (255.0, 0.0, 0.0, 1.0)),
+    ("transparent", (0.0, 0.0, 0.0, 0.0)),
+    ("White", (255.0, 255.0, 255.0, 1.0)),
+])
+def test_parse_color(css, expected):
+    assert parse_color(css) == pytest.approx(expected)
+
+
+def test_parse_hsl():
+    assert parse_color("hsl(120, 100%, 50%)") == pytest.approx((0.0, 255.0, 0.0, 1.0))
+    assert parse_color("hsla(0deg 100% 50% / 0.5)") == pytest.approx((255.0, 0.0, 0.0, 0.5))
+
+
+@pytest.mark.parametrize("css", [None, "", "#12345", "rgb(1, 2)", "color(display-p3 1 0 0)", "not-a-color"])
+def test_unparseable_colors(css):
+    assert parse_color(css) is None
+
+
+def test_opaque_colors_match_the_legacy_calculation():
+    rng = random.Random(7)
+    palette = [f"rgb({rng.randrange(256)}, {rng.randrange(256)}, {rng.randrange(256)})" for _ in range(200)]
+    foregrounds = [rng.choice(palette) for _ in range(2000)]
+    backgrounds = [rng.choice(palette) for _ in range(2000)]
+
+    expected = [legacy_ratio(fg, bg) for fg, bg in zip(foregrounds, backgrounds)]
+    assert np.allclose(contrast_ratios(foregrounds, backgrounds), expected, rtol=0, atol=1e-12)
+    assert contrast_ratio(foregrounds[0], backgrounds[0]) == pytest.approx(expected[0])
+
+
+def test_black_on_white_is_21():
+    assert contrast_ratio("rgb(0, 0, 0)", "rgb(255, 255, 255)") == pytest.approx(21.0)
+    assert contrast_ratio("#fff", "#fff") == pytest.approx(1.0)
+
+
+def test_translucent_colors_are_composited():
+    # 투명 배경은 흰 캔버스 위에 그려진 것으로 본다 (이전 방식은 검정으로 읽었다)
+    assert contrast_ratio("rgb(0, 0, 0)", "rgba(0, 0, 0, 0)") == pytest.approx(21.0)
+    assert legacy_ratio("rgb(0, 0, 0)", "rgba(0, 0, 0, 0)") == pytest.approx(1.0)
+
+    # 반투명 글자색은 배경 위에 합성
+    gray = 255 * 0.5
+    expected_l = legacy_luminance((gray, gray, gray))
+    assert contrast_ratio("rgba(0, 0, 0, 0.5)", "rgb(255, 255, 255)") == pytest.approx(1.05 / (expected_l + 0.05))
+
+
+def test_unparseable_pairs_are_nan():
+    ratios = contrast_ratios(["rgb(0, 0, 0)", "bogus"], ["bogus", "rgb(255, 255, 255)"])
+    assert np.isnan(ratios).all()
+
+
+def test_parse_cache_is_shared():
+    contrast.parse_color.cache_clear()
+    contrast_ratios(["rgb(1, 1, 1)"] * 100, ["rgb(2, 2, 2)"] * 100)
+    assert contrast.parse_color.cache_info().misses == 2
@@ -0,0 +1,159 @@
+import os
+import sys
+
+import pytest
+
+from conftest import ROOT
+from delivery import CallbackDelivery, Outbox, is_permanent_failure
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """requests.Session 대신: 응답 코드(또는 예외)를 순서대로 돌려주고 요청을 기록한다"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+        self.closed = False
+
+    def post(self, url, json=None, timeout=None, headers=None):
+        self.calls.append({"url": url, "json": json, "headers": dict(headers or {})})
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+    def close(self):
+        self.closed = True
+
+
+def start(tmp_path, session, **kwargs):
+    delivery = CallbackDelivery(Outbox(str(tmp_path / "outbox")), base_delay=0.01, max_delay=0.02,
+                                timeout=1, **kwargs)
+    delivery._session = session
+    return delivery.start()
+
+
+def files(directory):
+    return sorted(os.listdir(directory))
+
+
+def test_delivers_and_removes_pending(tmp_path):
+    session = FakeSession(200)
+    delivery = start(tmp_path, session)
+    delivery.submit("t1", "http://backend/cb", {"task_id": "t1", "results": {}})
+    assert delivery.flush(5) == 0
+    delivery.stop(1)
+
+    call = session.calls[0]
+    assert call["url"] == "http://backend/cb" and call["json"]["task_id"] == "t1"
+    assert call["headers"]["Idempotency-Key"] == "t1"
+    assert call["headers"]["X-Delivery-Attempt"] == "1"
+    assert float(call["headers"]["X-Enqueued-At"]) > 0
+    assert files(delivery.outbox.pending_dir) == [] and files(delivery.outbox.dead_dir) == []
+    assert delivery.stats()["delivered"] == 1
+    assert session.closed
+
+
+def test_retries_transient_failures(tmp_path):
+    session = FakeSession(503, ConnectionError("refused"), 429, 204)
+    delivery = start(tmp_path, session, max_attempts=5)
+    delivery.submit("t2", "http://backend/cb", {"task_id": "t2"})
+    assert delivery.flush(5) == 0
+    delivery.stop(1)
+
+    assert [c["headers"]["X-Delivery-Attempt"] for c in session.calls] == ["1", "2", "3", "4"]
+    stats = delivery.stats()
+    assert stats["delivered"] == 1 and stats["retries"] == 3 and stats["attempts"] == 4
+    assert files(delivery.outbox.pending_dir) == []
+
+
+def test_client_errors_go_to_dead_letter_immediately(tmp_path):
+    session = FakeSession(404)
+    delivery = start(tmp_path, session, max_attempts=5)
+    delivery.submit("t3", "http://backend/cb", {"task_id": "t3"})
+    assert delivery.flush(5) == 0
+    delivery.stop(1)
+
+    assert len(session.calls) == 1
+    assert files(delivery.outbox.dead_dir) == ["t3.json"]
+    assert files(delivery.outbox.pending_dir) == []
+    assert delivery.stats()["dead"] == 1
+
+
+def test_gives_up_after_max_attempts(tmp_path):
+    session = FakeSession(500)
+    delivery = start(tmp_path, session, max_attempts=3)
+    delivery.submit("t4", "http://backend/cb", {"task_id": "t4"})
+    assert delivery.flush(5) == 0
+    delivery.stop(1)
+
+    assert len(session.calls) == 3
+    assert files(delivery.outbox.dead_dir) == ["t4.json"]
+    assert delivery.outbox.load_pending() == []
+
+
+def test_pending_entries_survive_a_restart(tmp_path):
+    # 전송 스레드 없이 기록만 된 상태 = 이전 프로세스가 보내기 전에 죽은 경우
+    outbox = Outbox(str(tmp_path / "outbox"))
+    outbox.put({"task_id": "t5", "url": "http://backend/cb", "payload": {"task_id": "t5"}, "attempts": 2,
+                "enqueued_at": 1.0, "next_attempt_at": 1.0, "last_error": "HTTP 500"})
+
+    session = FakeSession(200)
+    delivery = start(tmp_path, session)
+    assert delivery.flush(5) == 0
+    delivery.stop(1)
+
+    assert session.calls[0]["headers"]["X-Delivery-Attempt"] == "3"
+    assert files(outbox.pending_dir) == []
+
+
+def test_stop_leaves_undelivered_entries_on_disk(tmp_path):
+    session = FakeSession(500)
+    delivery = CallbackDelivery(Outbox(str(tmp_path / "outbox")), base_delay=60, max_delay=60, max_attempts=5,
+                                timeout=1)
+    delivery._session = session
+    delivery.start()
+    delivery.submit("t6", "http://backend/cb", {"task_id": "t6"})
+    assert delivery.stop(flush_timeout=0.2) == 1
+    assert files(delivery.outbox.pending_dir) == ["t6.json"]
+
+
+@pytest.mark.parametrize("status, permanent", [(400, True), (404, True), (408, False), (429, False),
+                                               (500, False), (302, False)])
+def test_is_permanent_failure(status, permanent):
+    assert is_permanent_failure(status) is permanent
+
+
+def test_cache_hit_replay_goes_through_the_app_outbox(tmp_path, monkeypatch):
+    pytest.importorskip("flask")
+    pytest.importorskip("requests")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("RESULT_CACHE_SHORTCUT", "on")
+    monkeypatch.setenv("WORKER_COMMAND", f"{sys.executable} {os.path.join(ROOT, 'benchmarks', 'fake_worker.py')}")
+    monkeypatch.setenv("WORKER_POOL_SIZE", "1")
+    for name in ("app", "element_analysis.result_cache", "element_analysis.delivery"):
+        sys.modules.pop(name, None)
+    import app as app_module
+    from element_analysis.result_cache import cache_key
+
+    try:
+        url = "https://example.com/cached"
+        app_module.result_cache.put(cache_key(url, "mobile"), "fp", {"analysis_info": {"url": url}})
+        response = app_module.app.test_client().post(
+            "/analyze", json={"url": url, "callback_url": "http://127.0.0.1:9/cb", "profiles": ["mobile"]})
+        assert response.status_code == 200
+        task_id = response.get_json()["task_id"]
+
+        # 응답 전에 outbox 에 기록되고, 그 뒤에 done 이 된다 (수신 측이 죽어 있어도 파일은 남아 재시도된다)
+        pending = os.path.join(app_module.OUTBOX_DIR, "app", "pending", f"{task_id}.json")
+        assert os.path.exists(pending)
+        assert app_module.pool.tasks.get(task_id)["status"] == "done"
+    finally:
+        app_module.replay_delivery.stop(flush_timeout=0)
+        app_module.pool.shutdown()
+        sys.modules.pop("app", None)
@@ -0,0 +1,36 @@
+import pytest
+
+from device_profiles import ANALYSIS_PROFILES, DEVICE_PROFILES, DRIVER_PROFILE, parse_profiles, profiles_key
+
+
+@pytest.mark.parametrize("value", [None, "", []])
+def test_default_profiles(value):
+    assert parse_profiles(value) == parse_profiles(ANALYSIS_PROFILES)
+
+
+def test_parse_string_and_list():
+    assert parse_profiles("mobile,desktop") == ["mobile", "desktop"]
+    assert parse_profiles(" tablet , mobile ") == ["tablet", "mobile"]
+    assert parse_profiles(["desktop", "tablet"]) == ["desktop", "tablet"]
+
+
+def test_duplicates_are_dropped_in_order():
+    assert parse_profiles("desktop,mobile,desktop,,mobile") == ["desktop", "mobile"]
+
+
+@pytest.mark.parametrize("value", ["watch", ["mobile", "tv"], ",", "Mobile"])
+def test_unknown_profiles_are_rejected(value):
+    with pytest.raises(ValueError):
+        parse_profiles(value)
+
+
+def test_profiles_key_keeps_single_mobile_key():
+    assert profiles_key([DRIVER_PROFILE]) == "mobile"
+    assert profiles_key(["mobile", "desktop"]) == "mobile+desktop"
+    assert profiles_key(["desktop", "mobile"]) != profiles_key(["mobile", "desktop"])  # 첫 프로필이 기준이라 순서가 의미 있다
+
+
+def test_profiles_have_emulation_fields():
+    for profile in DEVICE_PROFILES.values():
+        assert {"width", "height", "deviceScaleFactor", "mobile", "userAgent"} <= set(profile)
+    assert DRIVER_PROFILE in DEVICE_PROFILES
@@ -0,0 +1,180 @@
+import threading
+import time
+
+import pytest
+
+from conftest import wait_until
+from log_stream import LogFollower, iter_range, parse_range, sse_events, tail_offset
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", (0, 10)),
+    ("bytes=90-", (90, 100)),
+    ("bytes=-10", (90, 100)),
+    ("bytes=-500", (0, 100)),
+    ("bytes=50-999", (50, 100)),
+    (None, None),
+    ("", None),
+    ("items=0-9", None),
+    ("bytes=0-1,5-6", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=5-2", "bytes=-0", "bytes=a-b"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 100)
+
+
+def test_iter_range_reads_in_blocks(tmp_path):
+    path = tmp_path / "task.log"
+    content = bytes(range(256)) * 10
+    path.write_bytes(content)
+    chunks = list(iter_range(str(path), 7, 2000, block_size=64))
+    assert all(len(c) <= 64 for c in chunks)
+    assert b"".join(chunks) == content[7:2000]
+    assert list(iter_range(str(path), 10, 10)) == []
+    assert b"".join(iter_range(str(path), 2500, 9999)) == content[2500:]  # 파일 끝에서 멈춘다
+
+
+@pytest.mark.parametrize("block_size", [3, 16, 64 * 1024])
+def test_tail_offset(tmp_path, block_size):
+    path = tmp_path / "task.log"
+    lines = [f"line {i}\n".encode() for i in range(20)]
+    path.write_bytes(b"".join(lines))
+    data = path.read_bytes()
+
+    assert data[tail_offset(str(path), 3, block_size):] == b"".join(lines[-3:])
+    assert data[tail_offset(str(path), 1, block_size):] == lines[-1]
+    assert tail_offset(str(path), 100, block_size) == 0
+    assert tail_offset(str(path), 0, block_size) == len(data)
+
+    # 마지막 줄에 줄바꿈이 없으면 그 조각도 한 줄로 센다
+    path.write_bytes(data + b"partial")
+    data = path.read_bytes()
+    assert data[tail_offset(str(path), 2, block_size):] == lines[-1] + b"partial"
+
+
+def test_tail_offset_empty_file(tmp_path):
+    path = tmp_path / "empty.log"
+    path.write_bytes(b"")
+    assert tail_offset(str(path), 5) == 0
+
+
+def collect(follower, task_id, path, offset=0, timeout=10):
+    """follow() 를 스레드에서 끝까지 읽는다"""
+    out = []
+    thread = threading.Thread(
+        target=lambda: out.extend(follower.follow(task_id, path, offset=offset, timeout=timeout)), daemon=True)
+    thread.start()
+    return out, thread
+
+
+def joined(chunks):
+    """(offset, data) 가 이어지는지 확인하고 합친 바이트를 돌려준다"""
+    data, expected = b"", None
+    for offset, chunk in chunks:
+        if not chunk:
+            continue
+        if expected is not None:
+            assert offset == expected
+        data += chunk
+        expected = offset + len(chunk)
+    return data
+
+
+def test_follow_streams_new_data_until_finished(tmp_path):
+    path = tmp_path / "task.log"
+    path.write_bytes(b"queued\n")
+    follower = LogFollower(poll_interval=0.01)
+
+    out, thread = collect(follower, "t1", str(path))
+    assert wait_until(lambda: follower.subscribers() == 1)
+    for i in range(5):
+        with open(path, "ab") as f:
+            f.write(f"step {i}\n".encode())
+        time.sleep(0.02)
+    follower.finish("t1")
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert joined(out) == path.read_bytes()
+    assert wait_until(lambda: follower.subscribers() == 0)
+
+
+def test_follow_from_offset_and_after_finish(tmp_path):
+    path = tmp_path / "task.log"
+    path.write_bytes(b"first\nsecond\n")
+    follower = LogFollower(poll_interval=0.01)
+    follower.finish("t2")
+
+    # 이미 끝난 작업에 늦게 붙은 구독자는 남은 내용만 받고 바로 끝난다
+    out, thread = collect(follower, "t2", str(path), offset=6)
+    thread.join(5)
+    assert not thread.is_alive()
+    assert out[0][0] == 6
+    assert joined(out) == b"second\n"
+
+
+def test_follow_shares_one_tail_between_subscribers(tmp_path):
+    path = tmp_path / "task.log"
+    path.write_bytes(b"")
+    follower = LogFollower(poll_interval=0.01)
+
+    readers = [collect(follower, "t3", str(path)) for _ in range(3)]
+    assert wait_until(lambda: follower.subscribers() == 3)
+    assert len(follower._tails) == 1
+    with open(path, "ab") as f:
+        f.write(b"hello\n")
+    time.sleep(0.05)
+    follower.finish("t3")
+    for out, thread in readers:
+        thread.join(5)
+        assert joined(out) == b"hello\n"
+
+
+def test_slow_subscriber_catches_up_from_file(tmp_path):
+    path = tmp_path / "task.log"
+    path.write_bytes(b"")
+    follower = LogFollower(poll_interval=0.005, max_chunks=1)
+
+    stream = follower.follow("t4", str(path), timeout=10)
+    with open(path, "ab") as f:
+        f.write(b"a\n")
+    first = next(stream)  # 구독 시작
+    # 소비하지 않는 동안 여러 번 쓰여 큐(1칸)가 넘친다
+    for i in range(20):
+        with open(path, "ab") as f:
+            f.write(f"line {i}\n".encode())
+        time.sleep(0.01)
+    follower.finish("t4")
+    rest = list(stream)
+
+    assert joined([first] + rest) == path.read_bytes()
+
+
+def test_follow_emits_keepalive(tmp_path):
+    path = tmp_path / "task.log"
+    path.write_bytes(b"")
+    follower = LogFollower(poll_interval=0.01, keepalive=0.05)
+    stream = follower.follow("t5", str(path), timeout=1)
+    assert next(stream) == (0, b"")
+    stream.close()
+
+
+def test_sse_events():
+    events = list(sse_events([(0, b"a\nb"), (3, b""), (3, b"c\n"), (5, b"tail")]))
+    assert events == [
+        "id: 2\ndata: a\n\n",
+        ": keepalive\n\n",
+        "id: 5\ndata: bc\n\n",
+        "data: tail\n\n",
+        "event: end\ndata: \n\n",
+    ]
+
+
+def test_sse_events_flushes_long_partial_lines():
+    events = list(sse_events([(0, b"x" * 10)], max_partial=4))
+    assert events[0] == "id: 10\ndata: xxxxxxxxxx\n\n"
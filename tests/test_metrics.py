@@ -0,0 +1,71 @@
+import pytest
+
+from metrics import Registry
+
+
+def samples(text, name):
+    return [line for line in text.splitlines() if line.startswith(name) and not line.startswith("#")]
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    hist = registry.histogram("job_seconds", "작업 시간", labelnames=("stage",), buckets=(1, 5, 0.5))
+    for value in (0.2, 0.5, 0.7, 3, 100):
+        hist.observe(value, stage="inference")
+
+    lines = samples(registry.render(), "job_seconds")
+    assert lines == [
+        'job_seconds_bucket{stage="inference",le="0.5"} 2',   # 경계값은 해당 버킷에 포함 (le)
+        'job_seconds_bucket{stage="inference",le="1"} 3',
+        'job_seconds_bucket{stage="inference",le="5"} 4',
+        'job_seconds_bucket{stage="inference",le="+Inf"} 5',
+        'job_seconds_sum{stage="inference"} 104.4',
+        'job_seconds_count{stage="inference"} 5',
+    ]
+
+
+def test_histogram_series_per_label_and_without_labels():
+    registry = Registry()
+    by_stage = registry.histogram("stage_seconds", "단계", labelnames=("stage",), buckets=(1,))
+    total = registry.histogram("total_seconds", "전체", buckets=(1,))
+    by_stage.observe(2, stage="b")
+    by_stage.observe(0.5, stage="a")
+    total.observe(0.25)
+
+    text = registry.render()
+    assert samples(text, "stage_seconds_count") == ['stage_seconds_count{stage="a"} 1',
+                                                    'stage_seconds_count{stage="b"} 1']
+    assert samples(text, "total_seconds") == ['total_seconds_bucket{le="1"} 1', 'total_seconds_bucket{le="+Inf"} 1',
+                                              "total_seconds_sum 0.25", "total_seconds_count 1"]
+    assert "# TYPE stage_seconds histogram" in text
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    counter = registry.counter("errors_total", "오류", labelnames=("reason",))
+    counter.inc(reason='bad "quote"\\path\nnext')
+    assert samples(registry.render(), "errors_total") == [r'errors_total{reason="bad \"quote\"\\path\nnext"} 1']
+
+
+def test_label_names_must_match():
+    hist = Registry().histogram("x_seconds", "x", labelnames=("stage",))
+    with pytest.raises(ValueError):
+        hist.observe(1)
+    with pytest.raises(ValueError):
+        hist.observe(1, stage="a", extra="b")
+
+
+def test_counter_and_gauge_rendering():
+    registry = Registry()
+    registry.counter("plain_total", "라벨 없는 카운터")
+    registry.gauge("queue_depth", "큐 길이", lambda: 3)
+    registry.gauge("broken", "조회 실패", lambda: 1 / 0)
+    registry.gauge("ratio", "비율", lambda: 0.5)
+
+    text = registry.render()
+    assert samples(text, "plain_total") == ["plain_total 0"]
+    assert samples(text, "queue_depth") == ["queue_depth 3"]
+    assert samples(text, "broken") == []
+    assert samples(text, "ratio") == ["ratio 0.5"]
+    assert text.endswith("\n")
+
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("numpy")
+
+from conftest import ROOT  # noqa: E402
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import crawl  # noqa: E402
+from local_server import serve_directory  # noqa: E402
+
+if not any(p and os.path.exists(p) for p in crawl.CHROME_CANDIDATES):
+    pytest.skip("Chrome/Chromium 이 없어 건너뜀", allow_module_level=True)
+
+FIXTURES_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    with serve_directory(FIXTURES_DIR) as url:
+        yield url
+
+
+@pytest.fixture
+def crawler(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # WebAnalyzer 는 ./tmp/file 에 산출물을 쓴다
+    crawler = crawl.WebAnalyzer()
+    yield crawler
+    crawler.close()
+
+
+def test_mobile_profile_scores_the_same_page_as_the_default_path(crawler, base_url):
+    url = f"{base_url}/tall.html"
+
+    crawler.analyze(url)
+    default = crawler.crawl_records()
+    default_height = crawler.driver.execute_script("return window.innerHeight")
+
+    crawler.analyze(url, profiles=["mobile"])
+    profile = crawler.profile_views["mobile"]["records"]
+    profile_height = crawler.driver.execute_script("return window.innerHeight")
+
+    # 둘 다 첫 화면(812px)이 아니라 늘린 뷰포트 = 페이지 전체를 수집해야 한다
+    assert default_height > crawl.DEVICE_PROFILES["mobile"]["height"]
+    assert profile_height == crawl.DEVICE_PROFILES["mobile"]["height"]  # analyze 가 끝나면 되돌린다
+    assert profile["groups"]["count"] == default["groups"]["count"]
+    assert profile["texts"] == default["texts"]
+    assert profile["crawled_button_count"] == default["crawled_button_count"]
+    assert len(profile["buttons"]) == len(default["buttons"])
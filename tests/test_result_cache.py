@@ -0,0 +1,87 @@
+import json
+import os
+import time
+
+import pytest
+
+from result_cache import ResultCache, cache_key, content_fingerprint, normalize_url
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "cache"), ttl=60, max_entries=3)
+
+
+def test_get_within_ttl_is_a_hit(cache):
+    cache.put("k", "fp", {"summary": {"final_score": 1}})
+    entry = cache.get("k")
+    assert entry["results"] == {"summary": {"final_score": 1}}
+    assert cache.get("missing") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "fingerprint_hits": 0, "hit_ratio": 0.5}
+
+
+def test_expired_entry_is_a_miss_but_still_matches_by_fingerprint(cache):
+    entry = cache.put("k", "fp", {"v": 1})
+    entry["stored_at"] -= cache.ttl + 1
+    with open(cache._path("k"), "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+
+    assert cache.get("k") is None
+    # 내용이 같다는 것이 지문으로 확인되면 TTL 과 무관하게 재사용
+    assert cache.match("k", "fp")["results"] == {"v": 1}
+    assert cache.match("k", "other") is None
+    assert cache.stats()["fingerprint_hits"] == 1
+
+
+def set_mtime(cache, key, seconds_ago):
+    stamp = time.time() - seconds_ago
+    os.utime(cache._path(key), (stamp, stamp))
+
+
+def test_eviction_removes_least_recently_used(cache):
+    for key, age in (("a", 300), ("b", 200), ("c", 100)):
+        cache.put(key, "fp", {"key": key})
+        set_mtime(cache, key, age)
+
+    assert cache.get("a") is not None  # 조회하면 최근 사용으로 갱신된다
+    cache.put("d", "fp", {"key": "d"})
+
+    remaining = sorted(name[:-len(".json")] for name in os.listdir(cache.directory))
+    assert remaining == ["a", "c", "d"]
+
+
+def test_fingerprint_match_also_refreshes_lru(cache):
+    for key, age in (("a", 300), ("b", 200), ("c", 100)):
+        cache.put(key, f"fp-{key}", {})
+        set_mtime(cache, key, age)
+    assert cache.match("a", "fp-a") is not None
+    cache.put("d", "fp-d", {})
+    assert not os.path.exists(cache._path("b"))
+
+
+def test_invalidate(cache):
+    cache.put("k", "fp", {})
+    cache.invalidate("k")
+    cache.invalidate("k")  # 없어도 오류 없음
+    assert cache.get("k") is None
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Example.COM:443/a/b/?z=1&a=2#top") == "https://example.com/a/b?a=2&z=1"
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/") == "http://example.com:8080/"
+
+
+def test_cache_key_includes_profile_and_model():
+    url = "https://example.com/page"
+    assert cache_key(url) == cache_key("https://EXAMPLE.com/page/")
+    assert cache_key(url, "mobile") != cache_key(url, "mobile+desktop")
+    assert cache_key(url, "mobile", "model-a") != cache_key(url, "mobile", "model-b")
+
+
+def test_content_fingerprint_ignores_scripts_and_nonces():
+    html = '<html><script nonce="abc">var t = 1;</script><style nonce="abc"></style><p>hi</p></html>'
+    same = '<html><script nonce="xyz">var t = 2;</script><style nonce="xyz"></style><p>hi</p></html>'
+    assert content_fingerprint(html, ["p{}"]) == content_fingerprint(same, ["p{}"])
+    assert content_fingerprint(html, ["p{}"]) != content_fingerprint(html, ["p{color:red}"])
+    assert content_fingerprint(html) != content_fingerprint(html.replace("hi", "bye"))
@@ -0,0 +1,96 @@
+import json
+import zlib
+
+import pytest
+
+from result_store import MAX_PAGE_SIZE, ResultStore
+
+
+def payload(task_id, website_id, date, score=50.0):
+    data = {
+        "task_id": task_id,
+        "results": {
+            "analysis_info": {"website_id": website_id, "url": f"https://example.com/{task_id}", "analysis_date": date},
+            "summary": {"final_score": score}
+        }
+    }
+    return json.dumps(data, ensure_ascii=False).encode("utf-8"), data
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"))
+    items = []
+    for i in range(25):
+        body, data = payload(f"task-{i:02d}", i % 2, f"2026-10-{1 + i // 5:02d}T{i % 5:02d}:00:00")
+        items.append((f"task-{i:02d}", body, data))
+    store.put_many(items)
+    return store
+
+
+def pages(store, **kwargs):
+    cursor, out = None, []
+    while True:
+        items, cursor = store.query(cursor=cursor, **kwargs)
+        out.append(items)
+        if cursor is None:
+            return out
+
+
+def test_keyset_pagination_walks_every_row_once(store):
+    result = pages(store, limit=10)
+    assert [len(page) for page in result] == [10, 10, 5]
+    rows = [item for page in result for item in page]
+    assert len({r["task_id"] for r in rows}) == 25
+    dates = [r["analysis_date"] for r in rows]
+    assert dates == sorted(dates, reverse=True)
+
+
+def test_pagination_with_equal_dates_uses_id_tiebreak(tmp_path):
+    store = ResultStore(str(tmp_path / "same.sqlite3"))
+    store.put_many([(f"t{i}", *payload(f"t{i}", 1, "2026-10-01T00:00:00")) for i in range(7)])
+    rows = [item["task_id"] for page in pages(store, limit=3) for item in page]
+    assert rows == [f"t{i}" for i in reversed(range(7))]
+
+
+def test_filters(store):
+    odd = [item for page in pages(store, website_id=1, limit=4) for item in page]
+    assert len(odd) == 12 and {r["website_id"] for r in odd} == {"1"}
+
+    window, cursor = store.query(since="2026-10-02", until="2026-10-03")
+    assert cursor is None
+    assert {r["analysis_date"][:10] for r in window} == {"2026-10-02"}
+    assert len(window) == 5
+
+
+def test_limit_is_clamped(store):
+    items, _ = store.query(limit=0)
+    assert len(items) == 1
+    items, cursor = store.query(limit=MAX_PAGE_SIZE * 10)
+    assert len(items) == 25 and cursor is None
+
+
+def test_put_keeps_the_received_bytes_and_overwrites_by_task_id(store):
+    body, data = payload("task-03", 9, "2026-11-01T00:00:00", score=99.5)
+    store.put("task-03", body)
+
+    assert store.count() == 25
+    assert store.get("task-03") == body
+    assert zlib.decompress(store.get_compressed("task-03")) == body
+    first, _ = store.query(limit=1)
+    assert first[0]["task_id"] == "task-03"
+    assert first[0]["website_id"] == "9" and first[0]["final_score"] == 99.5
+    assert store.get("missing") is None
+
+
+def test_import_directory(tmp_path):
+    legacy = tmp_path / "callback_results"
+    legacy.mkdir()
+    for i in range(3):
+        _, data = payload(f"old-{i}", 7, f"2026-09-0{i + 1}T00:00:00")
+        (legacy / f"old-{i}.json").write_text(json.dumps(data, indent=2), encoding="utf-8")
+    (legacy / "broken.json").write_text("{", encoding="utf-8")
+
+    store = ResultStore(str(tmp_path / "imported.sqlite3"))
+    assert store.import_directory(str(legacy), batch_size=2) == 3
+    assert json.loads(store.get("old-1"))["results"]["analysis_info"]["website_id"] == 7
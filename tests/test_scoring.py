@@ -0,0 +1,127 @@
+import random
+import re
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import scoring  # noqa: E402  (numpy 가 있을 때만)
+
+KO = "가나다라마바사아자차카타파하한국어접근성"
+EN = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+# ----------------------------- 이전 WebAnalyzer 방식 -----------------------------
+def legacy_luminance(rgb):
+    r, g, b = [x / 255.0 for x in rgb]
+    def ch(c): return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+    return 0.2126 * ch(r) + 0.7152 * ch(g) + 0.0722 * ch(b)
+
+
+def legacy_ratio(fg, bg):
+    l1 = legacy_luminance(tuple(map(int, re.findall(r'\d+', fg)[:3])))
+    l2 = legacy_luminance(tuple(map(int, re.findall(r'\d+', bg)[:3])))
+    return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
+
+
+def legacy_scores(groups, buttons, min_contrast=4.5, min_px=16, min_size=44):
+    total = sum(len(members) for members in groups.values())
+    font = sum(len(m) for (size, _, _), m in groups.items()
+               if (float(size[:-2]) if size.endswith("px") else 16.0) >= min_px)
+    overall = sum(len(m) for (_, fg, bg), m in groups.items() if legacy_ratio(fg, bg) >= min_contrast)
+    size = sum(1 for b in buttons if b["width"] >= min_size and b["height"] >= min_size)
+    button_contrast = sum(1 for b in buttons if legacy_ratio(b["text_color"], b["background_color"]) >= min_contrast)
+
+    korean_ranges = [(0xAC00, 0xD7A3), (0x1100, 0x11FF), (0x3130, 0x318F), (0xA960, 0xA97F), (0xD7B0, 0xD7FF)]
+    chars = korean = 0
+    for members in groups.values():
+        for text in members:
+            for ch in text:
+                if ch.strip() and ch.isalnum():
+                    chars += 1
+                    korean += any(start <= ord(ch) <= end for start, end in korean_ranges)
+    return {
+        "font_size": font / total * 100,
+        "overall_contrast": overall / total * 100,
+        "button_size": size / len(buttons) * 100,
+        "button_contrast": button_contrast / len(buttons) * 100,
+        "korean_ratio": korean / chars * 100,
+    }
+
+
+def opaque(rng):
+    return f"rgb({rng.randrange(256)}, {rng.randrange(256)}, {rng.randrange(256)})"
+
+
+@pytest.fixture
+def page():
+    """불투명 색만 쓰는 합성 페이지: (style_groups, buttons, records)"""
+    rng = random.Random(11)
+    keys = [(rng.choice(["12px", "14px", "16px", "18px", "1em"]), opaque(rng), opaque(rng)) for _ in range(40)]
+    groups = {key: [] for key in keys}
+    for _ in range(600):
+        text = "".join(rng.choice(KO + EN + " .!") for _ in range(rng.randint(0, 20)))
+        groups[rng.choice(keys)].append(text)
+    groups = {key: members for key, members in groups.items() if members}
+    buttons = [{"width": rng.randint(10, 100), "height": rng.randint(10, 60),
+                "text_color": opaque(rng), "background_color": opaque(rng),
+                **{name: rng.random() < 0.5 for name in scoring.VISUAL_FEEDBACK_KEYS}} for _ in range(30)]
+    records = {
+        "groups": {
+            "font_size": [k[0] for k in groups],
+            "color": [k[1] for k in groups],
+            "background_color": [k[2] for k in groups],
+            "count": [len(m) for m in groups.values()],
+        },
+        "texts": [text for members in groups.values() for text in members],
+        "buttons": buttons,
+        "crawled_button_count": len(buttons)
+    }
+    return groups, buttons, records
+
+
+def test_score_records_matches_the_legacy_scores(page):
+    groups, buttons, records = page
+    scores = scoring.score_records(records, detected_button_count=24)
+    for name, value in legacy_scores(groups, buttons).items():
+        assert scores[name] == pytest.approx(value, abs=1e-9), name
+    assert scores["button_detection"] == pytest.approx(80.0)
+
+
+def test_precomputed_contrast_is_used_and_nan_groups_are_skipped(page):
+    _, _, records = page
+    count = len(records["groups"]["count"])
+    records["groups"]["contrast"] = [None] + [21.0] * (count - 1)
+    assert scoring.score_records(records)["overall_contrast"] == pytest.approx(100.0)
+
+
+def test_final_score_weights():
+    assert scoring.calculate_score(100, 100, 100, 100, 100, 100, 100) == pytest.approx(100.0)
+    assert scoring.calculate_score(0, 0, 0, 0, 0, 0, 100) == pytest.approx(30.0)
+    assert scoring.calculate_score(100, 0, 0, 0, 0, 0, 0) == pytest.approx(20.0)
+
+
+def test_empty_inputs_score_zero():
+    assert scoring.button_size_score([], []) == 0
+    assert scoring.button_contrast_score([], []) == 0
+    assert scoring.button_visual_feedback_score([]) == 0
+    assert scoring.button_detection_score(0, 5) == 0
+    assert scoring.font_size_score([], []) == 0
+    assert scoring.korean_ratio([]) == 0.0
+
+
+def test_korean_ratio_counts_outside_bmp():
+    # 이모지는 세지 않고, BMP 밖의 영숫자(수학 글자)는 분모에만 들어간다
+    assert scoring.korean_ratio(["한글 ab 😀"]) == pytest.approx(50.0)
+    assert scoring.korean_totals(["한", "𝐀"]) == (1, 2)
+
+
+def test_outermost_texts_skips_nested_elements():
+    subtrees = [(0, 5, "outer"), (1, 2, "inner"), (3, 3, "inner2"), (6, 6, "next")]
+    assert scoring.outermost_texts(subtrees) == ["outer", "next"]
+
+
+def test_severity_levels():
+    assert [scoring.get_severity_level(s) for s in (10, 25, 30)] == ["심각", "보통", "양호"]
+    assert scoring.get_accessibility_level(50).startswith("매우 우수")
+    assert scoring.find_issues({"font_size": 10, "korean_ratio": 80}) == [("폰트 크기", 10)]
@@ -0,0 +1,92 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from snapshot import (SnapshotStore, build_snapshot, diff_report, known_contrasts_from,  # noqa: E402
+                      region_cache_from)
+
+KEY_A = ("16px", "rgb(0, 0, 0)", "rgb(255, 255, 255)")
+KEY_B = ("12px", "rgb(120, 120, 120)", "rgb(255, 255, 255)")
+KEY_C = ("20px", "rgb(255, 0, 0)", "rgb(0, 0, 0)")
+
+
+def member(text, width=100, height=20):
+    # (element, index, text, is_button, has_icon, width, height, font_px)
+    return (None, 0, text, False, False, width, height, 16.0)
+
+
+def detection(count):
+    return {"boxes": np.arange(count * 4, dtype=np.float32).reshape(-1, 4),
+            "scores": np.full(count, 0.9, dtype=np.float32),
+            "labels": np.ones(count, dtype=np.int64),
+            "button_count": count}
+
+
+@pytest.fixture
+def previous():
+    groups = {KEY_A: [member("가"), member("나")], KEY_B: [member("다")]}
+    return build_snapshot("https://example.com", groups, {KEY_A: 21.0, KEY_B: float("nan")},
+                          {"tile1": detection(2)}, model_version="m1")
+
+
+def test_diff_report_counts_elements_and_groups(previous):
+    groups = {KEY_A: [member("가"), member("나")],          # 그대로
+              KEY_B: [member("다", width=50)],               # 멤버가 바뀜
+              KEY_C: [member("라")]}                         # 새 그룹
+    current = build_snapshot("https://example.com", groups, {}, None, "m1", previous=previous)
+    report = diff_report(previous, current, region_stats={"reused": 1, "detected": 0})
+
+    assert report["elements"] == {"total": 4, "unchanged": 2, "added": 2, "removed": 1}
+    assert report["style_groups"] == {"total": 3, "unchanged": 1, "changed": 1, "added": 1, "removed": 0,
+                                      "contrast_reused": 2, "contrast_computed": 1}
+    assert report["regions"] == {"reused": 1, "detected": 0}
+    assert report["baseline"] is not None
+
+
+def test_diff_report_without_baseline(previous):
+    report = diff_report(None, previous, region_stats=None)
+    assert report["baseline"] is None
+    assert report["elements"] == {"total": 3, "unchanged": 0, "added": 3, "removed": 0}
+    assert report["style_groups"]["added"] == 2 and report["style_groups"]["contrast_reused"] == 0
+
+
+def test_known_contrasts_round_trip(previous):
+    contrasts = known_contrasts_from(previous)
+    assert contrasts[KEY_A] == 21.0
+    assert math.isnan(contrasts[KEY_B])
+    assert known_contrasts_from(None) == {}
+
+
+def test_region_cache_requires_the_same_model(previous):
+    cache = region_cache_from(previous, "m1")
+    assert list(cache) == ["tile1"]
+    assert cache["tile1"]["boxes"].shape == (2, 4) and cache["tile1"]["boxes"].dtype == np.float32
+    assert cache["tile1"]["labels"].dtype == np.int64 and cache["tile1"]["button_count"] == 2
+    assert region_cache_from(previous, "m2") == {}
+    assert region_cache_from(None, "m1") == {}
+
+
+def test_skipped_detection_keeps_previous_regions_for_the_same_model(previous):
+    kept = build_snapshot("https://example.com", {}, {}, None, "m1", previous=previous)
+    dropped = build_snapshot("https://example.com", {}, {}, None, "m2", previous=previous)
+    assert kept["regions"] == previous["regions"]
+    assert dropped["regions"] == {}
+
+
+def test_store_round_trip(tmp_path, previous):
+    store = SnapshotStore(str(tmp_path))
+    assert store.load("site") is None
+    store.save("site", previous)
+    assert store.load("site") == previous
+
+
+def test_similar_website_ids_do_not_collide(tmp_path, previous):
+    store = SnapshotStore(str(tmp_path))
+    ids = ["a/b", "a.b", "a_b", "../a b"]
+    for i, website_id in enumerate(ids):
+        store.save(website_id, dict(previous, url=f"https://example.com/{i}"))
+
+    assert [store.load(website_id)["url"] for website_id in ids] == [f"https://example.com/{i}" for i in range(4)]
+    assert len(list(tmp_path.iterdir())) == len(ids)
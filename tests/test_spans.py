@@ -0,0 +1,89 @@
+import json
+import threading
+import time
+
+import spans
+from spans import Tracer, activate, span
+
+
+def test_span_without_tracer_is_a_no_op():
+    assert spans.current() is None
+    with span("orphan") as s:
+        s.set(elements=3)
+
+
+def test_nested_spans_record_depth_round_trips_and_attrs():
+    trips = iter(range(0, 100, 3))
+    tracer = Tracer(round_trips=lambda: next(trips))
+    with activate(tracer):
+        with span("analyze", stage=True):
+            with span("dom_collection", stage=True) as s:
+                s.set(elements=12)
+        with span("analyze", stage=True):
+            pass
+    assert spans.current() is None
+
+    outer, inner, second = tracer.spans
+    assert [r.name for r in tracer.spans] == ["analyze", "dom_collection", "analyze"]
+    assert (outer.depth, inner.depth, second.depth) == (0, 1, 0)
+    assert inner.attrs == {"elements": 12}
+    assert inner.round_trips == 3 and outer.round_trips == 9
+    assert outer.wall >= inner.wall >= 0
+    assert tracer.stages()["analyze"] == round(outer.wall + second.wall, 4)
+
+
+def test_failing_round_trip_counter_is_ignored():
+    def broken():
+        raise RuntimeError("driver gone")
+    tracer = Tracer(round_trips=broken)
+    with tracer.span("x"):
+        pass
+    assert tracer.spans[0].round_trips is None
+    assert "round_trips" not in tracer.to_dict()["spans"][0]
+
+
+def test_add_records_work_from_other_threads():
+    tracer = Tracer()
+    started = time.perf_counter()
+    tracer.add("upload", 0.25, stage=True, start=started, png_bytes=100)
+    tracer.add("late", 0.1)
+    assert tracer.stages() == {"upload": 0.25}
+    upload = tracer.to_dict()["spans"][0]
+    assert upload["wall"] == 0.25 and upload["attrs"] == {"png_bytes": 100}
+
+
+def test_unfinished_spans_are_left_out():
+    tracer = Tracer()
+    tracer.begin("still_running", stage=True)
+    assert tracer.stages() == {} and tracer.to_dict()["spans"] == []
+
+
+def test_write_chrome_trace(tmp_path):
+    tracer = Tracer(round_trips=lambda: 5)
+    with tracer.span("page_load", stage=True, url="https://example.com"):
+        pass
+
+    def worker():
+        with tracer.span("background"):
+            pass
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    tracer.begin("never_finished")
+
+    path = tracer.write_chrome_trace(str(tmp_path / "traces" / "t1.trace.json"), process_name="task t1")
+    with open(path, encoding="utf-8") as f:
+        trace = json.load(f)
+
+    meta, *events = trace["traceEvents"]
+    assert trace["displayTimeUnit"] == "ms"
+    assert meta["ph"] == "M" and meta["args"] == {"name": "task t1"}
+    assert [e["name"] for e in events] == ["page_load", "background"]
+
+    page_load, background = events
+    assert page_load["ph"] == "X" and page_load["cat"] == "stage" and background["cat"] == "span"
+    assert page_load["ts"] >= 0 and page_load["dur"] >= 0
+    assert page_load["args"]["url"] == "https://example.com"
+    assert page_load["args"]["round_trips"] == 0 and "cpu_ms" in page_load["args"]
+    assert page_load["tid"] != background["tid"]
+    assert page_load["pid"] == background["pid"] == meta["pid"]
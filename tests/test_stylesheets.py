@@ -0,0 +1,166 @@
+import http.server
+import json
+import os
+import sys
+import time
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import stylesheets  # noqa: E402
+from local_server import serve_handler  # noqa: E402
+
+# 주석/공백/벤더 속성은 cssRules 로 다시 직렬화하면 사라진다 → 원문을 읽었는지 가려낼 수 있다
+ORIGINAL_CSS = (
+    "/* 원문 주석: 한글 */\r\n"
+    ".title   {  color : #123456 ; -webkit-foo: bar }\r\n"
+    "\n"
+    "@media (max-width: 600px) { .title { font-size: 14px } }\n"
+)
+
+
+class FakeDriver:
+    """execute_script / get_log / execute_cdp_cmd 만 흉내 낸다"""
+
+    def __init__(self, sheets, responses=None, bodies=None):
+        self.sheets = sheets                  # [{href, text}] (cssRules 직렬화 결과)
+        self.responses = responses or {}      # {url: requestId}
+        self.bodies = bodies or {}            # {requestId: getResponseBody 결과}
+        self.cdp_calls = []
+
+    def execute_script(self, script):
+        return self.sheets
+
+    def get_log(self, name):
+        assert name == "performance"
+        entries, self.responses = self.responses, {}
+        return [{"message": json.dumps({"message": {"method": "Network.responseReceived",
+                                                    "params": {"requestId": rid, "response": {"url": url}}}})}
+                for url, rid in entries.items()]
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_calls.append((cmd, params))
+        if params["requestId"] not in self.bodies:
+            raise RuntimeError("No resource with given identifier found")
+        return self.bodies[params["requestId"]]
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_response_body_is_preferred_over_cssrules(tmp_path):
+    driver = FakeDriver(
+        sheets=[{"href": "http://a/1.css", "text": ".title { color: rgb(18, 52, 86); }"},
+                {"href": "http://b/2.css", "text": None},
+                {"href": "http://a/3.css", "text": ".x { }"}],
+        responses={"http://a/1.css": "r1", "http://b/2.css": "r2", "http://a/3.css": "r3"},
+        bodies={"r1": {"body": ORIGINAL_CSS, "base64Encoded": False},
+                "r2": {"body": "LmIgeyB9", "base64Encoded": True}})   # r3 은 버퍼에서 밀려남
+
+    sheets = stylesheets.collect_stylesheets(driver, str(tmp_path))
+
+    assert [source for _, _, source in sheets] == ["cdp", "cdp", "page"]
+    assert read_bytes(tmp_path / "style_1.css") == ORIGINAL_CSS.encode("utf-8")
+    assert read_bytes(tmp_path / "style_2.css") == b".b { }"
+    assert read_bytes(tmp_path / "style_3.css") == b".x { }"
+
+
+def test_performance_log_is_drained_without_missing_sheets(tmp_path):
+    driver = FakeDriver(sheets=[], responses={"http://other/ad.js": "r9"})
+    assert stylesheets.collect_stylesheets(driver, str(tmp_path)) == []
+    assert driver.responses == {} and driver.cdp_calls == []
+
+
+# ----------------------------- HTTP 폴백 (느린 로컬 서버) -----------------------------
+def slow_css_handler(files, delays):
+    class SlowCSSHandler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            name = self.path.lstrip("/")
+            time.sleep(delays.get(name, 0))
+            body = files[name]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/css")   # charset 없음
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+    return SlowCSSHandler
+
+
+@pytest.fixture
+def slow_server():
+    pytest.importorskip("requests")
+    files = {"a.css": ORIGINAL_CSS.encode("utf-8"), "b.css": b".b { color: red }\n",
+             "big.css": b".big{}" * 10000, "stuck.css": b".stuck {}"}
+    with serve_handler(slow_css_handler(files, {"a.css": 0.3, "b.css": 0.3, "stuck.css": 5})) as base:
+        yield base, files
+
+
+def test_fallback_writes_the_served_bytes(slow_server, tmp_path):
+    base, files = slow_server
+    hrefs = [f"{base}/a.css", f"{base}/b.css"]
+    driver = FakeDriver(sheets=[{"href": href, "text": None} for href in hrefs])
+
+    started = time.monotonic()
+    sheets = stylesheets.collect_stylesheets(driver, str(tmp_path))
+    elapsed = time.monotonic() - started
+
+    assert [source for _, _, source in sheets] == ["http", "http"]
+    assert read_bytes(tmp_path / "style_1.css") == files["a.css"]
+    assert read_bytes(tmp_path / "style_2.css") == files["b.css"]
+    assert elapsed < 0.55   # 0.3 초짜리 두 개를 병렬로
+
+
+def test_fallback_honours_time_budget_and_size_cap(slow_server):
+    base, files = slow_server
+    urls = [f"{base}/a.css", f"{base}/big.css", f"{base}/stuck.css"]
+
+    started = time.monotonic()
+    texts = stylesheets.fetch_stylesheets(urls, workers=3, budget=1.0, timeout=10, max_bytes=4096)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.5
+    assert f"{base}/stuck.css" not in texts
+    assert texts[f"{base}/a.css"] == ORIGINAL_CSS
+    assert texts[f"{base}/big.css"].encode("utf-8") == files["big.css"][:4096]
+
+
+# ----------------------------- 실제 브라우저 -----------------------------
+def test_browser_collects_original_text(tmp_path, monkeypatch):
+    pytest.importorskip("selenium")
+    pytest.importorskip("numpy")
+    import crawl
+    from local_server import serve_directory
+
+    if not any(p and os.path.exists(p) for p in crawl.CHROME_CANDIDATES):
+        pytest.skip("Chrome/Chromium 이 없어 건너뜀")
+
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "s.css").write_bytes(ORIGINAL_CSS.encode("utf-8"))
+    (site / "index.html").write_text('<!doctype html><html><head><meta charset="utf-8">'
+                                     '<link rel="stylesheet" href="s.css"></head><body><p>css</p></body></html>')
+
+    monkeypatch.chdir(tmp_path)
+    crawler = crawl.WebAnalyzer()
+    try:
+        with serve_directory(str(site)) as base:
+            crawler.driver.get(f"{base}/index.html")
+            out = tmp_path / "out"
+            out.mkdir()
+            sheets = stylesheets.collect_stylesheets(crawler.driver, str(out))
+    finally:
+        crawler.close()
+
+    assert sheets[0][2] == "cdp"
+    assert read_bytes(out / "style_1.css") == ORIGINAL_CSS.encode("utf-8")
@@ -0,0 +1,84 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("torchvision")
+pytest.importorskip("PIL")
+
+from element import MAX_DETECTIONS, TILE_EDGE_MARGIN, UIAnalyzer  # noqa: E402
+
+TILE_H = 1000
+OVERLAP = 200
+
+
+def tile(boxes, scores, labels):
+    return {"boxes": np.asarray(boxes, np.float32).reshape(-1, 4),
+            "scores": np.asarray(scores, np.float32),
+            "labels": np.asarray(labels, np.int64)}
+
+
+def merge(per_tile, offsets, **kwargs):
+    kwargs.setdefault("overlap", OVERLAP)
+    return UIAnalyzer.merge_tile_detections(per_tile, offsets, [TILE_H] * len(per_tile), **kwargs)
+
+
+def test_tile_offsets():
+    assert UIAnalyzer.tile_offsets(900, TILE_H, OVERLAP) == [0]
+    assert UIAnalyzer.tile_offsets(2500, TILE_H, OVERLAP) == [0, 800, 1500]
+    assert UIAnalyzer.tile_offsets(1800, TILE_H, OVERLAP) == [0, 800]
+
+
+def test_duplicate_in_the_overlap_is_merged():
+    # 페이지 y=850~900 의 버튼이 두 타일 모두에 온전히 보인다
+    first = tile([[10, 850, 110, 900]], [0.9], [8])
+    second = tile([[10, 50, 110, 100], [10, 500, 110, 560]], [0.8, 0.7], [8, 8])
+    merged = merge([first, second], [0, 800])
+
+    assert merged["boxes"].tolist() == [[10, 850, 110, 900], [10, 1300, 110, 1360]]
+    assert merged["scores"].tolist() == pytest.approx([0.9, 0.7])
+    assert merged["button_count"] == 2
+
+
+def test_boxes_cut_at_an_inner_edge_are_dropped_when_the_neighbour_has_them():
+    first = tile([[10, 950, 110, TILE_H],                  # 아래 경계에 잘림, 겹침보다 작음 → 버림
+                  [10, 500, 110, TILE_H - TILE_EDGE_MARGIN]],  # 잘렸지만 겹침보다 큼 → 유지
+                 [0.9, 0.8], [4, 5])
+    second = tile([[10, 150, 110, 230]], [0.85], [4])      # 첫 타일의 잘린 박스 온전한 모습
+    merged = merge([first, second], [0, 800])
+
+    assert sorted(merged["boxes"].tolist()) == [[10, 500, 110, 998], [10, 950, 110, 1030]]
+
+
+def test_outer_edges_are_kept():
+    first = tile([[0, 0, 50, 40]], [0.9], [8])                   # 첫 타일 위쪽 = 페이지 맨 위
+    last = tile([[0, TILE_H - 40, 50, TILE_H]], [0.8], [8])      # 마지막 타일 아래쪽 = 페이지 맨 아래
+    merged = merge([first, last], [0, 800])
+    assert merged["boxes"].tolist() == [[0, 0, 50, 40], [0, 1760, 50, 1800]]
+
+
+def test_different_classes_are_not_suppressed():
+    same_box = [[10, 100, 110, 150]] * 2
+    merged = merge([tile(same_box, [0.9, 0.8], [8, 4])], [0])
+    assert sorted(merged["labels"].tolist()) == [4, 8]
+
+
+def test_limit_applies_to_the_merged_page():
+    # 타일마다 MAX_DETECTIONS 이하여도 합치면 넘는다 → 점수 상위만 남긴다
+    rng = np.random.default_rng(3)
+    per_tile, offsets = [], []
+    for t in range(3):
+        boxes = [[20, 100 + 20 * i, 60, 110 + 20 * i] for i in range(30)]
+        per_tile.append(tile(boxes, rng.uniform(0.5, 1.0, 30), [8] * 30))
+        offsets.append(t * 2000)   # 겹치지 않게 멀리 둔다
+    all_scores = np.sort(np.concatenate([d["scores"] for d in per_tile]))[::-1]
+
+    merged = merge(per_tile, offsets)
+    assert len(merged["boxes"]) == MAX_DETECTIONS
+    assert merged["scores"].tolist() == pytest.approx(all_scores[:MAX_DETECTIONS].tolist())
+    assert merged["button_count"] == MAX_DETECTIONS
+    assert len(merge(per_tile, offsets, limit=None)["boxes"]) == 90
+
+
+def test_empty_tiles():
+    merged = merge([tile([], [], []), tile([], [], [])], [0, 800])
+    assert merged["boxes"].shape == (0, 4) and merged["button_count"] == 0
@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+import uploader as uploader_module
+from uploader import ArtifactUploader, fallback_format
+
+
+class FakeImage:
+    def __init__(self, width, height):
+        self.size = (width, height)
+
+
+class FakeS3:
+    """upload_fileobj 만 흉내 낸다: 키별 본문을 기록하고, fail 에 든 확장자는 실패시킨다"""
+
+    def __init__(self, fail=(), gate=None):
+        self.fail = set(fail)
+        self.gate = gate
+        self.uploads = {}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if key.rsplit(".", 1)[1] in self.fail:
+            raise RuntimeError(f"{key} 거부")
+        self.uploads[key] = (fileobj.read(), ExtraArgs["ContentType"])
+
+
+@pytest.fixture
+def make_uploader(monkeypatch):
+    # PIL 없이: 인코딩 결과는 형식 이름으로 대신한다
+    monkeypatch.setattr(uploader_module, "encode_image", lambda image, fmt, quality: f"<{fmt}>".encode())
+    created = []
+
+    def make(formats, client):
+        up = ArtifactUploader(bucket="bucket", region="ap-northeast-2", endpoint_url="http://s3.local",
+                              formats=formats)
+        up._client = client   # boto3 대신
+        created.append(up)
+        return up
+    yield make
+    for up in created:
+        up.shutdown()
+
+
+@pytest.mark.parametrize("size, fmt, expected", [
+    ((1000, 5000), "webp", "webp"),
+    ((1000, 16383), "webp", "webp"),
+    ((1000, 16384), "webp", "jpeg"),
+    ((70000, 100), "webp", "png"),
+    ((1000, 70000), "jpeg", "png"),
+    ((1000, 70000), "png", "png"),
+])
+def test_fallback_format(size, fmt, expected):
+    assert fallback_format(FakeImage(*size), fmt) == expected
+
+
+def test_tall_page_falls_back_from_webp_to_jpeg(make_uploader, tmp_path):
+    path = tmp_path / "detection_result.png"
+    path.write_bytes(b"png-bytes")
+    client = FakeS3()
+    up = make_uploader(["png", "webp", "jpeg"], client)
+
+    result = up.resolve(up.submit("shots/t1", path=str(path), image=FakeImage(1000, 20000)))
+
+    assert sorted(client.uploads) == ["shots/t1.jpg", "shots/t1.png"]
+    assert client.uploads["shots/t1.png"] == (b"png-bytes", "image/png")
+    assert client.uploads["shots/t1.jpg"] == (b"<jpeg>", "image/jpeg")
+    assert result["url"] == "http://s3.local/bucket/shots/t1.png"
+    assert result["artifacts"]["webp"] == result["artifacts"]["jpeg"] == "http://s3.local/bucket/shots/t1.jpg"
+    assert result["bytes"] == {"png": 9, "jpeg": 6} and result["errors"] == {}
+
+
+def test_failed_format_does_not_stop_the_others(make_uploader, tmp_path):
+    path = tmp_path / "detection_result.png"
+    path.write_bytes(b"png-bytes")
+    up = make_uploader(["png", "webp"], FakeS3(fail={"png"}))
+
+    result = up.resolve(up.submit("shots/t2", path=str(path), image=FakeImage(100, 100)))
+
+    # 첫 형식이 실패하면 올라간 것 중 요청 순서상 첫 형식이 s3_url 이 된다
+    assert result["url"] == "http://s3.local/bucket/shots/t2.webp"
+    assert set(result["errors"]) == {"png"}
+    assert "png" not in result["artifacts"]
+
+
+def test_all_formats_failing_resolves_to_none(make_uploader, tmp_path):
+    path = tmp_path / "detection_result.png"
+    path.write_bytes(b"png-bytes")
+    up = make_uploader(["png", "webp"], FakeS3(fail={"png", "webp"}))
+    assert up.resolve(up.submit("shots/t3", path=str(path), image=FakeImage(100, 100))) is None
+
+
+def test_png_is_read_at_submit_time(make_uploader, tmp_path):
+    # 업로드가 밀린 사이 다음 작업이 같은 경로에 새 결과 이미지를 써도 이전 작업의 이미지를 올린다
+    path = tmp_path / "detection_result.png"
+    path.write_bytes(b"first-task")
+    gate = threading.Event()
+    client = FakeS3(gate=gate)
+    up = make_uploader(["png"], client)
+
+    future = up.submit("shots/t4", path=str(path), image=FakeImage(100, 100))
+    path.write_bytes(b"second-task")
+    gate.set()
+
+    assert up.resolve(future)["bytes"] == {"png": len(b"first-task")}
+    assert client.uploads["shots/t4.png"][0] == b"first-task"
@@ -0,0 +1,152 @@
+import os
+import sys
+import time
+
+import pytest
+
+from conftest import FAKE_WORKER, ROOT, wait_until
+from worker_pool import WorkerPool, host_capacity
+
+
+def make_pool(size=1, max_queue=10, **kwargs):
+    argv = [sys.executable, FAKE_WORKER, "--sleep", "0"]
+    pool = WorkerPool(lambda slot, generation: {"argv": argv, "cwd": None, "name": None},
+                      size=size, max_queue=max_queue, job_timeout=30, health_interval=0.5, **kwargs)
+    pool.start()
+    return pool
+
+
+def status(pool, task_id):
+    return (pool.tasks.get(task_id) or {}).get("status")
+
+
+def finished(pool, task_ids):
+    return all(status(pool, t) in ("done", "failed") for t in task_ids)
+
+
+@pytest.fixture
+def pool():
+    pool = make_pool(size=1, max_queue=2)
+    yield pool
+    pool.shutdown()
+
+
+def block(pool, task_id="blocker", seconds=1.0):
+    """유일한 슬롯을 seconds 동안 붙잡아 둔다"""
+    assert pool.submit({"task_id": task_id, "url": f"fake://block?sleep={seconds}"})
+    assert wait_until(lambda: status(pool, task_id) == "running")
+
+
+def test_rejects_when_queue_is_full(pool):
+    block(pool)
+    assert pool.submit({"task_id": "a", "url": "fake://a?sleep=0"})
+    assert pool.submit({"task_id": "b", "url": "fake://b?sleep=0"})
+    assert pool.queue_depth() == 2
+
+    assert not pool.submit({"task_id": "c", "url": "fake://c?sleep=0"})
+    assert pool.tasks.get("c") is None  # 거절된 작업은 상태를 남기지 않는다
+    assert pool.retry_after() >= 1
+
+    assert wait_until(lambda: finished(pool, ["blocker", "a", "b"]))
+    assert pool.submit({"task_id": "d", "url": "fake://d?sleep=0"})  # 자리가 나면 다시 받는다
+
+
+def test_higher_priority_runs_first():
+    pool = make_pool(size=1, max_queue=10)
+    try:
+        block(pool, seconds=0.5)
+        order = [("low-1", "low"), ("normal-1", "normal"), ("low-2", "low"), ("high-1", "high"), ("normal-2", "normal")]
+        for task_id, priority in order:
+            assert pool.submit({"task_id": task_id, "url": "fake://p?sleep=0"}, priority=priority)
+        assert wait_until(lambda: finished(pool, [t for t, _ in order]))
+        started = sorted(order, key=lambda item: pool.tasks.get(item[0])["started_at"])
+        # 우선순위 순, 같은 우선순위 안에서는 제출 순
+        assert [t for t, _ in started] == ["high-1", "normal-1", "normal-2", "low-1", "low-2"]
+    finally:
+        pool.shutdown()
+
+
+def test_concurrency_never_exceeds_pool_size():
+    pool = make_pool(size=2, max_queue=20)
+    try:
+        task_ids = [f"t{i}" for i in range(8)]
+        for task_id in task_ids:
+            assert pool.submit({"task_id": task_id, "url": "fake://c?sleep=0.1"})
+        assert wait_until(lambda: finished(pool, task_ids))
+        events = []
+        for task_id in task_ids:
+            task = pool.tasks.get(task_id)
+            events += [(task["started_at"], 1), (task["finished_at"], -1)]
+        running = peak = 0
+        for _, delta in sorted(events, key=lambda e: (e[0], e[1])):
+            running += delta
+            peak = max(peak, running)
+        assert peak <= 2
+    finally:
+        pool.shutdown()
+
+
+def test_failed_and_crashed_jobs_are_recorded(pool):
+    assert pool.submit({"task_id": "fail", "url": "fake://f?sleep=0&fail=1"})
+    assert pool.submit({"task_id": "crash", "url": "fake://c?sleep=0&exit=3"})
+    assert wait_until(lambda: finished(pool, ["fail", "crash"]))
+
+    failed = pool.tasks.get("fail")
+    assert failed["status"] == "failed" and failed["error"] == "fake failure"
+    crashed = pool.tasks.get("crash")
+    assert crashed["status"] == "failed" and crashed["exit_code"] == 3
+
+    # 죽은 워커 대신 새 워커가 떠서 다음 작업을 처리한다
+    assert pool.submit({"task_id": "after", "url": "fake://a?sleep=0"})
+    assert wait_until(lambda: status(pool, "after") == "done")
+    assert pool.tasks.counts()["failed"] == 2
+
+
+def test_shutdown_with_full_queue_does_not_block():
+    pool = make_pool(size=1, max_queue=2)
+    block(pool, seconds=0.5)
+    assert pool.submit({"task_id": "a", "url": "fake://a?sleep=0"})
+    assert pool.submit({"task_id": "b", "url": "fake://b?sleep=0"})
+
+    started = time.monotonic()
+    pool.shutdown()
+    assert time.monotonic() - started < 10
+    assert status(pool, "blocker") == "done"
+    assert status(pool, "a") == status(pool, "b") == "failed"
+    assert not pool.submit({"task_id": "late", "url": "fake://l?sleep=0"})
+
+
+def test_host_capacity_is_at_least_one():
+    assert host_capacity(worker_memory_mb=1, worker_cpus=0.001, reserve_memory_mb=0) >= 1
+    assert host_capacity(worker_memory_mb=2048, worker_cpus=1.0, reserve_memory_mb=10 ** 9) == 1
+
+
+def test_analyze_returns_429_when_queue_is_full(tmp_path, monkeypatch):
+    pytest.importorskip("flask")
+    pytest.importorskip("requests")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("WORKER_COMMAND", f"{sys.executable} {FAKE_WORKER} --sleep 2")
+    monkeypatch.setenv("WORKER_POOL_SIZE", "1")
+    monkeypatch.setenv("WORKER_QUEUE_SIZE", "1")
+    monkeypatch.setenv("RESULT_CACHE", "off")
+    monkeypatch.syspath_prepend(ROOT)
+    sys.modules.pop("app", None)
+    import app as app_module
+
+    try:
+        client = app_module.app.test_client()
+        responses = [client.post("/analyze", json={"url": f"fake://page/{i}", "callback_url": "http://127.0.0.1:9/cb"})
+                     for i in range(4)]
+        codes = [r.status_code for r in responses]
+        assert codes.count(202) <= 2  # 실행 중 1 + 대기열 1
+        rejected = [r for r in responses if r.status_code == 429]
+        assert rejected
+        assert int(rejected[0].headers["Retry-After"]) >= 1
+        assert rejected[0].get_json()["error"] == "Too many pending tasks"
+
+        accepted = responses[0].get_json()["task_id"]
+        assert client.get(f"/tasks/{accepted}").get_json()["status"] in ("queued", "running", "done")
+        assert os.path.exists(os.path.join(tmp_path, "worker_logs", f"{accepted}.log"))
+    finally:
+        app_module.pool.shutdown()
+        sys.modules.pop("app", None)
@@ -0,0 +1,380 @@
+import collections
+import itertools
+import json
+import logging
+import math
+import os
+import queue
+import subprocess
+import threading
+import time
+
+# =====================================================
+# 상주 워커 풀
+# -----------------------------------------------------
+# 요청마다 컨테이너를 새로 띄우는 대신, element_analysis/main.py 를
+# --worker 모드로 실행한 프로세스를 N개 유지하고 작업을 줄 단위 JSON 으로
+# stdin 에 넣어준다. 워커는 처리 결과를 stdout 으로 한 줄씩 보고한다.
+#
+#   app → worker : {"type": "job", "task_id": ..., "url": ..., ...}
+#                  {"type": "ping"} / {"type": "shutdown"}
+#   worker → app : {"type": "ready"} / {"type": "pong"}
+#                  {"type": "result", "task_id": ..., "status": "done"|"failed"}
+#
+# 작업 큐는 크기 제한이 있는 우선순위 큐다 (같은 우선순위는 FIFO). 가득 차면 submit 이
+# False 를 돌려주고 app 은 429 로 응답한다. 작업 상태(queued/running/done/failed)는 TaskTable 에 남는다.
+# =====================================================
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+
+def host_capacity(worker_memory_mb=2048, worker_cpus=1.0, reserve_memory_mb=1024):
+    """
+    이 호스트에서 동시에 돌릴 수 있는 워커 수: CPU 수 / 워커당 CPU 와
+    (전체 메모리 - 예약분) / 워커당 메모리 중 작은 값 (최소 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    by_cpu = int(cpus // worker_cpus) if worker_cpus > 0 else cpus
+    by_memory = by_cpu
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    total_mb = int(line.split()[1]) // 1024
+                    by_memory = (total_mb - reserve_memory_mb) // worker_memory_mb
+                    break
+    except OSError:
+        pass
+    return max(1, min(by_cpu, by_memory))
+
+
+class TaskTable:
+    """task_id → 상태. 끝난 작업은 최근 max_finished 건만 유지한다"""
+
+    def __init__(self, max_finished=10000):
+        self.max_finished = max_finished
+        self._tasks = collections.OrderedDict()
+        self._finished = 0
+        self._lock = threading.Lock()
+
+    def update(self, task_id, **fields):
+        now = time.time()
+        with self._lock:
+            task = self._tasks.setdefault(task_id, {"task_id": task_id, "created_at": now})
+            was_finished = task.get("status") in ("done", "failed")
+            task.update(fields, updated_at=now)
+            if not was_finished and task.get("status") in ("done", "failed"):
+                self._finished += 1
+                self._tasks.move_to_end(task_id)
+            # 오래된 끝난 작업부터 정리 (대기/실행 중인 작업은 남긴다)
+            while self._finished > self.max_finished:
+                for old_id, old in self._tasks.items():
+                    if old.get("status") in ("done", "failed"):
+                        del self._tasks[old_id]
+                        self._finished -= 1
+                        break
+                else:
+                    break
+
+    def discard(self, task_id):
+        with self._lock:
+            task = self._tasks.pop(task_id, None)
+            if task and task.get("status") in ("done", "failed"):
+                self._finished -= 1
+
+    def get(self, task_id):
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return dict(task) if task else None
+
+    def counts(self):
+        with self._lock:
+            return collections.Counter(t.get("status") for t in self._tasks.values())
+
+
+class WorkerProcess:
+    """워커 프로세스 1개와 그 stdout 프로토콜 채널"""
+
+    def __init__(self, argv, cwd=None, stderr_path=None, name=None):
+        self.name = name
+        self.messages = queue.Queue()
+        self.jobs_done = 0
+        self._stderr = open(stderr_path, "a") if stderr_path else subprocess.DEVNULL
+        self.proc = subprocess.Popen(
+            argv,
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            text=True,
+            bufsize=1,
+            start_new_session=True
+        )
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _read_loop(self):
+        for line in self.proc.stdout:
+            line = line.strip()
+            if not line.startswith("{"):
+                continue  # 프로토콜 외 출력은 무시
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(message, dict) and "type" in message:
+                self.messages.put(message)
+        self.messages.put(None)  # EOF → 프로세스 종료
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def send(self, message):
+        try:
+            self.proc.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+            self.proc.stdin.flush()
+            return True
+        except (BrokenPipeError, OSError, ValueError):
+            return False
+
+    def wait_for(self, kind, timeout, task_id=None):
+        """kind 타입 메시지를 기다린다. 시간 초과면 'timeout', 종료면 None"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return "timeout"
+            try:
+                message = self.messages.get(timeout=remaining)
+            except queue.Empty:
+                return "timeout"
+            if message is None:
+                return None
+            if message.get("type") != kind:
+                continue
+            if task_id is not None and message.get("task_id") != task_id:
+                continue
+            return message
+
+    def stop(self, timeout=30):
+        """정상 종료 요청 후 기한 내에 끝나지 않으면 강제 종료"""
+        if self.alive():
+            self.send({"type": "shutdown"})
+            try:
+                self.proc.stdin.close()
+            except OSError:
+                pass
+            try:
+                self.proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.kill()
+        self._close_stderr()
+
+    def kill(self):
+        if self.alive():
+            self.proc.kill()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                pass
+        self._close_stderr()
+
+    def _close_stderr(self):
+        if self._stderr is not subprocess.DEVNULL and not self._stderr.closed:
+            self._stderr.close()
+
+
+class WorkerPool:
+    """
+    고정 크기 워커 풀.
+
+    command_factory(slot, generation) 는 {"argv": [...], "cwd": ..., "name": ...} 를
+    돌려줘야 한다. 컨테이너/로컬 서브프로세스 어느 쪽이든 같은 프로토콜을 쓴다.
+    """
+
+    def __init__(self, command_factory, size=2, max_jobs=50, health_interval=30,
+                 health_timeout=10, job_timeout=900, start_timeout=180,
+                 log_dir=None, on_kill=None, on_finish=None, max_queue=0):
+        self.command_factory = command_factory
+        self.size = size
+        self.max_jobs = max_jobs
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.job_timeout = job_timeout
+        self.start_timeout = start_timeout
+        self.log_dir = log_dir
+        self.on_kill = on_kill
+        self.on_finish = on_finish  # on_finish(job, status, error, elapsed): 메트릭/상태 갱신용
+        self.max_queue = max_queue  # 0 이면 제한 없음
+        self._queue = queue.PriorityQueue(maxsize=max_queue)
+        self._order = itertools.count()  # 같은 우선순위 안에서 FIFO
+        self.tasks = TaskTable()
+        self._recent_elapsed = collections.deque(maxlen=50)  # Retry-After 추정용
+        self._threads = []
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._busy = 0
+
+    # ---------------- 외부 API ----------------
+    def start(self):
+        for slot in range(self.size):
+            t = threading.Thread(target=self._slot_loop, args=(slot,), name=f"worker-slot-{slot}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        logging.info(f"워커 풀 시작: {self.size}개 슬롯, 워커당 최대 {self.max_jobs}건 처리 후 교체")
+
+    def submit(self, job, priority="normal"):
+        """큐에 넣으면 True, 가득 찼거나 종료 중이면 False (작업은 버려진다)"""
+        if self._stopping.is_set():
+            return False
+        rank = PRIORITIES.get(priority, PRIORITIES["normal"])
+        # 슬롯이 바로 꺼내 running 으로 바꿀 수 있으므로 상태를 먼저 남긴다
+        self.tasks.update(job["task_id"], status="queued", priority=priority, url=job.get("url"))
+        try:
+            self._queue.put_nowait((rank, next(self._order), job))
+        except queue.Full:
+            self.tasks.discard(job["task_id"])
+            return False
+        return True
+
+    def retry_after(self):
+        """큐가 찼을 때 다시 시도할 때까지의 추정 시간(초): 최근 평균 처리 시간 / 워커 수"""
+        average = sum(self._recent_elapsed) / len(self._recent_elapsed) if self._recent_elapsed else 30
+        return max(1, math.ceil(average / max(1, self.size)))
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def busy_workers(self):
+        with self._lock:
+            return self._busy
+
+    def shutdown(self):
+        """새 작업을 받지 않고, 대기 중인 작업은 failed 로 정리한 뒤 슬롯을 멈춘다 (큐가 가득 차도 막히지 않음)"""
+        self._stopping.set()
+        while True:
+            try:
+                _, _, job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                self._finish(job, "failed", "워커 풀 종료")
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait((math.inf, next(self._order), None))  # 대기 중인 슬롯 깨우기
+            except queue.Full:
+                break  # 나머지 슬롯은 get 타임아웃 뒤 _stopping 을 보고 끝난다
+        for t in self._threads:
+            t.join(timeout=self.job_timeout)
+
+    # ---------------- 슬롯 루프 ----------------
+    def _slot_loop(self, slot):
+        worker, generation = None, 0
+        while not self._stopping.is_set():
+            try:
+                _, _, job = self._queue.get(timeout=self.health_interval)
+            except queue.Empty:
+                # 유휴 중 헬스 체크: 응답이 없으면 교체
+                if worker and not self._healthy(worker):
+                    logging.warning(f"[slot-{slot}] 헬스 체크 실패, 워커 교체")
+                    self._kill(worker)
+                    worker = None
+                continue
+            if job is None:
+                break
+
+            if worker is None or not worker.alive():
+                generation += 1
+                worker = self._spawn(slot, generation)
+            if worker is None:
+                self._finish(job, "failed", "워커 시작 실패")
+                time.sleep(min(self.health_interval, 5))
+                continue
+
+            worker = self._run_job(slot, worker, job)
+            if worker and self.max_jobs and worker.jobs_done >= self.max_jobs:
+                logging.info(f"[slot-{slot}] {worker.jobs_done}건 처리 완료, 워커 재시작")
+                worker.stop()
+                worker = None
+
+        if worker:
+            worker.stop()
+
+    def _spawn(self, slot, generation):
+        spec = self.command_factory(slot, generation)
+        stderr_path = os.path.join(self.log_dir, f"worker-{slot}.log") if self.log_dir else None
+        try:
+            worker = WorkerProcess(spec["argv"], cwd=spec.get("cwd"), stderr_path=stderr_path, name=spec.get("name"))
+        except OSError as e:
+            logging.error(f"[slot-{slot}] 워커 실행 실패: {e}")
+            return None
+        ready = worker.wait_for("ready", self.start_timeout)
+        if not isinstance(ready, dict):
+            logging.error(f"[slot-{slot}] 워커가 준비 신호를 보내지 않음 ({ready or 'exited'})")
+            self._kill(worker)
+            return None
+        logging.info(f"[slot-{slot}] 워커 준비 완료 (gen={generation}, pid={ready.get('pid')})")
+        return worker
+
+    def _healthy(self, worker):
+        if not worker.alive() or not worker.send({"type": "ping"}):
+            return False
+        return isinstance(worker.wait_for("pong", self.health_timeout), dict)
+
+    def _run_job(self, slot, worker, job):
+        task_id = job["task_id"]
+        started = time.monotonic()
+        self.tasks.update(task_id, status="running", slot=slot, started_at=time.time())
+        with self._lock:
+            self._busy += 1
+        try:
+            logging.info(f"[{task_id}] slot-{slot} 워커에 작업 할당")
+            if not worker.send({"type": "job", **job}):
+                self._kill(worker)
+                self._finish(job, "failed", "작업 전달 실패", time.monotonic() - started)
+                return None
+            message = worker.wait_for("result", self.job_timeout, task_id=task_id)
+            if message == "timeout":
+                logging.error(f"[{task_id}] 작업 시간 초과 ({self.job_timeout}s), 워커 종료")
+                self._kill(worker)
+                self._finish(job, "failed", "timeout", time.monotonic() - started)
+                return None
+            if message is None:
+                try:
+                    code = worker.proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    code = None
+                self._kill(worker)
+                self._finish(job, "failed", f"워커 비정상 종료 (exit={code})", time.monotonic() - started,
+                             exit_code=code)
+                return None
+            worker.jobs_done += 1
+            self._finish(job, message.get("status", "done"), message.get("error"),
+                         message.get("elapsed", time.monotonic() - started))
+            return worker
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+    def _kill(self, worker):
+        worker.kill()
+        if self.on_kill and worker.name:
+            self.on_kill(worker.name)
+
+    def _finish(self, job, status, error=None, elapsed=None, exit_code=None):
+        self.tasks.update(job["task_id"], status=status, error=error, exit_code=exit_code,
+                          elapsed=round(elapsed, 3) if elapsed is not None else None, finished_at=time.time())
+        if elapsed is not None:
+            self._recent_elapsed.append(elapsed)
+        if status == "done":
+            logging.info(f"[{job['task_id']}] 작업 완료")
+        else:
+            logging.error(f"[{job['task_id']}] 작업 실패: {error}")
+        if self.on_finish:
+            try:
+                self.on_finish(job, status, error, elapsed)
+            except Exception as e:
+                logging.error(f"[{job['task_id']}] on_finish 처리 실패: {e}")